@@ -0,0 +1,197 @@
+from __future__ import annotations
+
+import getpass
+import json
+import os
+from datetime import date, datetime
+from typing import List
+
+from sqlalchemy import event, insert, inspect, select
+from sqlalchemy.orm import Session
+
+from . import models
+
+# Change capture (see models.ChangeLog). Entries are collected per flush in
+# session.info and written with one executemany INSERT when the transaction
+# commits, so a write path pays for one extra statement per commit, not per row.
+# Core/bulk inserts (importer, bulk create) bypass ORM events: they record their
+# rows with ``record_inserts`` in the same transaction.
+
+AUDIT_ENABLED = os.getenv("EAGLE_PM_AUDIT", "1") not in ("0", "false", "no")
+AUDITED_MODELS = (
+    models.Member,
+    models.Release,
+    models.ReleaseLink,
+    models.Project,
+    models.Activity,
+    models.ActivityLink,
+)
+# Bookkeeping columns that change on every write and carry no information.
+IGNORED_COLUMNS = frozenset({"id", "created_at", "updated_at"})
+
+ACTION_INSERT = "insert"
+ACTION_UPDATE = "update"
+ACTION_DELETE = "delete"
+
+_PENDING = "change_log_pending"
+_AUDITED_TABLES = frozenset(model_cls.__tablename__ for model_cls in AUDITED_MODELS)
+
+
+def _current_user() -> str | None:
+    try:
+        return os.getenv("EAGLE_PM_USER") or getpass.getuser()
+    except Exception:
+        return None
+
+
+CHANGED_BY = _current_user()
+
+
+def _json_value(value):
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    return value
+
+
+def _column_keys(obj) -> List[str]:
+    return [attr.key for attr in inspect(obj).mapper.column_attrs if attr.key not in IGNORED_COLUMNS]
+
+
+def _row_values(obj, old: bool) -> dict:
+    # Read the instance dict directly: a deleted row must not trigger a lazy load.
+    loaded = inspect(obj).dict
+    values = {}
+    for key in _column_keys(obj):
+        value = loaded.get(key)
+        if value is not None:
+            values[key] = [_json_value(value), None] if old else [None, _json_value(value)]
+    return values
+
+
+def _update_diff(obj) -> dict:
+    state = inspect(obj)
+    diff = {}
+    for key in _column_keys(obj):
+        history = state.attrs[key].history
+        if not history.has_changes():
+            continue
+        old = history.deleted[0] if history.deleted else None
+        new = history.added[0] if history.added else None
+        if old != new:
+            diff[key] = [_json_value(old), _json_value(new)]
+    return diff
+
+
+def _entry(session: Session, obj, action: str, changes: dict, now: datetime) -> dict:
+    return {
+        "entity": obj.__tablename__,
+        "entity_id": obj.id,
+        "action": action,
+        "changes": json.dumps(changes, separators=(",", ":"), ensure_ascii=False),
+        "changed_at": now,
+        "changed_by": session.info.get("user", CHANGED_BY),
+    }
+
+
+@event.listens_for(Session, "after_flush")
+def _collect(session: Session, _flush_context) -> None:
+    # Attribute history is still available here; it is reset right after this event.
+    if not AUDIT_ENABLED:
+        return
+    now = datetime.utcnow()
+    pending = session.info.setdefault(_PENDING, [])
+    for obj in session.new:
+        if obj.__tablename__ in _AUDITED_TABLES:
+            pending.append(_entry(session, obj, ACTION_INSERT, _row_values(obj, old=False), now))
+    for obj in session.dirty:
+        if obj.__tablename__ in _AUDITED_TABLES:
+            diff = _update_diff(obj)
+            if diff:
+                pending.append(_entry(session, obj, ACTION_UPDATE, diff, now))
+    for obj in session.deleted:
+        if obj.__tablename__ in _AUDITED_TABLES:
+            pending.append(_entry(session, obj, ACTION_DELETE, _row_values(obj, old=True), now))
+
+
+@event.listens_for(Session, "before_commit")
+def _write(session: Session) -> None:
+    if not AUDIT_ENABLED:
+        return
+    # Flush now so the final flush's changes are collected before the batch is written.
+    session.flush()
+    pending = session.info.pop(_PENDING, None)
+    if pending:
+        session.connection().execute(insert(models.ChangeLog.__table__), pending)
+
+
+def record_inserts(session: Session, model_cls, ids: List[int], rows: List[dict]) -> None:
+    """Write "insert" entries for rows added with a Core INSERT, as one executemany.
+
+    ``ids[i]`` is the primary key of ``rows[i]`` (INSERT ... RETURNING in parameter order).
+    """
+    if not AUDIT_ENABLED or model_cls.__tablename__ not in _AUDITED_TABLES or not rows:
+        return
+    now = datetime.utcnow()
+    changed_by = session.info.get("user", CHANGED_BY)
+    entries = []
+    for entity_id, values in zip(ids, rows):
+        changes = {
+            key: [None, _json_value(value)]
+            for key, value in values.items()
+            if value is not None and key not in IGNORED_COLUMNS
+        }
+        entries.append(
+            {
+                "entity": model_cls.__tablename__,
+                "entity_id": entity_id,
+                "action": ACTION_INSERT,
+                "changes": json.dumps(changes, separators=(",", ":"), ensure_ascii=False),
+                "changed_at": now,
+                "changed_by": changed_by,
+            }
+        )
+    session.execute(insert(models.ChangeLog.__table__), entries)
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def _discard(session: Session, _previous_transaction) -> None:
+    session.info.pop(_PENDING, None)
+
+
+def _entries(session: Session, stmt) -> List[dict]:
+    return [
+        {
+            "id": row.id,
+            "entity": row.entity,
+            "entity_id": row.entity_id,
+            "action": row.action,
+            "changes": json.loads(row.changes),
+            "changed_at": row.changed_at,
+            "changed_by": row.changed_by,
+        }
+        for row in session.execute(stmt).scalars()
+    ]
+
+
+def entity_history(session: Session, entity: str, entity_id: int, limit: int = 100) -> List[dict]:
+    """Newest-first history of one row (uses idx_change_log_entity)."""
+    log = models.ChangeLog
+    stmt = (
+        select(log)
+        .where(log.entity == entity, log.entity_id == entity_id)
+        .order_by(log.id.desc())
+        .limit(limit)
+    )
+    return _entries(session, stmt)
+
+
+def changes_since(session: Session, since: datetime, entity: str | None = None, limit: int = 500) -> List[dict]:
+    """Oldest-first entries at or after ``since`` (uses idx_change_log_changed_at)."""
+    log = models.ChangeLog
+    stmt = select(log).where(log.changed_at >= since).order_by(log.changed_at, log.id).limit(limit)
+    if entity:
+        stmt = stmt.where(log.entity == entity)
+    return _entries(session, stmt)
+
+
+__all__ = ["AUDITED_MODELS", "CHANGED_BY", "changes_since", "entity_history", "record_inserts"]
@@ -0,0 +1,190 @@
+from __future__ import annotations
+
+import gzip
+import os
+import re
+import shutil
+import sqlite3
+import threading
+from datetime import date, datetime
+from pathlib import Path
+from typing import List
+
+from . import db
+
+# Snapshots live next to the database unless EAGLE_PM_BACKUP_DIR says otherwise.
+BACKUP_DIR = Path(os.getenv("EAGLE_PM_BACKUP_DIR", str(db.DATABASE_PATH.resolve().parent / "backups")))
+# Number of snapshots kept by rotation (oldest are deleted first).
+BACKUP_KEEP = int(os.getenv("EAGLE_PM_BACKUP_KEEP", "14"))
+BACKUP_COMPRESS = os.getenv("EAGLE_PM_BACKUP_COMPRESS", "1") not in ("0", "false", "no")
+# Rollback-journal databases are copied in steps of this many pages, releasing the
+# lock in between. (WAL databases are copied in one step, see _copy_online.)
+BACKUP_PAGES_PER_STEP = 256
+BACKUP_STEP_SLEEP = 0.005
+
+# eagle_pm_<date>_<time>_<microseconds>[_<label>].db[.gz]; names without microseconds
+# come from older versions.
+_NAME = re.compile(r"^eagle_pm_\d{8}_\d{6}(_\d{6})?(_[a-z0-9-]+)?\.db(\.gz)?$")
+_lock = threading.Lock()
+
+
+def _snapshot_name(label: str | None, compress: bool) -> str:
+    suffix = f"_{label}" if label else ""
+    return f"eagle_pm_{datetime.now().strftime('%Y%m%d_%H%M%S_%f')}{suffix}.db" + (".gz" if compress else "")
+
+
+def _copy_online(source: Path, target: Path) -> None:
+    """Copy through SQLite's backup API without stopping writers.
+
+    Under WAL a single step reads one consistent snapshot while writers keep
+    appending to the WAL. Stepped copies would restart on every commit from
+    another connection and may never finish on a busy database. In rollback-journal
+    mode a reader blocks writers, so the copy goes in small steps instead.
+    """
+    src = sqlite3.connect(f"{source.resolve().as_uri()}?mode=ro", uri=True)
+    try:
+        wal = src.execute("PRAGMA journal_mode").fetchone()[0].lower() == "wal"
+        dest = sqlite3.connect(target)
+        try:
+            if wal:
+                src.backup(dest)
+            else:
+                src.backup(dest, pages=BACKUP_PAGES_PER_STEP, sleep=BACKUP_STEP_SLEEP)
+        finally:
+            dest.close()
+    finally:
+        src.close()
+
+
+def _check_integrity(path: Path) -> None:
+    conn = sqlite3.connect(f"{path.resolve().as_uri()}?mode=ro", uri=True)
+    try:
+        result = conn.execute("PRAGMA quick_check").fetchone()[0]
+    except sqlite3.DatabaseError as exc:
+        raise ValueError(f"Backup invalido: {exc}") from exc
+    finally:
+        conn.close()
+    if result != "ok":
+        raise ValueError(f"Backup invalido: {result}")
+
+
+def create_backup(compress: bool | None = None, label: str | None = None, keep: int | None = None) -> Path:
+    """Write a timestamped snapshot of the live database, then apply rotation."""
+    compress = BACKUP_COMPRESS if compress is None else compress
+    BACKUP_DIR.mkdir(parents=True, exist_ok=True)
+    with _lock:
+        # Never replace an existing snapshot (os.replace below would, silently).
+        target = BACKUP_DIR / _snapshot_name(label, compress)
+        while target.exists():
+            target = BACKUP_DIR / _snapshot_name(label, compress)
+        tmp = target.with_name(target.name + ".part")
+        try:
+            if compress:
+                raw = tmp.with_suffix(".raw")
+                try:
+                    _copy_online(db.DATABASE_PATH, raw)
+                    with raw.open("rb") as src, gzip.open(tmp, "wb", compresslevel=6) as dest:
+                        shutil.copyfileobj(src, dest, 1024 * 1024)
+                finally:
+                    raw.unlink(missing_ok=True)
+            else:
+                _copy_online(db.DATABASE_PATH, tmp)
+            os.replace(tmp, target)
+        finally:
+            tmp.unlink(missing_ok=True)
+        prune_backups(BACKUP_KEEP if keep is None else keep)
+    return target
+
+
+def list_backups() -> List[dict]:
+    """Snapshots in BACKUP_DIR, newest first."""
+    if not BACKUP_DIR.exists():
+        return []
+    items = []
+    for path in BACKUP_DIR.iterdir():
+        if _NAME.fullmatch(path.name):
+            stat = path.stat()
+            items.append(
+                {
+                    "name": path.name,
+                    "size": stat.st_size,
+                    "created_at": datetime.fromtimestamp(stat.st_mtime),
+                    "compressed": path.name.endswith(".gz"),
+                }
+            )
+    items.sort(key=lambda item: item["name"], reverse=True)
+    return items
+
+
+def prune_backups(keep: int) -> List[str]:
+    """Delete all but the newest ``keep`` snapshots; returns the deleted names."""
+    removed = [item["name"] for item in list_backups()[max(keep, 0):]]
+    for name in removed:
+        (BACKUP_DIR / name).unlink(missing_ok=True)
+    return removed
+
+
+def backup_path(name: str) -> Path:
+    """Resolve a snapshot name from the UI/CLI, rejecting anything that is not one of ours."""
+    if not _NAME.fullmatch(name or ""):
+        raise ValueError("Backup invalido.")
+    path = BACKUP_DIR / name
+    if not path.exists():
+        raise ValueError("Backup nao encontrado.")
+    return path
+
+
+def restore_backup(name: str) -> Path:
+    """Replace the live database with a snapshot; returns the pre-restore safety snapshot.
+
+    The snapshot is unpacked and checked next to the database first, so the swap
+    itself is a single ``os.replace``. Both engine pools are disposed around it, so
+    every connection opened afterwards sees the restored file.
+    """
+    source = backup_path(name)
+    live = db.DATABASE_PATH
+    staged = live.with_name(live.name + ".restore")
+    try:
+        if source.name.endswith(".gz"):
+            with gzip.open(source, "rb") as src, staged.open("wb") as dest:
+                shutil.copyfileobj(src, dest, 1024 * 1024)
+        else:
+            shutil.copyfile(source, staged)
+        _check_integrity(staged)
+        safety = create_backup(label="pre-restore", keep=BACKUP_KEEP + 1)
+        with _lock:
+            # Fold the WAL in and close pooled connections: a -wal left behind would be replayed on the new file.
+            db.checkpoint()
+            db.dispose_engines()
+            os.replace(staged, live)
+            for suffix in ("-wal", "-shm"):
+                Path(f"{live}{suffix}").unlink(missing_ok=True)
+            db.dispose_engines()
+    finally:
+        for leftover in (staged, Path(f"{staged}-wal"), Path(f"{staged}-shm")):
+            leftover.unlink(missing_ok=True)
+    # Bring an older snapshot up to the current schema and reload the in-memory caches.
+    from .lookups import registry
+
+    registry.invalidate()
+    db.init_db()
+    return safety
+
+
+def daily_backup(today: date) -> Path | None:
+    """Scheduler job: one snapshot per calendar day."""
+    stamp = f"eagle_pm_{today.strftime('%Y%m%d')}_"
+    if any(item["name"].startswith(stamp) for item in list_backups()):
+        return None
+    return create_backup()
+
+
+__all__ = [
+    "BACKUP_DIR",
+    "backup_path",
+    "create_backup",
+    "daily_backup",
+    "list_backups",
+    "prune_backups",
+    "restore_backup",
+]
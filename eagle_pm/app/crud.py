@@ -1,23 +1,109 @@
 from __future__ import annotations
 
+import base64
+import json
 from datetime import date, datetime
+from collections import Counter
 from typing import Iterable, Tuple
-from sqlalchemy import select
-from sqlalchemy.orm import Session
-
-from . import models, rules
+from sqlalchemy import Date, DateTime, case, delete, func, insert, or_, select, tuple_
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import Session, joinedload
+
+from . import audit, lookups, models, rules, search  # noqa: F401 - audit registers the change-log listeners
+
+
+# --- Loading profiles ---
+# Eager-loading presets per view. Every relationship a template reads is a
+# many-to-one, so they are joined into the main SELECT instead of lazy-loaded per row.
+_ACTIVITY_CARD = (
+    joinedload(models.Activity.type),
+    joinedload(models.Activity.subtype),
+    joinedload(models.Activity.status),
+)
+
+LOAD_PROFILES: dict[str, tuple] = {
+    "member": (joinedload(models.Member.role), joinedload(models.Member.status)),
+    "release": (joinedload(models.Release.status),),
+    "project": (joinedload(models.Project.status), joinedload(models.Project.target_release)),
+    "activity_card": _ACTIVITY_CARD,
+    "activity_scope": _ACTIVITY_CARD + (
+        joinedload(models.Activity.project),
+        joinedload(models.Activity.assigned_member),
+    ),
+    "activity_row": _ACTIVITY_CARD + (
+        joinedload(models.Activity.project),
+        joinedload(models.Activity.assigned_member),
+        joinedload(models.Activity.target_release),
+    ),
+}
+
+
+def with_load_profile(stmt, load: str | None):
+    if not load:
+        return stmt
+    if load not in LOAD_PROFILES:
+        raise ValueError(f"Loading profile desconhecido: {load}")
+    return stmt.options(*LOAD_PROFILES[load])
+
+
+def _text_filter(stmt, kind: str, id_column, text: str, *like_columns):
+    """Filter by the FTS index (prefix match per word); LIKE fallback without FTS5."""
+    expression = search.match_expression(text) if search.available else None
+    if expression:
+        return stmt.where(id_column.in_(search.match_ids_stmt(kind, expression)))
+    like = f"%{text}%"
+    return stmt.where(or_(*(column.ilike(like) for column in like_columns)))
+
+
+# --- Keyset pagination ---
+# Sort keys of each list page; ``id`` is the tiebreaker so cursors are unambiguous.
+
+PAGE_SIZE = 50
+
+MEMBER_SORT_KEYS = (models.Member.name, models.Member.id)
+RELEASE_SORT_KEYS = (models.Release.release_code, models.Release.id)
+PROJECT_SORT_KEYS = (models.Project.project_code, models.Project.id)
+ACTIVITY_SORT_KEYS = (models.Activity.created_at, models.Activity.id)  # newest first
+
+
+def encode_cursor(values: list) -> str:
+    raw = json.dumps(values, default=str, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, keys) -> list:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        if not isinstance(values, list) or len(values) != len(keys):
+            raise ValueError
+        decoded = []
+        for key, value in zip(keys, values):
+            if isinstance(key.type, DateTime):
+                value = datetime.fromisoformat(value)
+            elif isinstance(key.type, Date):
+                value = date.fromisoformat(value)
+            decoded.append(value)
+        return decoded
+    except (ValueError, TypeError) as exc:
+        raise ValueError("Cursor invalido.") from exc
+
+
+def keyset_page(session: Session, stmt, keys, cursor: str | None = None, limit: int = PAGE_SIZE, descending: bool = False):
+    """Return ``(rows, next_cursor)`` for the page after ``cursor``; ``stmt`` must be ordered by ``keys``."""
+    if cursor:
+        bound = tuple_(*decode_cursor(cursor, keys))
+        stmt = stmt.where(tuple_(*keys) < bound if descending else tuple_(*keys) > bound)
+    rows = session.execute(stmt.limit(limit + 1)).scalars().all()
+    if len(rows) <= limit:
+        return rows, None
+    rows = rows[:limit]
+    return rows, encode_cursor([getattr(rows[-1], key.key) for key in keys])
 
 
 def seed_index_tables(session: Session) -> None:
     mapping: Iterable[Tuple[type, list]] = [
-        (models.IndexRole, rules.index_rows("index_role")),
-        (models.IndexUserStatus, rules.index_rows("index_user_status")),
-        (models.IndexReleaseStatus, rules.index_rows("index_release_status")),
-        (models.IndexReleaseLinkType, rules.index_rows("index_release_link_type")),
-        (models.IndexProjectStatus, rules.index_rows("index_project_status")),
-        (models.IndexActivityType, rules.index_rows("index_activity_type")),
-        (models.IndexActivitySubtype, rules.index_rows("index_activity_subtype")),
-        (models.IndexActivityStatus, rules.index_rows("index_activity_status")),
+        (model_cls, rules.index_rows(model_cls.__tablename__)) for model_cls in lookups.INDEX_MODELS
     ]
 
     for model_cls, rows in mapping:
@@ -27,19 +113,40 @@ def seed_index_tables(session: Session) -> None:
                 session.add(model_cls(code=code, name=name))
 
 
-def update_release_statuses(session: Session, today: date | None = None) -> None:
+def due_release_transitions_stmt(today: date):
+    """Releases whose stored status is behind the start/installation date boundaries."""
+    rel = models.Release
+    return select(rel).where(
+        rel.status_code != rules.STATUS_RELEASE_INSTALLED,
+        (rel.installation_date <= today)
+        | ((rel.status_code == rules.STATUS_RELEASE_PLANNED) & (rel.start_date <= today)),
+    )
+
+
+def update_release_statuses(session: Session, today: date | None = None) -> int:
+    """Apply due status transitions; only releases past a date boundary are loaded."""
     today = today or date.today()
-    releases = session.execute(select(models.Release)).scalars().all()
+    releases = session.execute(due_release_transitions_stmt(today)).scalars().all()
+    changed = 0
     for rel in releases:
         new_status = rules.release_status_for_dates(rel.start_date, rel.installation_date, today)
         if rel.status_code != new_status:
             rel.status_code = new_status
             rel.updated_at = datetime.utcnow()
+            changed += 1
     session.flush()
+    return changed
 
 
-def set_activity_status(activity: models.Activity, new_status_code: str, now: datetime | None = None) -> None:
+def set_activity_status(
+    activity: models.Activity,
+    new_status_code: str,
+    now: datetime | None = None,
+    session: Session | None = None,
+) -> None:
+    """Set status and end_date; pass ``session`` to also move the dashboard counters."""
     now = now or datetime.utcnow()
+    old_keys = activity_count_keys(activity) if session is not None else None
     was_closed = rules.activity_is_closed(activity.status_code)
     will_be_closed = rules.activity_is_closed(new_status_code)
     activity.status_code = new_status_code
@@ -49,6 +156,93 @@ def set_activity_status(activity: models.Activity, new_status_code: str, now: da
     else:
         if was_closed:
             activity.end_date = None
+    if session is not None:
+        bump_dashboard_counts(session, removed=old_keys, added=activity_count_keys(activity))
+
+
+# --- Dashboard counters ---
+# Scopes of models.DashboardCount; ``ref`` is a status code or an id ("" = none).
+COUNT_ACTIVITY_STATUS = "activity_status"
+COUNT_OPEN_BY_PROJECT = "open_by_project"
+COUNT_OPEN_BY_MEMBER = "open_by_member"
+COUNT_OPEN_BY_RELEASE = "open_by_release"
+COUNT_PROJECT_STATUS = "project_status"
+
+
+def _ref(value) -> str:
+    return "" if value is None else str(value)
+
+
+def activity_count_keys(act: models.Activity) -> list[tuple[str, str]]:
+    keys = [(COUNT_ACTIVITY_STATUS, act.status_code)]
+    if not rules.activity_is_closed(act.status_code):
+        keys += [
+            (COUNT_OPEN_BY_PROJECT, _ref(act.project_id)),
+            (COUNT_OPEN_BY_MEMBER, _ref(act.assigned_member_id)),
+            (COUNT_OPEN_BY_RELEASE, _ref(act.target_release_id)),
+        ]
+    return keys
+
+
+def project_count_keys(proj: models.Project) -> list[tuple[str, str]]:
+    return [(COUNT_PROJECT_STATUS, proj.status_code)]
+
+
+def bump_dashboard_counts(session: Session, removed: Iterable[tuple[str, str]] = (), added: Iterable[tuple[str, str]] = ()) -> None:
+    """Apply the net delta between two key sets as upserts in the current transaction."""
+    delta = Counter(added)
+    delta.subtract(Counter(removed))
+    rows = [{"scope": scope, "ref": ref, "count": n} for (scope, ref), n in delta.items() if n]
+    if not rows:
+        return
+    stmt = sqlite_insert(models.DashboardCount)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[models.DashboardCount.scope, models.DashboardCount.ref],
+        set_={"count": models.DashboardCount.count + stmt.excluded.count},
+    )
+    session.execute(stmt, rows)
+
+
+def _computed_dashboard_counts(session: Session) -> Counter:
+    act = models.Activity
+    open_filter = act.status_code != rules.STATUS_ACTIVITY_CLOSED
+    counts: Counter = Counter()
+    queries = [
+        (COUNT_ACTIVITY_STATUS, select(act.status_code, func.count()).group_by(act.status_code)),
+        (COUNT_OPEN_BY_PROJECT, select(act.project_id, func.count()).where(open_filter).group_by(act.project_id)),
+        (COUNT_OPEN_BY_MEMBER, select(act.assigned_member_id, func.count()).where(open_filter).group_by(act.assigned_member_id)),
+        (COUNT_OPEN_BY_RELEASE, select(act.target_release_id, func.count()).where(open_filter).group_by(act.target_release_id)),
+        (COUNT_PROJECT_STATUS, select(models.Project.status_code, func.count()).group_by(models.Project.status_code)),
+    ]
+    for scope, stmt in queries:
+        for ref, n in session.execute(stmt):
+            counts[(scope, _ref(ref))] = n
+    return counts
+
+
+def check_dashboard_counts(session: Session) -> dict[tuple[str, str], tuple[int, int]]:
+    """Return ``{(scope, ref): (stored, actual)}`` for every counter that drifted."""
+    stored = Counter({(row.scope, row.ref): row.count for row in session.execute(select(models.DashboardCount)).scalars()})
+    actual = _computed_dashboard_counts(session)
+    return {key: (stored[key], actual[key]) for key in set(stored) | set(actual) if stored[key] != actual[key]}
+
+
+def rebuild_dashboard_counts(session: Session) -> None:
+    session.execute(delete(models.DashboardCount))
+    session.add_all(
+        models.DashboardCount(scope=scope, ref=ref, count=n) for (scope, ref), n in _computed_dashboard_counts(session).items()
+    )
+    session.flush()
+
+
+def dashboard_counts(session: Session, scope: str, id_keys: bool = False) -> dict:
+    """Counters of one scope; with ``id_keys`` refs become ints (None for "")."""
+    rows = session.execute(
+        select(models.DashboardCount.ref, models.DashboardCount.count).where(models.DashboardCount.scope == scope)
+    ).all()
+    if id_keys:
+        return {(int(ref) if ref else None): n for ref, n in rows if n}
+    return {ref: n for ref, n in rows if n}
 
 
 # --- Members CRUD helpers ---
@@ -56,25 +250,56 @@ def set_activity_status(activity: models.Activity, new_status_code: str, now: da
 def _ensure_index_code(session: Session, model_cls, code: str) -> None:
     if not code:
         raise ValueError("Codigo obrigatorio.")
-    exists = session.execute(select(model_cls).where(model_cls.code == code)).scalar_one_or_none()
-    if not exists:
+    if not lookups.registry.has_code(session, model_cls, code):
         raise ValueError("Codigo de indice invalido.")
 
 
 def get_index_options(session: Session, model_cls) -> list[tuple[str, str]]:
-    rows = session.execute(select(model_cls).order_by(model_cls.code)).scalars().all()
-    return [(row.code, row.name) for row in rows]
+    return lookups.registry.options(session, model_cls)
 
 
-def list_members(session: Session, name_like: str | None = None, role_code: str | None = None, status_code: str | None = None):
-    stmt = select(models.Member).order_by(models.Member.name)
+def list_members_stmt(
+    name_like: str | None = None,
+    role_code: str | None = None,
+    status_code: str | None = None,
+    load: str | None = None,
+):
+    stmt = with_load_profile(select(models.Member).order_by(*MEMBER_SORT_KEYS), load)
     if name_like:
-        stmt = stmt.where(models.Member.name.ilike(f"%{name_like}%"))
+        stmt = _text_filter(stmt, search.KIND_MEMBER, models.Member.id, name_like, models.Member.name)
     if role_code:
         stmt = stmt.where(models.Member.role_code == role_code)
     if status_code:
         stmt = stmt.where(models.Member.status_code == status_code)
-    return session.execute(stmt).scalars().all()
+    return stmt
+
+
+def list_members(
+    session: Session,
+    name_like: str | None = None,
+    role_code: str | None = None,
+    status_code: str | None = None,
+    load: str | None = None,
+):
+    return session.execute(list_members_stmt(name_like, role_code, status_code, load)).scalars().all()
+
+
+def member_dropdown_options(session: Session) -> list[tuple[int, str]]:
+    stmt = select(models.Member.id, models.Member.name).order_by(*MEMBER_SORT_KEYS)
+    return [tuple(row) for row in session.execute(stmt)]
+
+
+def page_members(
+    session: Session,
+    name_like: str | None = None,
+    role_code: str | None = None,
+    status_code: str | None = None,
+    load: str | None = None,
+    cursor: str | None = None,
+    limit: int = PAGE_SIZE,
+):
+    stmt = list_members_stmt(name_like, role_code, status_code, load)
+    return keyset_page(session, stmt, MEMBER_SORT_KEYS, cursor, limit)
 
 
 def create_member(
@@ -147,19 +372,40 @@ def delete_member(session: Session, member_id: int) -> None:
     member = get_member(session, member_id)
     if not member:
         return
+    # The ORM sets assigned_member_id to NULL on the member's activities; their open
+    # counters move to the unassigned ("") bucket in the same transaction.
+    activities = list(member.activities)
+    removed = [key for act in activities for key in activity_count_keys(act)]
     session.delete(member)
+    session.flush()
+    bump_dashboard_counts(session, removed=removed, added=[key for act in activities for key in activity_count_keys(act)])
     session.commit()
 
 
 # --- Releases CRUD helpers ---
 
-def list_releases(session: Session, code_like: str | None = None, status_code: str | None = None):
-    stmt = select(models.Release).order_by(models.Release.release_code)
+def list_releases_stmt(code_like: str | None = None, status_code: str | None = None, load: str | None = None):
+    stmt = with_load_profile(select(models.Release).order_by(*RELEASE_SORT_KEYS), load)
     if code_like:
         stmt = stmt.where(models.Release.release_code.ilike(f"%{code_like}%"))
     if status_code:
         stmt = stmt.where(models.Release.status_code == status_code)
-    return session.execute(stmt).scalars().all()
+    return stmt
+
+
+def list_releases(session: Session, code_like: str | None = None, status_code: str | None = None, load: str | None = None):
+    return session.execute(list_releases_stmt(code_like, status_code, load)).scalars().all()
+
+
+def page_releases(
+    session: Session,
+    code_like: str | None = None,
+    status_code: str | None = None,
+    load: str | None = None,
+    cursor: str | None = None,
+    limit: int = PAGE_SIZE,
+):
+    return keyset_page(session, list_releases_stmt(code_like, status_code, load), RELEASE_SORT_KEYS, cursor, limit)
 
 
 def create_release(session: Session, release_code: str, delivery_date: date, start_date: date, installation_date: date) -> models.Release:
@@ -214,23 +460,60 @@ def update_release(
 
 
 def release_dropdown_options(session: Session) -> list[tuple[int, str]]:
-    stmt = select(models.Release).where(models.Release.status_code != rules.STATUS_RELEASE_INSTALLED).order_by(models.Release.release_code)
-    rows = session.execute(stmt).scalars().all()
-    return [(row.id, row.release_code) for row in rows]
+    stmt = (
+        select(models.Release.id, models.Release.release_code)
+        .where(models.Release.status_code != rules.STATUS_RELEASE_INSTALLED)
+        .order_by(models.Release.release_code)
+    )
+    return [tuple(row) for row in session.execute(stmt)]
 
 
 # --- Projects CRUD helpers ---
 
-def list_projects(session: Session, code_or_title: str | None = None, status_code: str | None = None, target_release_id: int | None = None):
-    stmt = select(models.Project).order_by(models.Project.project_code)
+def list_projects_stmt(
+    code_or_title: str | None = None,
+    status_code: str | None = None,
+    target_release_id: int | None = None,
+    load: str | None = None,
+):
+    stmt = with_load_profile(select(models.Project).order_by(*PROJECT_SORT_KEYS), load)
     if code_or_title:
-        like = f"%{code_or_title}%"
-        stmt = stmt.where((models.Project.project_code.ilike(like)) | (models.Project.title.ilike(like)))
+        stmt = _text_filter(
+            stmt, search.KIND_PROJECT, models.Project.id, code_or_title, models.Project.project_code, models.Project.title
+        )
     if status_code:
         stmt = stmt.where(models.Project.status_code == status_code)
     if target_release_id:
         stmt = stmt.where(models.Project.target_release_id == target_release_id)
-    return session.execute(stmt).scalars().all()
+    return stmt
+
+
+def list_projects(
+    session: Session,
+    code_or_title: str | None = None,
+    status_code: str | None = None,
+    target_release_id: int | None = None,
+    load: str | None = None,
+):
+    return session.execute(list_projects_stmt(code_or_title, status_code, target_release_id, load)).scalars().all()
+
+
+def page_projects(
+    session: Session,
+    code_or_title: str | None = None,
+    status_code: str | None = None,
+    target_release_id: int | None = None,
+    load: str | None = None,
+    cursor: str | None = None,
+    limit: int = PAGE_SIZE,
+):
+    stmt = list_projects_stmt(code_or_title, status_code, target_release_id, load)
+    return keyset_page(session, stmt, PROJECT_SORT_KEYS, cursor, limit)
+
+
+def list_open_projects(session: Session, load: str | None = None):
+    stmt = select(models.Project).where(models.Project.status_code != rules.STATUS_PROJECT_CLOSED)
+    return session.execute(with_load_profile(stmt, load)).scalars().all()
 
 
 def create_project(
@@ -266,6 +549,7 @@ def create_project(
         target_release_id=target_release_id,
     )
     session.add(proj)
+    bump_dashboard_counts(session, added=project_count_keys(proj))
     session.commit()
     session.refresh(proj)
     return proj
@@ -295,6 +579,7 @@ def update_project(
         rel = get_release(session, target_release_id)
         if not rel or rules.release_is_installed(rel.status_code):
             raise ValueError("Target release invalida (INSTALLED nao permitido).")
+    old_keys = project_count_keys(proj)
     proj.title = title.strip()
     proj.pm_responsible = pm_responsible.strip()
     proj.eba_responsible = eba_responsible.strip()
@@ -302,27 +587,31 @@ def update_project(
     proj.e2e_date = e2e_date
     proj.target_release_id = target_release_id
     proj.updated_at = datetime.utcnow()
+    bump_dashboard_counts(session, removed=old_keys, added=project_count_keys(proj))
     session.commit()
     session.refresh(proj)
     return proj
 
 
 def project_dropdown_options(session: Session) -> list[tuple[int, str]]:
-    stmt = select(models.Project).where(models.Project.status_code != rules.STATUS_PROJECT_CLOSED).order_by(models.Project.project_code)
-    rows = session.execute(stmt).scalars().all()
-    return [(row.id, row.project_code) for row in rows]
+    stmt = (
+        select(models.Project.id, models.Project.project_code)
+        .where(models.Project.status_code != rules.STATUS_PROJECT_CLOSED)
+        .order_by(models.Project.project_code)
+    )
+    return [tuple(row) for row in session.execute(stmt)]
 
 
 # --- Activities CRUD helpers ---
 
-def list_activities(
-    session: Session,
+def list_activities_stmt(
     status_code: str | None = None,
     project_id: int | None = None,
     assigned_member_id: int | None = None,
     title_like: str | None = None,
+    load: str | None = None,
 ):
-    stmt = select(models.Activity).order_by(models.Activity.created_at.desc())
+    stmt = with_load_profile(select(models.Activity).order_by(*(key.desc() for key in ACTIVITY_SORT_KEYS)), load)
     if status_code:
         stmt = stmt.where(models.Activity.status_code == status_code)
     if project_id:
@@ -330,10 +619,102 @@ def list_activities(
     if assigned_member_id:
         stmt = stmt.where(models.Activity.assigned_member_id == assigned_member_id)
     if title_like:
-        stmt = stmt.where(models.Activity.title.ilike(f"%{title_like}%"))
+        stmt = _text_filter(
+            stmt, search.KIND_ACTIVITY, models.Activity.id, title_like, models.Activity.title, models.Activity.ticket_code
+        )
+    return stmt
+
+
+def list_activities(
+    session: Session,
+    status_code: str | None = None,
+    project_id: int | None = None,
+    assigned_member_id: int | None = None,
+    title_like: str | None = None,
+    load: str | None = None,
+):
+    stmt = list_activities_stmt(status_code, project_id, assigned_member_id, title_like, load)
     return session.execute(stmt).scalars().all()
 
 
+def page_activities(
+    session: Session,
+    status_code: str | None = None,
+    project_id: int | None = None,
+    assigned_member_id: int | None = None,
+    title_like: str | None = None,
+    load: str | None = None,
+    cursor: str | None = None,
+    limit: int = PAGE_SIZE,
+):
+    stmt = list_activities_stmt(status_code, project_id, assigned_member_id, title_like, load)
+    return keyset_page(session, stmt, ACTIVITY_SORT_KEYS, cursor, limit, descending=True)
+
+
+def list_open_activities(
+    session: Session,
+    target_release_id: int | None = None,
+    project_id: int | None = None,
+    load: str | None = None,
+):
+    stmt = select(models.Activity).where(models.Activity.status_code != rules.STATUS_ACTIVITY_CLOSED)
+    if project_id:
+        stmt = stmt.where(models.Activity.project_id == project_id)
+    if target_release_id:
+        stmt = stmt.where(models.Activity.target_release_id == target_release_id).order_by(models.Activity.created_at.desc())
+    return session.execute(with_load_profile(stmt, load)).scalars().all()
+
+
+# --- Release scope ---
+
+def list_scope_releases(session: Session, load: str | None = None):
+    """Releases that are not INSTALLED yet, in timeline order."""
+    stmt = (
+        select(models.Release)
+        .where(models.Release.status_code != rules.STATUS_RELEASE_INSTALLED)
+        .order_by(models.Release.start_date, models.Release.id)
+    )
+    return session.execute(with_load_profile(stmt, load)).scalars().all()
+
+
+def release_scope_counts(session: Session) -> dict:
+    """``{release_id: {"total", "open", "closed", "blocked"}}`` for every non-installed release.
+
+    One GROUP BY over the activities of those releases, so the page costs the
+    same with two releases or fifty.
+    """
+    act = models.Activity
+    closed = func.sum(case((act.status_code == rules.STATUS_ACTIVITY_CLOSED, 1), else_=0))
+    blocked = func.sum(case((act.status_code == rules.STATUS_ACTIVITY_BLOCKED, 1), else_=0))
+    stmt = (
+        select(act.target_release_id, func.count(), closed, blocked)
+        .join(models.Release, models.Release.id == act.target_release_id)
+        .where(models.Release.status_code != rules.STATUS_RELEASE_INSTALLED)
+        .group_by(act.target_release_id)
+    )
+    return {
+        release_id: {"total": total, "open": total - n_closed, "closed": n_closed, "blocked": n_blocked}
+        for release_id, total, n_closed, n_blocked in session.execute(stmt)
+    }
+
+
+def page_release_scope_activities(
+    session: Session,
+    release_id: int,
+    load: str | None = None,
+    cursor: str | None = None,
+    limit: int = PAGE_SIZE,
+):
+    """Open activities targeting one release, newest first, one keyset page at a time."""
+    stmt = with_load_profile(
+        select(models.Activity)
+        .where(models.Activity.target_release_id == release_id, models.Activity.status_code != rules.STATUS_ACTIVITY_CLOSED)
+        .order_by(*(key.desc() for key in ACTIVITY_SORT_KEYS)),
+        load,
+    )
+    return keyset_page(session, stmt, ACTIVITY_SORT_KEYS, cursor, limit, descending=True)
+
+
 def create_activity(
     session: Session,
     type_code: str,
@@ -372,6 +753,7 @@ def create_activity(
     )
     set_activity_status(act, status_code)
     session.add(act)
+    bump_dashboard_counts(session, added=activity_count_keys(act))
     session.commit()
     session.refresh(act)
     return act
@@ -410,6 +792,7 @@ def update_activity(
         rel = get_release(session, target_release_id)
         if not rel or rules.release_is_installed(rel.status_code):
             raise ValueError("Target release invalida (INSTALLED nao permitido).")
+    old_keys = activity_count_keys(act)
     act.type_code = type_code
     act.subtype_code = subtype_code
     act.title = title.strip()
@@ -420,12 +803,200 @@ def update_activity(
     act.start_date = start_date
     set_activity_status(act, status_code)
     act.updated_at = datetime.utcnow()
+    bump_dashboard_counts(session, removed=old_keys, added=activity_count_keys(act))
     session.commit()
     session.refresh(act)
     return act
 
 
-def activity_dropdown_options(session: Session):
-    stmt = select(models.Activity).order_by(models.Activity.title)
-    rows = session.execute(stmt).scalars().all()
-    return [(row.id, row.title) for row in rows]
+def _group_activities(activities: Iterable[models.Activity], attr: str) -> dict[int | None, list[models.Activity]]:
+    grouped: dict[int | None, list[models.Activity]] = {}
+    for act in activities:
+        grouped.setdefault(getattr(act, attr) or None, []).append(act)
+    return grouped
+
+
+def group_activities_by_member(activities: Iterable[models.Activity]) -> dict[int | None, list[models.Activity]]:
+    """Bucket activities by assigned_member_id in a single pass (None = unassigned)."""
+    return _group_activities(activities, "assigned_member_id")
+
+
+def group_activities_by_project(activities: Iterable[models.Activity]) -> dict[int | None, list[models.Activity]]:
+    """Bucket activities by project_id in a single pass (None = no project)."""
+    return _group_activities(activities, "project_id")
+
+
+# --- Bulk activity operations ---
+# Validate once, apply per row, commit once.
+
+UNSET = object()
+BULK_CHUNK_SIZE = 500
+
+
+def _open_project_ids(session: Session, ids: Iterable[int]) -> set[int]:
+    ids = {i for i in ids if i}
+    if not ids:
+        return set()
+    stmt = select(models.Project.id).where(
+        models.Project.id.in_(ids), models.Project.status_code != rules.STATUS_PROJECT_CLOSED
+    )
+    return set(session.execute(stmt).scalars())
+
+
+def _open_release_ids(session: Session, ids: Iterable[int]) -> set[int]:
+    ids = {i for i in ids if i}
+    if not ids:
+        return set()
+    stmt = select(models.Release.id).where(
+        models.Release.id.in_(ids), models.Release.status_code != rules.STATUS_RELEASE_INSTALLED
+    )
+    return set(session.execute(stmt).scalars())
+
+
+def _member_ids(session: Session, ids: Iterable[int]) -> set[int]:
+    ids = {i for i in ids if i}
+    if not ids:
+        return set()
+    return set(session.execute(select(models.Member.id).where(models.Member.id.in_(ids))).scalars())
+
+
+def insert_returning_ids(session: Session, model_cls, rows: list[dict]) -> list[int]:
+    """Insert ``rows`` (all with the same keys) in batched INSERT ... RETURNING; ids in row order.
+
+    SQLite cannot order the RETURNING rows of a multi-row insert (SQLAlchemy would fall
+    back to one statement per row for ``sort_by_parameter_order``), but without
+    AUTOINCREMENT each new rowid is max + 1 in VALUES order, so the sorted ids line up.
+    """
+    table = model_cls.__table__
+    return sorted(session.scalars(insert(table).returning(table.c.id), rows).all())
+
+
+def bulk_create_activities(session: Session, rows: list[dict]) -> list[int]:
+    """Create many activities in one transaction; returns their ids in row order.
+
+    Each row takes the same keyword arguments as ``create_activity``; any invalid
+    row aborts the whole batch. Valid batches go in with one INSERT ... RETURNING
+    executemany plus one change-log executemany, not a flush per row.
+    """
+    project_ids = _open_project_ids(session, (row.get("project_id") for row in rows))
+    release_ids = _open_release_ids(session, (row.get("target_release_id") for row in rows))
+    member_ids = _member_ids(session, (row.get("assigned_member_id") for row in rows))
+    now = datetime.utcnow()
+    values: list[dict] = []
+    added_keys: list[tuple[str, str]] = []
+    for line, row in enumerate(rows, start=1):
+        try:
+            title = (row.get("title") or "").strip()
+            if not title:
+                raise ValueError("Titulo obrigatorio.")
+            _ensure_index_code(session, models.IndexActivityType, row.get("type_code"))
+            _ensure_index_code(session, models.IndexActivitySubtype, row.get("subtype_code"))
+            _ensure_index_code(session, models.IndexActivityStatus, row.get("status_code"))
+            if row.get("project_id") and row["project_id"] not in project_ids:
+                raise ValueError("Projeto invalido (CLOSED nao permitido).")
+            if row.get("target_release_id") and row["target_release_id"] not in release_ids:
+                raise ValueError("Target release invalida (INSTALLED nao permitido).")
+            if row.get("assigned_member_id") and row["assigned_member_id"] not in member_ids:
+                raise ValueError("Member nao encontrado.")
+        except ValueError as exc:
+            raise ValueError(f"Linha {line}: {exc}") from exc
+        ticket_code = row.get("ticket_code")
+        row_values = {
+            "type_code": row["type_code"],
+            "subtype_code": row["subtype_code"],
+            "title": title,
+            "status_code": row["status_code"],
+            "ticket_code": ticket_code.strip() if ticket_code else None,
+            "assigned_member_id": row.get("assigned_member_id"),
+            "project_id": row.get("project_id"),
+            "target_release_id": row.get("target_release_id"),
+            "start_date": row.get("start_date"),
+            # As set_activity_status does for a new activity.
+            "end_date": now if rules.activity_is_closed(row["status_code"]) else None,
+        }
+        values.append(row_values)
+        added_keys += activity_count_keys(models.Activity(**row_values))
+    if not values:
+        return []
+    ids = insert_returning_ids(session, models.Activity, values)
+    audit.record_inserts(session, models.Activity, ids, values)
+    bump_dashboard_counts(session, added=added_keys)
+    session.commit()
+    return ids
+
+
+def bulk_update_activities(
+    session: Session,
+    activity_ids: Iterable[int],
+    status_code: str | None = None,
+    assigned_member_id=UNSET,
+    target_release_id=UNSET,
+) -> int:
+    """Status change, reassignment and/or retarget for many activities in one transaction.
+
+    ``assigned_member_id`` / ``target_release_id`` are left untouched when ``UNSET``;
+    ``None`` clears them. Returns the number of activities updated.
+    """
+    ids = sorted({int(i) for i in activity_ids})
+    if not ids:
+        raise ValueError("Nenhuma activity selecionada.")
+    if status_code is None and assigned_member_id is UNSET and target_release_id is UNSET:
+        raise ValueError("Nenhuma alteracao informada.")
+    if status_code is not None:
+        _ensure_index_code(session, models.IndexActivityStatus, status_code)
+    if assigned_member_id not in (UNSET, None) and not _member_ids(session, [assigned_member_id]):
+        raise ValueError("Member nao encontrado.")
+    if target_release_id not in (UNSET, None) and not _open_release_ids(session, [target_release_id]):
+        raise ValueError("Target release invalida (INSTALLED nao permitido).")
+
+    now = datetime.utcnow()
+    removed_keys: list[tuple[str, str]] = []
+    added_keys: list[tuple[str, str]] = []
+    updated = 0
+    for start in range(0, len(ids), BULK_CHUNK_SIZE):
+        chunk = ids[start : start + BULK_CHUNK_SIZE]
+        for act in session.execute(select(models.Activity).where(models.Activity.id.in_(chunk))).scalars():
+            removed_keys += activity_count_keys(act)
+            if status_code is not None:
+                set_activity_status(act, status_code, now)
+            if assigned_member_id is not UNSET:
+                act.assigned_member_id = assigned_member_id
+            if target_release_id is not UNSET:
+                act.target_release_id = target_release_id
+            act.updated_at = now
+            added_keys += activity_count_keys(act)
+            updated += 1
+    if updated != len(ids):
+        session.rollback()
+        raise ValueError("Activity nao encontrada.")
+    bump_dashboard_counts(session, removed=removed_keys, added=added_keys)
+    session.commit()
+    return updated
+
+
+def activity_dropdown_options(session: Session) -> list[tuple[int, str]]:
+    stmt = select(models.Activity.id, models.Activity.title).order_by(models.Activity.title)
+    return [tuple(row) for row in session.execute(stmt)]
+
+
+# --- Form options bundle ---
+# Every activity form needs the same six dropdowns. They are built from column-only
+# queries and kept until the next committed write (db.data_version), so a form render
+# normally costs one cache hit. Treat the returned lists as read-only.
+
+def build_form_options(session: Session) -> dict:
+    return {
+        "type_options": get_index_options(session, models.IndexActivityType),
+        "subtype_options": get_index_options(session, models.IndexActivitySubtype),
+        "status_options": get_index_options(session, models.IndexActivityStatus),
+        "member_options": member_dropdown_options(session),
+        "project_options": project_dropdown_options(session),
+        "release_options": release_dropdown_options(session),
+    }
+
+
+form_options_cache = lookups.VersionedCache(build_form_options, name="form_options")
+
+
+def form_options(session: Session) -> dict:
+    return form_options_cache.get(session)
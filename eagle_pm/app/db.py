@@ -1,19 +1,75 @@
 from __future__ import annotations
 
 import os
+import re
+import sqlite3
+import threading
+import time
 from pathlib import Path
-from sqlalchemy import create_engine
+
+from anyio import from_thread
+from sqlalchemy import create_engine, event
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import declarative_base, sessionmaker
 
 DATABASE_PATH = Path(os.getenv("EAGLE_PM_DB_PATH", "eagle_pm.db"))
 DATABASE_URL = f"sqlite:///{DATABASE_PATH}"
+ASYNC_DATABASE_URL = f"sqlite+aiosqlite:///{DATABASE_PATH}"
+
+# Connection pool limits, per engine (sync and async each keep their own pool).
+DB_POOL_SIZE = int(os.getenv("EAGLE_PM_DB_POOL_SIZE", "5"))
+DB_MAX_OVERFLOW = int(os.getenv("EAGLE_PM_DB_MAX_OVERFLOW", "10"))
+DB_POOL_TIMEOUT = float(os.getenv("EAGLE_PM_DB_POOL_TIMEOUT", "30"))
+
+# Connection-level SQLite tuning, applied on every new DBAPI connection.
+# Set EAGLE_PM_SQLITE_PROFILE=default to keep SQLite's stock settings.
+SQLITE_PROFILE = os.getenv("EAGLE_PM_SQLITE_PROFILE", "performance")
+SQLITE_PRAGMAS = {
+    "journal_mode": os.getenv("EAGLE_PM_SQLITE_JOURNAL_MODE", "WAL"),
+    "synchronous": os.getenv("EAGLE_PM_SQLITE_SYNCHRONOUS", "NORMAL"),
+    # Negative cache_size is in KiB: -65536 = 64 MiB page cache.
+    "cache_size": os.getenv("EAGLE_PM_SQLITE_CACHE_SIZE", "-65536"),
+    "mmap_size": os.getenv("EAGLE_PM_SQLITE_MMAP_SIZE", str(256 * 1024 * 1024)),
+    "temp_store": os.getenv("EAGLE_PM_SQLITE_TEMP_STORE", "MEMORY"),
+    "busy_timeout": os.getenv("EAGLE_PM_SQLITE_BUSY_TIMEOUT_MS", "5000"),
+}
+_PRAGMA_VALUE = re.compile(r"^-?[A-Za-z0-9_]+$")
+
+
+def apply_sqlite_pragmas(dbapi_connection, pragmas: dict[str, str] | None = None) -> None:
+    pragmas = SQLITE_PRAGMAS if pragmas is None else pragmas
+    cursor = dbapi_connection.cursor()
+    try:
+        for name, value in pragmas.items():
+            if not _PRAGMA_VALUE.fullmatch(str(value)):
+                raise ValueError(f"Valor invalido para PRAGMA {name}: {value!r}")
+            cursor.execute(f"PRAGMA {name}={value}")
+    finally:
+        cursor.close()
+
+
+_POOL_ARGS = {"pool_size": DB_POOL_SIZE, "max_overflow": DB_MAX_OVERFLOW, "pool_timeout": DB_POOL_TIMEOUT}
 
 engine = create_engine(
     DATABASE_URL,
     connect_args={"check_same_thread": False},
     future=True,
+    **_POOL_ARGS,
 )
+# Read-heavy routes run as ``async def`` on this engine: aiosqlite gives each
+# connection its own thread, so a request waiting on SQLite holds no threadpool slot.
+async_engine = create_async_engine(ASYNC_DATABASE_URL, **_POOL_ARGS)
+
+
+@event.listens_for(engine, "connect")
+@event.listens_for(async_engine.sync_engine, "connect")
+def _on_connect(dbapi_connection, _connection_record) -> None:
+    if SQLITE_PROFILE == "performance":
+        apply_sqlite_pragmas(dbapi_connection)
+
+
 SessionLocal = sessionmaker(bind=engine, autoflush=False, autocommit=False, future=True)
+AsyncSessionLocal = async_sessionmaker(bind=async_engine, autoflush=False, expire_on_commit=False)
 Base = declarative_base()
 
 
@@ -25,13 +81,93 @@ def get_session():
         db.close()
 
 
+async def get_async_session():
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
 def init_db() -> None:
-    from . import crud, models  # ensure models are imported
+    """Apply pending schema migrations, then load the in-memory lookups.
+
+    With the schema current this is a version check and the index-table load;
+    table creation, seeding and the search-index check only run in migrations.
+    """
+    from . import lookups, migrations, models, search  # noqa: F401 - models registers the tables
 
-    Base.metadata.create_all(bind=engine)
+    migrations.migrate(engine)
+    with engine.connect() as conn:
+        search.detect(conn)
     with SessionLocal() as session:
-        crud.seed_index_tables(session)
-        session.commit()
+        lookups.registry.load(session)
+
+
+def checkpoint() -> None:
+    """Fold the WAL back into the main .db file so a plain file copy is complete."""
+    with engine.connect() as conn:
+        conn.exec_driver_sql("PRAGMA wal_checkpoint(TRUNCATE)")
+
+
+# Change detection for conditional GETs. ``PRAGMA data_version`` changes whenever another
+# connection commits, so a dedicated connection that never writes sees every commit:
+# pooled ORM sessions, the CLI, other processes. Its value restarts when that connection
+# is reopened (restore, new process), hence the epoch.
+_version_lock = threading.Lock()
+_version_conn: sqlite3.Connection | None = None
+_version_epoch = f"{time.time_ns():x}"
+
+
+def data_version() -> str:
+    """Opaque token that changes after any committed write to the database."""
+    global _version_conn
+    with _version_lock:
+        if _version_conn is None:
+            _version_conn = sqlite3.connect(str(DATABASE_PATH), check_same_thread=False)
+        return f"{_version_epoch}.{_version_conn.execute('PRAGMA data_version').fetchone()[0]}"
+
+
+def _reset_data_version() -> None:
+    global _version_conn, _version_epoch
+    with _version_lock:
+        if _version_conn is not None:
+            _version_conn.close()
+            _version_conn = None
+        _version_epoch = f"{time.time_ns():x}"
+
+
+def dispose_engines() -> None:
+    """Close pooled connections of both engines (e.g. before the database file is swapped)."""
+    engine.dispose()
+    _reset_data_version()
+    try:
+        # From a sync route's worker thread: close the aiosqlite connections on the event loop that owns them.
+        from_thread.run(async_engine.dispose)
+    except RuntimeError:
+        # No event loop behind this thread (CLI), so no async connection was ever opened.
+        async_engine.sync_engine.dispose(close=False)
+
+
+def optimize(vacuum: bool = False) -> None:
+    """Refresh planner statistics (ANALYZE); with ``vacuum``, also rebuild the file to reclaim space."""
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+        if vacuum:
+            conn.exec_driver_sql("VACUUM")
+        conn.exec_driver_sql("ANALYZE")
+        conn.exec_driver_sql("PRAGMA optimize")
 
 
-__all__ = ["Base", "engine", "SessionLocal", "get_session", "init_db"]
+__all__ = [
+    "Base",
+    "engine",
+    "async_engine",
+    "SessionLocal",
+    "AsyncSession",
+    "AsyncSessionLocal",
+    "get_session",
+    "get_async_session",
+    "init_db",
+    "checkpoint",
+    "data_version",
+    "dispose_engines",
+    "optimize",
+    "apply_sqlite_pragmas",
+]
@@ -2,13 +2,147 @@ from __future__ import annotations
 
 import csv
 import io
-from typing import Iterable, List
+import tempfile
+from typing import Callable, Iterable, Iterator, List, Tuple
 
+from . import crud
+from .db import SessionLocal
 
-def rows_to_csv(headers: List[str], rows: Iterable[Iterable]) -> str:
+# Rows fetched per round trip while streaming an export.
+EXPORT_CHUNK_SIZE = 500
+# Flush the CSV buffer to the client once it grows past this many characters.
+CSV_FLUSH_SIZE = 64 * 1024
+# Bytes read per chunk when streaming a finished XLSX file back to the client.
+XLSX_READ_SIZE = 64 * 1024
+XLSX_MEDIA_TYPE = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+
+MEMBER_HEADERS = ["name", "role", "status", "created_at", "updated_at"]
+RELEASE_HEADERS = ["release_code", "status", "delivery_date", "start_date", "installation_date", "created_at", "updated_at"]
+PROJECT_HEADERS = ["project_code", "title", "pm_responsible", "eba_responsible", "status", "e2e_date", "target_release", "created_at", "updated_at"]
+ACTIVITY_HEADERS = ["title", "type", "subtype", "status", "project", "assigned_member", "target_release", "ticket_code", "start_date", "end_date", "created_at", "updated_at"]
+
+
+def member_row(m) -> list:
+    return [
+        m.name,
+        m.role.name if m.role else m.role_code,
+        m.status.name if m.status else m.status_code,
+        m.created_at,
+        m.updated_at,
+    ]
+
+
+def release_row(r) -> list:
+    return [
+        r.release_code,
+        r.status.name if r.status else r.status_code,
+        r.delivery_date,
+        r.start_date,
+        r.installation_date,
+        r.created_at,
+        r.updated_at,
+    ]
+
+
+def project_row(p) -> list:
+    return [
+        p.project_code,
+        p.title,
+        p.pm_responsible,
+        p.eba_responsible,
+        p.status.name if p.status else p.status_code,
+        p.e2e_date if p.e2e_date else "",
+        p.target_release.release_code if p.target_release else "",
+        p.created_at,
+        p.updated_at,
+    ]
+
+
+def activity_row(a) -> list:
+    return [
+        a.title,
+        a.type.name if a.type else a.type_code,
+        a.subtype.name if a.subtype else a.subtype_code,
+        a.status.name if a.status else a.status_code,
+        a.project.project_code if a.project else "",
+        a.assigned_member.name if a.assigned_member else "",
+        a.target_release.release_code if a.target_release else "",
+        a.ticket_code or "",
+        a.start_date or "",
+        a.end_date or "",
+        a.created_at,
+        a.updated_at,
+    ]
+
+
+def iter_query_rows(stmt, row_fn: Callable[[object], list], chunk_size: int = EXPORT_CHUNK_SIZE) -> Iterator[list]:
+    """Run ``stmt`` in its own session and yield ``row_fn(obj)`` per result, ``chunk_size`` rows at a time.
+
+    The session lives inside the generator so it stays open for as long as a
+    streaming response is still being consumed.
+    """
+    with SessionLocal() as session:
+        result = session.execute(stmt.execution_options(yield_per=chunk_size))
+        for obj in result.scalars():
+            yield row_fn(obj)
+
+
+EXPORT_KINDS = ("members", "releases", "projects", "activities")
+
+
+def export_sheet(kind: str, stmt=None) -> Tuple[str, List[str], Iterator[list]]:
+    """``(title, headers, rows)`` for one entity; ``stmt`` defaults to its unfiltered list query."""
+    if kind == "members":
+        return kind, MEMBER_HEADERS, iter_query_rows(stmt if stmt is not None else crud.list_members_stmt(load="member"), member_row)
+    if kind == "releases":
+        return kind, RELEASE_HEADERS, iter_query_rows(stmt if stmt is not None else crud.list_releases_stmt(load="release"), release_row)
+    if kind == "projects":
+        return kind, PROJECT_HEADERS, iter_query_rows(stmt if stmt is not None else crud.list_projects_stmt(load="project"), project_row)
+    if kind == "activities":
+        return kind, ACTIVITY_HEADERS, iter_query_rows(stmt if stmt is not None else crud.list_activities_stmt(load="activity_row"), activity_row)
+    raise ValueError(f"Tipo de exportacao desconhecido: {kind}")
+
+
+def iter_csv(headers: List[str], rows: Iterable[Iterable]) -> Iterator[str]:
+    """Yield CSV text in bounded chunks instead of building the whole file."""
     buffer = io.StringIO()
     writer = csv.writer(buffer)
     writer.writerow(headers)
     for row in rows:
         writer.writerow(row)
-    return buffer.getvalue()
+        if buffer.tell() >= CSV_FLUSH_SIZE:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+    yield buffer.getvalue()
+
+
+def rows_to_csv(headers: List[str], rows: Iterable[Iterable]) -> str:
+    return "".join(iter_csv(headers, rows))
+
+
+def _xlsx_value(value):
+    # Empty strings become empty cells; dates/datetimes are kept as real date cells.
+    return None if value == "" else value
+
+
+def write_xlsx(target, sheets: Iterable[Tuple[str, List[str], Iterable[Iterable]]]) -> None:
+    """Write ``(title, headers, rows)`` sheets using openpyxl's write-only (streaming) mode."""
+    from openpyxl import Workbook
+
+    workbook = Workbook(write_only=True)
+    for title, headers, rows in sheets:
+        sheet = workbook.create_sheet(title=title)
+        sheet.append(headers)
+        for row in rows:
+            sheet.append([_xlsx_value(value) for value in row])
+    workbook.save(target)
+
+
+def iter_xlsx(sheets: Iterable[Tuple[str, List[str], Iterable[Iterable]]]) -> Iterator[bytes]:
+    """Build the workbook in a temp file, then yield it in fixed-size chunks."""
+    with tempfile.TemporaryFile() as tmp:
+        write_xlsx(tmp, sheets)
+        tmp.seek(0)
+        while chunk := tmp.read(XLSX_READ_SIZE):
+            yield chunk
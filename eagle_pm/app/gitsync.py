@@ -0,0 +1,199 @@
+from __future__ import annotations
+
+import logging
+import os
+import subprocess
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Callable
+
+from . import db
+
+logger = logging.getLogger(__name__)
+
+# Per git command; a hanging push (network, credential prompt) is killed after this.
+GIT_TIMEOUT_SECONDS = float(os.getenv("EAGLE_PM_GIT_TIMEOUT", "60"))
+# Minutes between background syncs while the app runs; 0 disables (sync only on Exit).
+GIT_SYNC_INTERVAL_MINUTES = float(os.getenv("EAGLE_PM_GIT_SYNC_INTERVAL", "0"))
+# Upper bound on how long /shutdown keeps the process alive waiting for the final sync.
+SHUTDOWN_MAX_WAIT_SECONDS = float(os.getenv("EAGLE_PM_SHUTDOWN_MAX_WAIT", str(GIT_TIMEOUT_SECONDS * 3 + 10)))
+
+STATE_IDLE = "idle"
+STATE_RUNNING = "running"
+STATE_OK = "ok"
+STATE_SKIPPED = "skipped"
+STATE_FAILED = "failed"
+
+
+def git_root_from_env_or_tree() -> Path | None:
+    env_root = os.getenv("EAGLE_GIT_ROOT")
+    if env_root:
+        p = Path(env_root)
+        if (p / ".git").exists():
+            return p
+    current = Path(__file__).resolve()
+    for parent in [current] + list(current.parents):
+        if (parent / ".git").exists():
+            return parent
+    return None
+
+
+class GitSync:
+    """Runs git add/commit/push in a background thread; one sync at a time.
+
+    ``status()`` is what the shutdown page polls; ``wait()`` bounds how long
+    the caller blocks on an in-flight sync and any sync queued behind it.
+    """
+
+    def __init__(self, timeout: float = GIT_TIMEOUT_SECONDS) -> None:
+        self.timeout = timeout
+        self._lock = threading.Lock()
+        self._done = threading.Event()
+        self._done.set()
+        self._thread: threading.Thread | None = None
+        self._running = False
+        # (reason, prepare) of a sync requested with queue=True while another was running.
+        self._queued: tuple[str, Callable[[], None] | None] | None = None
+        self._stop_periodic = threading.Event()
+        self._periodic: threading.Thread | None = None
+        self._status = {
+            "state": STATE_IDLE,
+            "message": "",
+            "reason": None,
+            "started_at": None,
+            "finished_at": None,
+            "last_success_at": None,
+        }
+
+    def status(self) -> dict:
+        with self._lock:
+            return dict(self._status)
+
+    def _set(self, **values) -> None:
+        with self._lock:
+            self._status.update(values)
+
+    def start(self, reason: str = "manual", queue: bool = False, prepare: Callable[[], None] | None = None) -> bool:
+        """Start a sync; returns True when one started or was queued.
+
+        While a sync is running the request is dropped, unless ``queue`` is set: then
+        it runs right after the current one (the latest queued request wins).
+        ``prepare`` runs on the sync thread first (e.g. the shutdown backup); its
+        errors are logged and do not stop the sync.
+        """
+        with self._lock:
+            if self._running:
+                if not queue:
+                    return False
+                self._queued = (reason, prepare)
+                return True
+            self._running = True
+            self._done.clear()
+            self._status.update(
+                state=STATE_RUNNING, message="Syncing...", reason=reason, started_at=datetime.now(), finished_at=None
+            )
+            self._thread = threading.Thread(target=self._run, args=(prepare,), name="eagle-pm-git-sync", daemon=True)
+            self._thread.start()
+        return True
+
+    def wait(self, timeout: float | None = None) -> bool:
+        """Block until the current sync (if any) finishes; False if ``timeout`` ran out first."""
+        return self._done.wait(timeout)
+
+    def _run(self, prepare: Callable[[], None] | None) -> None:
+        while True:
+            if prepare is not None:
+                self._set(message="Preparing...")
+                try:
+                    prepare()
+                except Exception:
+                    logger.exception("Git sync preparation failed")
+                self._set(message="Syncing...")
+            try:
+                state, message = self.sync()
+            except Exception as exc:  # never let the thread die without reporting
+                logger.exception("Git sync failed")
+                state, message = STATE_FAILED, f"Git sync failed: {exc}"
+            finished = datetime.now()
+            with self._lock:
+                self._status.update(state=state, message=message, finished_at=finished)
+                if state == STATE_OK:
+                    self._status["last_success_at"] = finished
+                if self._queued is None:
+                    self._running = False
+                    self._done.set()
+                    return
+                reason, prepare = self._queued
+                self._queued = None
+                self._status.update(
+                    state=STATE_RUNNING, message="Syncing...", reason=reason, started_at=datetime.now(), finished_at=None
+                )
+
+    def _git(self, git_root: Path, *args: str) -> subprocess.CompletedProcess:
+        # No terminal prompts: a missing credential must fail, not wait for input forever.
+        env = dict(os.environ, GIT_TERMINAL_PROMPT="0")
+        return subprocess.run(
+            ["git", "-C", str(git_root), *args],
+            capture_output=True,
+            text=True,
+            check=True,
+            timeout=self.timeout,
+            env=env,
+        )
+
+    def sync(self) -> tuple[str, str]:
+        """Commit and push the working tree synchronously; returns (state, message)."""
+        git_root = git_root_from_env_or_tree()
+        if not git_root:
+            return STATE_SKIPPED, "No git repository found; skipping commit/push."
+        now_str = datetime.utcnow().strftime("%Y-%m-%d %H:%M:%S UTC")
+        try:
+            # With WAL, recent commits may still live in the -wal file; fold them into the .db first.
+            db.checkpoint()
+            branch, *changes = self._git(git_root, "status", "--porcelain", "--branch").stdout.splitlines()
+            # A commit left unpushed by an earlier failed/timed-out sync is pushed on the next run.
+            if not changes and "[ahead " not in branch:
+                return STATE_SKIPPED, "No changes to commit."
+            if changes:
+                self._git(git_root, "add", ".")
+                self._git(git_root, "commit", "-m", now_str)
+            self._git(git_root, "push")
+            return STATE_OK, f"Committed and pushed at {now_str}." if changes else f"Pushed pending commits at {now_str}."
+        except subprocess.TimeoutExpired as exc:
+            return STATE_FAILED, f"Git operation timed out after {self.timeout:.0f}s: {' '.join(exc.cmd[3:])}"
+        except subprocess.CalledProcessError as exc:
+            detail = (exc.stderr or exc.stdout or "").strip().splitlines()
+            return STATE_FAILED, f"Git operation failed: {' '.join(exc.cmd[3:])}" + (f" ({detail[0]})" if detail else "")
+
+    def start_periodic(self, interval_minutes: float = GIT_SYNC_INTERVAL_MINUTES) -> None:
+        if interval_minutes <= 0 or (self._periodic and self._periodic.is_alive()):
+            return
+        self._stop_periodic.clear()
+        self._periodic = threading.Thread(
+            target=self._periodic_loop, args=(interval_minutes * 60,), name="eagle-pm-git-sync-timer", daemon=True
+        )
+        self._periodic.start()
+
+    def stop_periodic(self, timeout: float = 5.0) -> None:
+        self._stop_periodic.set()
+        if self._periodic:
+            self._periodic.join(timeout)
+            self._periodic = None
+
+    def _periodic_loop(self, interval: float) -> None:
+        while not self._stop_periodic.wait(interval):
+            self.start(reason="periodic")
+
+
+git_sync = GitSync()
+
+
+__all__ = [
+    "GIT_SYNC_INTERVAL_MINUTES",
+    "GIT_TIMEOUT_SECONDS",
+    "GitSync",
+    "SHUTDOWN_MAX_WAIT_SECONDS",
+    "git_root_from_env_or_tree",
+    "git_sync",
+]
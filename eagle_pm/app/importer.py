@@ -0,0 +1,445 @@
+"""Bulk import of members, releases, projects and activities from CSV/XLSX.
+
+Files use the same shape as the exports (see ``export.py``): index columns may hold
+either the code or the display name, and references use natural keys (member name,
+``release_code``, ``project_code``). Rows are validated against the cached index
+codes and keys preloaded once per import, then inserted with chunked executemany
+statements (plus one change_log executemany per chunk). Invalid rows are collected
+in the report; valid rows are still imported.
+
+CLI: ``python -m eagle_pm.app.importer <kind|workbook> <file> [<file> ...]``
+"""
+from __future__ import annotations
+
+import csv
+import io
+import sys
+from datetime import date, datetime
+from pathlib import Path
+from typing import Callable, Dict, Iterable, Iterator, List, Tuple
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from . import audit, crud, models, rules
+from .lookups import registry
+
+# Rows per INSERT ... executemany and per commit.
+IMPORT_CHUNK_SIZE = 1000
+# Errors kept in a report; the total is still counted past this.
+MAX_REPORTED_ERRORS = 500
+
+KIND_MEMBERS = "members"
+KIND_RELEASES = "releases"
+KIND_PROJECTS = "projects"
+KIND_ACTIVITIES = "activities"
+# Dependency order: later kinds reference keys created by earlier ones.
+KINDS = (KIND_MEMBERS, KIND_RELEASES, KIND_PROJECTS, KIND_ACTIVITIES)
+
+REQUIRED_COLUMNS = {
+    KIND_MEMBERS: ("name", "role", "status"),
+    KIND_RELEASES: ("release_code", "delivery_date", "start_date", "installation_date"),
+    KIND_PROJECTS: ("project_code", "title", "pm_responsible", "eba_responsible", "status"),
+    KIND_ACTIVITIES: ("title", "type", "subtype", "status"),
+}
+
+
+class ImportReport:
+    """Outcome of importing one sheet/file: inserted count plus per-row errors."""
+
+    def __init__(self, kind: str, source: str = "") -> None:
+        self.kind = kind
+        self.source = source
+        self.inserted = 0
+        self.rows = 0
+        self.error_count = 0
+        self.errors: List[Tuple[int, str]] = []
+
+    def add_error(self, line: int, message: str) -> None:
+        self.error_count += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append((line, message))
+
+    def as_dict(self) -> dict:
+        return {
+            "kind": self.kind,
+            "source": self.source,
+            "rows": self.rows,
+            "inserted": self.inserted,
+            "error_count": self.error_count,
+            "errors": [{"line": line, "message": message} for line, message in self.errors],
+        }
+
+
+# --- Readers ---
+# Each yields (line, row dict) with lower-cased header keys; line is the 1-based
+# file line (header = 1), as seen in a spreadsheet.
+
+
+def _normalize_header(values: Iterable) -> List[str]:
+    return [str(value or "").strip().lower() for value in values]
+
+
+def iter_csv_rows(stream) -> Iterator[Tuple[int, dict]]:
+    """Read a CSV from a binary or text stream, one row at a time."""
+    if not isinstance(stream, io.TextIOBase):
+        stream = io.TextIOWrapper(stream, encoding="utf-8-sig", newline="")
+    reader = csv.reader(stream)
+    headers = _normalize_header(next(reader, []))
+    for line, values in enumerate(reader, start=2):
+        if any(value.strip() for value in values):
+            yield line, dict(zip(headers, values))
+
+
+def open_xlsx(stream):
+    """Open a workbook in read-only mode; sheets are streamed by ``iter_sheet_rows``."""
+    from openpyxl import load_workbook
+
+    return load_workbook(stream, read_only=True, data_only=True)
+
+
+def iter_sheet_rows(sheet) -> Iterator[Tuple[int, dict]]:
+    values_iter = sheet.iter_rows(values_only=True)
+    headers = _normalize_header(next(values_iter, ()))
+    for line, values in enumerate(values_iter, start=2):
+        if any(value not in (None, "") for value in values):
+            yield line, dict(zip(headers, values))
+
+
+# --- Value parsing ---
+
+
+def _text(row: dict, column: str) -> str:
+    value = row.get(column)
+    return "" if value is None else str(value).strip()
+
+
+def _date(row: dict, column: str, required: bool = False) -> date | None:
+    value = row.get(column)
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    text = "" if value is None else str(value).strip()
+    if not text:
+        if required:
+            raise ValueError("Datas obrigatorias.")
+        return None
+    for parse in (date.fromisoformat, lambda v: datetime.fromisoformat(v).date(), lambda v: datetime.strptime(v, "%d/%m/%Y").date()):
+        try:
+            return parse(text)
+        except ValueError:
+            continue
+    raise ValueError(f"Data invalida: {text}")
+
+
+class _Keys:
+    """Lookups preloaded once per import: index codes by code/name and natural keys to ids."""
+
+    def __init__(self, session: Session) -> None:
+        self.session = session
+        self._index: Dict[str, Dict[str, str]] = {}
+        self.members: Dict[str, int] = {}
+        for member_id, name in session.execute(select(models.Member.id, models.Member.name).order_by(models.Member.id)):
+            self.members.setdefault(name.strip().lower(), member_id)
+        self.releases: Dict[str, Tuple[int, str]] = {
+            code: (release_id, status_code)
+            for release_id, code, status_code in session.execute(
+                select(models.Release.id, models.Release.release_code, models.Release.status_code)
+            )
+        }
+        self.projects: Dict[str, Tuple[int, str]] = {
+            code: (project_id, status_code)
+            for project_id, code, status_code in session.execute(
+                select(models.Project.id, models.Project.project_code, models.Project.status_code)
+            )
+        }
+
+    def index_code(self, model_cls, value: str) -> str:
+        """Resolve an index value given as code ("003") or name ("DEV")."""
+        table = model_cls.__tablename__
+        if table not in self._index:
+            lookup: Dict[str, str] = {}
+            for code, name in registry.options(self.session, model_cls):
+                lookup[code] = code
+                lookup[name.upper()] = code
+            self._index[table] = lookup
+        if not value:
+            raise ValueError("Codigo obrigatorio.")
+        code = self._index[table].get(value.upper())
+        if code is None:
+            raise ValueError(f"Codigo de indice invalido: {value}")
+        return code
+
+    def open_release_id(self, value: str) -> int | None:
+        if not value:
+            return None
+        found = self.releases.get(value)
+        if not found or rules.release_is_installed(found[1]):
+            raise ValueError(f"Target release invalida (INSTALLED nao permitido): {value}")
+        return found[0]
+
+    def open_project_id(self, value: str) -> int | None:
+        if not value:
+            return None
+        found = self.projects.get(value)
+        if not found or rules.project_is_closed(found[1]):
+            raise ValueError(f"Projeto invalido (CLOSED nao permitido): {value}")
+        return found[0]
+
+    def member_id(self, value: str) -> int | None:
+        if not value:
+            return None
+        found = self.members.get(value.lower())
+        if found is None:
+            raise ValueError(f"Member nao encontrado: {value}")
+        return found
+
+
+# --- Row converters: row dict -> column values for INSERT, raising ValueError ---
+
+
+def _member_values(keys: _Keys, row: dict, today: date) -> dict:
+    name = _text(row, "name")
+    if not name:
+        raise ValueError("Nome obrigatorio.")
+    if name.lower() in keys.members:
+        raise ValueError(f"Member ja existe: {name}")
+    role_code = keys.index_code(models.IndexRole, _text(row, "role"))
+    status_code = keys.index_code(models.IndexUserStatus, _text(row, "status"))
+    vacation_start = _date(row, "vacation_start")
+    vacation_end = _date(row, "vacation_end")
+    if vacation_start and vacation_end and vacation_end < vacation_start:
+        raise ValueError("Data fim de ferias antes do inicio.")
+    if status_code == rules.INDEX_VALUES["index_user_status"][0][0]:
+        vacation_start = vacation_end = None
+    # Reserve the key so a duplicate later in the same file is reported too.
+    keys.members[name.lower()] = 0
+    return {
+        "name": name,
+        "role_code": role_code,
+        "status_code": status_code,
+        "vacation_start": vacation_start,
+        "vacation_end": vacation_end,
+    }
+
+
+def _release_values(keys: _Keys, row: dict, today: date) -> dict:
+    code = _text(row, "release_code")
+    if not code:
+        raise ValueError("Release code obrigatorio.")
+    if code in keys.releases:
+        raise ValueError(f"Release code ja existe: {code}")
+    delivery_date = _date(row, "delivery_date", required=True)
+    start_date = _date(row, "start_date", required=True)
+    installation_date = _date(row, "installation_date", required=True)
+    # The status column of an export is ignored: it is derived from the dates, as in create_release.
+    status_code = rules.release_status_for_dates(start_date, installation_date, today)
+    keys.releases[code] = (0, status_code)
+    return {
+        "release_code": code,
+        "status_code": status_code,
+        "delivery_date": delivery_date,
+        "start_date": start_date,
+        "installation_date": installation_date,
+    }
+
+
+def _project_values(keys: _Keys, row: dict, today: date) -> dict:
+    code = _text(row, "project_code")
+    if not rules.project_code_is_valid(code):
+        raise ValueError(f"Project code invalido (formato PR + digitos): {code}")
+    if code in keys.projects:
+        raise ValueError(f"Project code ja existe: {code}")
+    title = _text(row, "title")
+    pm_responsible = _text(row, "pm_responsible")
+    eba_responsible = _text(row, "eba_responsible")
+    if not title or not pm_responsible or not eba_responsible:
+        raise ValueError("Campos obrigatorios ausentes.")
+    status_code = keys.index_code(models.IndexProjectStatus, _text(row, "status"))
+    values = {
+        "project_code": code,
+        "title": title,
+        "pm_responsible": pm_responsible,
+        "eba_responsible": eba_responsible,
+        "status_code": status_code,
+        "e2e_date": _date(row, "e2e_date"),
+        "target_release_id": keys.open_release_id(_text(row, "target_release")),
+    }
+    keys.projects[code] = (0, status_code)
+    return values
+
+
+def _activity_values(keys: _Keys, row: dict, today: date) -> dict:
+    title = _text(row, "title")
+    if not title:
+        raise ValueError("Titulo obrigatorio.")
+    status_code = keys.index_code(models.IndexActivityStatus, _text(row, "status"))
+    return {
+        "type_code": keys.index_code(models.IndexActivityType, _text(row, "type")),
+        "subtype_code": keys.index_code(models.IndexActivitySubtype, _text(row, "subtype")),
+        "title": title,
+        "status_code": status_code,
+        "ticket_code": _text(row, "ticket_code") or None,
+        "assigned_member_id": keys.member_id(_text(row, "assigned_member")),
+        "project_id": keys.open_project_id(_text(row, "project")),
+        "target_release_id": keys.open_release_id(_text(row, "target_release")),
+        "start_date": _date(row, "start_date"),
+        "end_date": datetime.utcnow() if rules.activity_is_closed(status_code) else None,
+    }
+
+
+_IMPORTERS: Dict[str, Tuple[type, Callable[[_Keys, dict, date], dict]]] = {
+    KIND_MEMBERS: (models.Member, _member_values),
+    KIND_RELEASES: (models.Release, _release_values),
+    KIND_PROJECTS: (models.Project, _project_values),
+    KIND_ACTIVITIES: (models.Activity, _activity_values),
+}
+
+
+def _count_keys(kind: str, values: dict) -> list[tuple[str, str]]:
+    if kind == KIND_ACTIVITIES:
+        return crud.activity_count_keys(models.Activity(**values))
+    if kind == KIND_PROJECTS:
+        return crud.project_count_keys(models.Project(**values))
+    return []
+
+
+def _flush_chunk(session: Session, kind: str, model_cls, chunk: List[dict]) -> None:
+    ids = crud.insert_returning_ids(session, model_cls, chunk)
+    audit.record_inserts(session, model_cls, ids, chunk)
+    counter_keys: list[tuple[str, str]] = []
+    for values in chunk:
+        counter_keys += _count_keys(kind, values)
+    crud.bump_dashboard_counts(session, added=counter_keys)
+    session.commit()
+
+
+def import_rows(
+    session: Session,
+    kind: str,
+    rows: Iterable[Tuple[int, dict]],
+    source: str = "",
+    chunk_size: int = IMPORT_CHUNK_SIZE,
+    today: date | None = None,
+) -> ImportReport:
+    """Validate and insert ``(line, row)`` pairs of one kind; bad rows go to the report."""
+    if kind not in _IMPORTERS:
+        raise ValueError(f"Tipo de importacao desconhecido: {kind}")
+    model_cls, to_values = _IMPORTERS[kind]
+    report = ImportReport(kind, source)
+    today = today or date.today()
+    keys = _Keys(session)
+    chunk: List[dict] = []
+    checked_header = False
+    for line, row in rows:
+        if not checked_header:
+            missing = [column for column in REQUIRED_COLUMNS[kind] if column not in row]
+            if missing:
+                report.add_error(1, f"Colunas obrigatorias ausentes: {', '.join(missing)}")
+                return report
+            checked_header = True
+        report.rows += 1
+        try:
+            chunk.append(to_values(keys, row, today))
+        except ValueError as exc:
+            report.add_error(line, str(exc))
+            continue
+        if len(chunk) >= chunk_size:
+            _flush_chunk(session, kind, model_cls, chunk)
+            report.inserted += len(chunk)
+            chunk = []
+    if chunk:
+        _flush_chunk(session, kind, model_cls, chunk)
+        report.inserted += len(chunk)
+    return report
+
+
+def _kind_for(name: str) -> str | None:
+    stem = Path(name).stem.lower()
+    for kind in KINDS:
+        if stem == kind or stem.startswith(kind) or stem.startswith(f"eagle_pm_{kind}"):
+            return kind
+    return None
+
+
+def import_file(session: Session, stream, filename: str, kind: str | None = None) -> List[ImportReport]:
+    """Import a CSV (one kind) or XLSX (one kind, or a workbook with one sheet per kind).
+
+    ``kind`` may be omitted when it can be inferred from the file or sheet names
+    (``members.csv``, the ``activities`` sheet of an export workbook, ...).
+    """
+    if filename.lower().endswith(".xlsx"):
+        workbook = open_xlsx(stream)
+        try:
+            if kind:
+                sheet = workbook.worksheets[0]
+                return [import_rows(session, kind, iter_sheet_rows(sheet), source=f"{filename}:{sheet.title}")]
+            titles = {_kind_for(title): title for title in reversed(workbook.sheetnames)}
+            # Dependency order, so later sheets see the keys inserted by earlier ones.
+            reports = [
+                import_rows(session, sheet_kind, iter_sheet_rows(workbook[titles[sheet_kind]]), source=f"{filename}:{titles[sheet_kind]}")
+                for sheet_kind in KINDS
+                if sheet_kind in titles
+            ]
+        finally:
+            workbook.close()
+        if not reports:
+            raise ValueError("Nenhuma planilha reconhecida (members, releases, projects, activities).")
+        return reports
+    if not filename.lower().endswith(".csv"):
+        raise ValueError("Formato nao suportado (use .csv ou .xlsx).")
+    kind = kind or _kind_for(filename)
+    if kind is None:
+        raise ValueError("Informe o tipo de importacao.")
+    return [import_rows(session, kind, iter_csv_rows(stream), source=filename)]
+
+
+def format_report(report: ImportReport) -> str:
+    lines = [f"{report.source or report.kind}: {report.inserted}/{report.rows} rows imported, {report.error_count} errors"]
+    lines += [f"  line {line}: {message}" for line, message in report.errors]
+    if report.error_count > len(report.errors):
+        lines.append(f"  ... {report.error_count - len(report.errors)} more")
+    return "\n".join(lines)
+
+
+def main(argv: list[str] | None = None) -> int:
+    argv = sys.argv[1:] if argv is None else argv
+    if len(argv) < 2 or argv[0] not in KINDS + ("workbook",):
+        print(f"usage: python -m eagle_pm.app.importer <{'|'.join(KINDS)}|workbook> <file> [<file> ...]")
+        return 2
+    from .db import SessionLocal, init_db
+
+    kind = None if argv[0] == "workbook" else argv[0]
+    init_db()
+    failed = False
+    for path in map(Path, argv[1:]):
+        with SessionLocal() as session, path.open("rb") as stream:
+            try:
+                reports = import_file(session, stream, path.name, kind)
+            except ValueError as exc:
+                print(f"{path}: {exc}")
+                failed = True
+                continue
+        for report in reports:
+            print(format_report(report))
+            failed = failed or report.error_count > 0
+    return 1 if failed else 0
+
+
+__all__ = [
+    "IMPORT_CHUNK_SIZE",
+    "ImportReport",
+    "KINDS",
+    "format_report",
+    "import_file",
+    "import_rows",
+    "iter_csv_rows",
+    "iter_sheet_rows",
+    "open_xlsx",
+]
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
+
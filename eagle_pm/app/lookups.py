@@ -0,0 +1,151 @@
+from __future__ import annotations
+
+import threading
+from typing import Callable, Dict, List, Tuple
+
+from sqlalchemy import event, select
+from sqlalchemy.orm import Session, object_session
+
+from . import models
+from .db import data_version
+
+INDEX_MODELS = (
+    models.IndexRole,
+    models.IndexUserStatus,
+    models.IndexReleaseStatus,
+    models.IndexReleaseLinkType,
+    models.IndexProjectStatus,
+    models.IndexActivityType,
+    models.IndexActivitySubtype,
+    models.IndexActivityStatus,
+)
+
+
+class IndexRegistry:
+    """In-memory copy of the index_* lookup tables, keyed by table name.
+
+    Loaded once after seeding; a table that is missing (never loaded or invalidated)
+    is read from the DB on first use and cached again.
+    """
+
+    def __init__(self) -> None:
+        self._options: Dict[str, List[Tuple[str, str]]] = {}
+        self._codes: Dict[str, frozenset] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.db_fallbacks = 0
+
+    def load(self, session: Session) -> None:
+        for model_cls in INDEX_MODELS:
+            self._fetch(session, model_cls)
+
+    def _fetch(self, session: Session, model_cls) -> List[Tuple[str, str]]:
+        rows = session.execute(select(model_cls.code, model_cls.name).order_by(model_cls.code)).all()
+        options = [(code, name) for code, name in rows]
+        with self._lock:
+            self._options[model_cls.__tablename__] = options
+            self._codes[model_cls.__tablename__] = frozenset(code for code, _ in options)
+        return options
+
+    def options(self, session: Session, model_cls) -> List[Tuple[str, str]]:
+        cached = self._options.get(model_cls.__tablename__)
+        if cached is not None:
+            self.hits += 1
+            return list(cached)
+        self.db_fallbacks += 1
+        return list(self._fetch(session, model_cls))
+
+    def has_code(self, session: Session, model_cls, code: str) -> bool:
+        codes = self._codes.get(model_cls.__tablename__)
+        if codes is not None:
+            self.hits += 1
+            return code in codes
+        self.db_fallbacks += 1
+        self._fetch(session, model_cls)
+        return code in self._codes[model_cls.__tablename__]
+
+    def invalidate(self, table: str | None = None) -> None:
+        """Drop one table (or all) so the next read goes back to the DB."""
+        with self._lock:
+            if table is None:
+                self._options.clear()
+                self._codes.clear()
+            else:
+                self._options.pop(table, None)
+                self._codes.pop(table, None)
+
+    def stats(self) -> dict:
+        return {
+            "hits": self.hits,
+            "db_fallbacks": self.db_fallbacks,
+            "tables_cached": len(self._options),
+        }
+
+
+registry = IndexRegistry()
+
+
+class VersionedCache:
+    """One value built by ``build(session)`` and reused until the database changes.
+
+    Keyed on ``db.data_version()``, which moves on every committed write from any
+    connection or process, so no write path has to invalidate it. The version is
+    read before building: a write that lands meanwhile forces the next rebuild.
+    Named caches are listed in ``versioned_caches`` (their stats go to /metrics).
+    """
+
+    def __init__(self, build: Callable[[Session], object], name: str | None = None) -> None:
+        self.name = name
+        if name is not None:
+            versioned_caches[name] = self
+        self._build = build
+        self._lock = threading.Lock()
+        self._version: str | None = None
+        self._value = None
+        self.hits = 0
+        self.builds = 0
+
+    def get(self, session: Session):
+        version = data_version()
+        with self._lock:
+            if self._version == version:
+                self.hits += 1
+                return self._value
+        value = self._build(session)
+        with self._lock:
+            self._version, self._value = version, value
+            self.builds += 1
+        return value
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._version = self._value = None
+
+    def stats(self) -> dict:
+        return {"hits": self.hits, "builds": self.builds}
+
+
+versioned_caches: Dict[str, VersionedCache] = {}
+
+
+def _invalidate_on_write(_mapper, _connection, target) -> None:
+    registry.invalidate(target.__tablename__)
+    session = object_session(target)
+    if session is not None:
+        session.info["index_tables_dirty"] = True
+
+
+def _invalidate_on_transaction_end(session: Session) -> None:
+    # Values read between flush and commit/rollback may not survive the transaction.
+    if session.info.pop("index_tables_dirty", False):
+        registry.invalidate()
+
+
+for _model_cls in INDEX_MODELS:
+    for _event_name in ("after_insert", "after_update", "after_delete"):
+        event.listen(_model_cls, _event_name, _invalidate_on_write)
+event.listen(Session, "after_commit", _invalidate_on_transaction_end)
+event.listen(Session, "after_rollback", _invalidate_on_transaction_end)
+
+
+__all__ = ["INDEX_MODELS", "IndexRegistry", "VersionedCache", "registry", "versioned_caches"]
@@ -1,11 +1,20 @@
 from __future__ import annotations
 
+import os
 from pathlib import Path
+
+from anyio import to_thread
 from fastapi import FastAPI
 from fastapi.staticfiles import StaticFiles
 
-from . import crud, routes
-from .db import SessionLocal, init_db
+from . import routes
+from .gitsync import git_sync
+from .metrics import MetricsMiddleware
+from .db import async_engine, init_db
+from .scheduler import refresh_release_statuses, scheduler
+
+# Worker threads for sync routes (writes, exports, edit forms); AnyIO's default is 40.
+THREADPOOL_SIZE = int(os.getenv("EAGLE_PM_THREADPOOL_SIZE", "40"))
 
 app = FastAPI(title="Eagle PM", version="0.1.0")
 
@@ -14,12 +23,27 @@ static_dir = BASE_DIR / "static"
 if static_dir.exists():
     app.mount("/static", StaticFiles(directory=static_dir), name="static")
 
+app.add_middleware(MetricsMiddleware)
 app.include_router(routes.router)
 
 
 @app.on_event("startup")
 def on_startup() -> None:
+    to_thread.current_default_thread_limiter().total_tokens = THREADPOOL_SIZE
     init_db()
-    with SessionLocal() as session:
-        crud.update_release_statuses(session)
-        session.commit()
+    # Release statuses are refreshed before serving so no request sees stale ones; the
+    # other daily jobs (snapshot, backup) run on the scheduler thread's first pass.
+    refresh_release_statuses()
+    scheduler.start()
+    git_sync.start_periodic()
+
+
+@app.on_event("shutdown")
+def on_shutdown() -> None:
+    scheduler.stop()
+    git_sync.stop_periodic()
+
+
+@app.on_event("shutdown")
+async def close_async_engine() -> None:
+    await async_engine.dispose()
@@ -0,0 +1,266 @@
+from __future__ import annotations
+
+import os
+import threading
+import time
+from bisect import bisect_left
+from contextvars import ContextVar
+from typing import Dict, List, Tuple
+
+from jinja2 import Template
+from sqlalchemy import event
+
+from . import lookups
+from .db import async_engine, engine
+
+# Per-request timings (wall time, SQL statements/time, template render time) kept
+# in a ContextVar, so sync routes in the threadpool and async routes (queries through
+# AsyncSession.run_sync, template render in the threadpool) add to the same record.
+# Exposed at /metrics (Prometheus text format) and as a Server-Timing header.
+
+METRICS_ENABLED = os.getenv("EAGLE_PM_METRICS", "1") not in ("0", "false", "no")
+# Upper bounds (seconds) of the latency histogram buckets; +Inf is implicit.
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+# Upper bounds of the statements-per-request histogram.
+SQL_COUNT_BUCKETS = (1, 2, 4, 8, 16, 32, 64, 128)
+
+PROMETHEUS_MEDIA_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+_QUERY_START = "metrics_query_start"
+
+
+class RequestTimings:
+    __slots__ = ("sql_count", "sql_seconds", "template_seconds")
+
+    def __init__(self) -> None:
+        self.sql_count = 0
+        self.sql_seconds = 0.0
+        self.template_seconds = 0.0
+
+
+_current: ContextVar[RequestTimings | None] = ContextVar("eagle_pm_request_timings", default=None)
+
+
+class _Histogram:
+    __slots__ = ("buckets", "counts", "total", "count")
+
+    def __init__(self, buckets: Tuple[float, ...]) -> None:
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.total = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.total += value
+        self.count += 1
+
+
+class _RouteStats:
+    __slots__ = ("latency", "sql_count", "sql_seconds", "template_seconds", "statuses")
+
+    def __init__(self) -> None:
+        self.latency = _Histogram(LATENCY_BUCKETS)
+        self.sql_count = _Histogram(SQL_COUNT_BUCKETS)
+        self.sql_seconds = 0.0
+        self.template_seconds = 0.0
+        self.statuses: Dict[int, int] = {}
+
+
+class MetricsRegistry:
+    """Aggregates request timings per (method, route template)."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._routes: Dict[Tuple[str, str], _RouteStats] = {}
+
+    def observe(self, method: str, route: str, status: int, seconds: float, timings: RequestTimings) -> None:
+        with self._lock:
+            stats = self._routes.get((method, route))
+            if stats is None:
+                stats = self._routes[(method, route)] = _RouteStats()
+            stats.latency.observe(seconds)
+            stats.sql_count.observe(timings.sql_count)
+            stats.sql_seconds += timings.sql_seconds
+            stats.template_seconds += timings.template_seconds
+            stats.statuses[status] = stats.statuses.get(status, 0) + 1
+
+    def reset(self) -> None:
+        with self._lock:
+            self._routes.clear()
+
+    def render(self) -> str:
+        """Prometheus text exposition of everything observed so far."""
+        with self._lock:
+            items = sorted(self._routes.items())
+            lines: List[str] = []
+            _histogram_lines(
+                lines, "eagle_pm_request_duration_seconds", "Request wall time.", items, lambda s: s.latency
+            )
+            _histogram_lines(
+                lines, "eagle_pm_request_sql_statements", "SQL statements per request.", items, lambda s: s.sql_count
+            )
+            _counter_lines(
+                lines, "eagle_pm_request_sql_seconds_total", "Time spent executing SQL.", items, lambda s: s.sql_seconds
+            )
+            _counter_lines(
+                lines,
+                "eagle_pm_request_template_seconds_total",
+                "Time spent rendering Jinja templates.",
+                items,
+                lambda s: s.template_seconds,
+            )
+            lines.append("# HELP eagle_pm_requests_total Requests by response status.")
+            lines.append("# TYPE eagle_pm_requests_total counter")
+            for (method, route), stats in items:
+                for status, count in sorted(stats.statuses.items()):
+                    lines.append(f'eagle_pm_requests_total{{{_labels(method, route)},status="{status}"}} {count}')
+        _cache_lines(lines)
+        return "\n".join(lines) + "\n"
+
+
+def _cache_lines(lines: List[str]) -> None:
+    """In-memory caches: index-table registry and the data-version keyed caches."""
+    index_stats = lookups.registry.stats()
+    lines.append("# HELP eagle_pm_index_lookups_total Index-table lookups served from memory (hit) or the database.")
+    lines.append("# TYPE eagle_pm_index_lookups_total counter")
+    lines.append(f'eagle_pm_index_lookups_total{{outcome="hit"}} {index_stats["hits"]}')
+    lines.append(f'eagle_pm_index_lookups_total{{outcome="db_fallback"}} {index_stats["db_fallbacks"]}')
+    lines.append("# HELP eagle_pm_index_tables_cached Index tables currently held in memory.")
+    lines.append("# TYPE eagle_pm_index_tables_cached gauge")
+    lines.append(f"eagle_pm_index_tables_cached {index_stats['tables_cached']}")
+    lines.append("# HELP eagle_pm_cache_requests_total Reads of data-version keyed caches, reused (hit) or rebuilt.")
+    lines.append("# TYPE eagle_pm_cache_requests_total counter")
+    for name, cache in sorted(lookups.versioned_caches.items()):
+        cache_stats = cache.stats()
+        lines.append(f'eagle_pm_cache_requests_total{{cache="{name}",outcome="hit"}} {cache_stats["hits"]}')
+        lines.append(f'eagle_pm_cache_requests_total{{cache="{name}",outcome="build"}} {cache_stats["builds"]}')
+
+
+def _labels(method: str, route: str) -> str:
+    route = route.replace("\\", "\\\\").replace('"', '\\"')
+    return f'method="{method}",route="{route}"'
+
+
+def _histogram_lines(lines: List[str], name: str, help_text: str, items, pick) -> None:
+    lines.append(f"# HELP {name} {help_text}")
+    lines.append(f"# TYPE {name} histogram")
+    for (method, route), stats in items:
+        hist = pick(stats)
+        labels = _labels(method, route)
+        cumulative = 0
+        for bound, count in zip(hist.buckets, hist.counts):
+            cumulative += count
+            lines.append(f'{name}_bucket{{{labels},le="{bound:g}"}} {cumulative}')
+        lines.append(f'{name}_bucket{{{labels},le="+Inf"}} {hist.count}')
+        lines.append(f"{name}_sum{{{labels}}} {hist.total:.6f}")
+        lines.append(f"{name}_count{{{labels}}} {hist.count}")
+
+
+def _counter_lines(lines: List[str], name: str, help_text: str, items, pick) -> None:
+    lines.append(f"# HELP {name} {help_text}")
+    lines.append(f"# TYPE {name} counter")
+    for (method, route), stats in items:
+        lines.append(f"{name}{{{_labels(method, route)}}} {pick(stats):.6f}")
+
+
+registry = MetricsRegistry()
+
+
+@event.listens_for(engine, "before_cursor_execute")
+@event.listens_for(async_engine.sync_engine, "before_cursor_execute")
+def _before_cursor_execute(conn, _cursor, _statement, _parameters, _context, _executemany) -> None:
+    if _current.get() is not None:
+        conn.info.setdefault(_QUERY_START, []).append(time.perf_counter())
+
+
+@event.listens_for(engine, "after_cursor_execute")
+@event.listens_for(async_engine.sync_engine, "after_cursor_execute")
+def _after_cursor_execute(conn, _cursor, _statement, _parameters, _context, _executemany) -> None:
+    timings = _current.get()
+    starts = conn.info.get(_QUERY_START)
+    if timings is None or not starts:
+        return
+    timings.sql_count += 1
+    timings.sql_seconds += time.perf_counter() - starts.pop()
+
+
+class TimedTemplate(Template):
+    """Template class that adds its render time to the current request's timings.
+
+    Only top-level renders go through ``render``; includes and macros are part
+    of the parent's time, so nothing is counted twice.
+    """
+
+    def render(self, *args, **kwargs) -> str:
+        timings = _current.get()
+        if timings is None:
+            return super().render(*args, **kwargs)
+        start = time.perf_counter()
+        try:
+            return super().render(*args, **kwargs)
+        finally:
+            timings.template_seconds += time.perf_counter() - start
+
+
+def _route_label(scope) -> str:
+    route = scope.get("route")
+    if route is not None:
+        return route.path
+    if scope["path"].startswith("/static/"):
+        return "/static"
+    # Unmatched paths (404s) share one label so scanners cannot blow up the series count.
+    return "unmatched"
+
+
+def _server_timing(total: float, timings: RequestTimings) -> bytes:
+    return (
+        f'app;dur={total * 1000:.1f}, sql;desc="{timings.sql_count} statements";dur={timings.sql_seconds * 1000:.1f}, '
+        f"tpl;dur={timings.template_seconds * 1000:.1f}"
+    ).encode("latin-1")
+
+
+class MetricsMiddleware:
+    """ASGI middleware: times each HTTP request and adds a Server-Timing header.
+
+    The header is written when the response starts, i.e. after the route and
+    template have run; SQL run while a streaming body is sent still reaches
+    /metrics, which is recorded when the response is complete.
+    """
+
+    def __init__(self, app) -> None:
+        self.app = app
+
+    async def __call__(self, scope, receive, send) -> None:
+        if scope["type"] != "http" or not METRICS_ENABLED:
+            await self.app(scope, receive, send)
+            return
+        timings = RequestTimings()
+        token = _current.set(timings)
+        start = time.perf_counter()
+        status = 500
+
+        async def send_with_timing(message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                headers = list(message.get("headers", []))
+                headers.append((b"server-timing", _server_timing(time.perf_counter() - start, timings)))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            _current.reset(token)
+            registry.observe(scope["method"], _route_label(scope), status, time.perf_counter() - start, timings)
+
+
+__all__ = [
+    "METRICS_ENABLED",
+    "MetricsMiddleware",
+    "PROMETHEUS_MEDIA_TYPE",
+    "RequestTimings",
+    "TimedTemplate",
+    "registry",
+]
@@ -0,0 +1,114 @@
+from __future__ import annotations
+
+import logging
+from typing import Callable, List, NamedTuple
+
+from sqlalchemy import select
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.orm import Session
+
+logger = logging.getLogger(__name__)
+
+# Schema versions live in SQLite's ``PRAGMA user_version`` (0 = file created before
+# migrations existed). A new file is built from the current models and stamped with
+# the latest version; an older file gets the missing migrations, in order, in one
+# transaction. When the version already matches, startup does no DDL, reflection or seeding.
+#
+# Migrations run on files that predate them, after the baseline has created any
+# table that was missing from the current models: keep them idempotent (IF [NOT] EXISTS).
+
+
+class Migration(NamedTuple):
+    version: int
+    name: str
+    apply: Callable[[Connection], None]
+
+
+def _populate(conn: Connection) -> None:
+    """Seed the index tables and derived data a fresh or legacy file may lack."""
+    from . import crud, models, search
+
+    search.ensure_search_index(conn)
+    # A savepoint inside the migration transaction: closing the session must not end it.
+    with Session(bind=conn, join_transaction_mode="create_savepoint") as session:
+        crud.seed_index_tables(session)
+        session.flush()
+        if session.execute(select(models.DashboardCount.scope).limit(1)).first() is None:
+            crud.rebuild_dashboard_counts(session)
+        session.commit()
+
+
+def _baseline(conn: Connection) -> None:
+    from . import models  # noqa: F401 - create_all only sees tables whose models are imported
+    from .db import Base
+
+    Base.metadata.create_all(bind=conn)
+    _populate(conn)
+
+
+def _activity_created_index(conn: Connection) -> None:
+    # Keyset pagination of the activities list (newest first).
+    conn.exec_driver_sql("CREATE INDEX IF NOT EXISTS idx_activity_created ON activity (created_at, id)")
+
+
+def _activity_release_created_index(conn: Connection) -> None:
+    # Release scope pages: open activities of one release, newest first. Covers the
+    # single-column target_release_id index, which is dropped.
+    conn.exec_driver_sql(
+        "CREATE INDEX IF NOT EXISTS idx_activity_release_created ON activity (target_release_id, created_at, id)"
+    )
+    conn.exec_driver_sql("DROP INDEX IF EXISTS idx_activity_target_release")
+
+
+MIGRATIONS: List[Migration] = [
+    Migration(1, "baseline: tables, search index, index-table seed, dashboard counters", _baseline),
+    Migration(2, "activity (created_at, id) index", _activity_created_index),
+    Migration(3, "activity (target_release_id, created_at, id) index", _activity_release_created_index),
+]
+LATEST_VERSION = MIGRATIONS[-1].version
+
+
+def schema_version(conn: Connection) -> int:
+    return conn.exec_driver_sql("PRAGMA user_version").scalar()
+
+
+def _has_tables(conn: Connection) -> bool:
+    return conn.exec_driver_sql("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'activity'").first() is not None
+
+
+def migrate(engine: Engine) -> List[str]:
+    """Bring the database to LATEST_VERSION; returns the names of the migrations applied."""
+    # AUTOCOMMIT leaves transaction control to the explicit BEGIN IMMEDIATE/COMMIT below.
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+        version = schema_version(conn)
+        if version == LATEST_VERSION:
+            return []
+        if version > LATEST_VERSION:
+            raise RuntimeError(
+                f"Banco na versao de schema {version}, mais nova que a suportada ({LATEST_VERSION}); atualize o Eagle PM."
+            )
+        # BEGIN IMMEDIATE takes the write lock up front: a second process starting at the
+        # same time waits here and then finds the version already current.
+        conn.exec_driver_sql("BEGIN IMMEDIATE")
+        try:
+            version = schema_version(conn)
+            applied = []
+            if version == 0 and not _has_tables(conn):
+                _baseline(conn)
+                applied.append(MIGRATIONS[0].name)
+            else:
+                for migration in MIGRATIONS:
+                    if migration.version > version:
+                        logger.info("Applying schema migration %s: %s", migration.version, migration.name)
+                        migration.apply(conn)
+                        applied.append(migration.name)
+            if version < LATEST_VERSION:
+                conn.exec_driver_sql(f"PRAGMA user_version = {LATEST_VERSION}")
+            conn.exec_driver_sql("COMMIT")
+        except BaseException:
+            conn.exec_driver_sql("ROLLBACK")
+            raise
+    return applied
+
+
+__all__ = ["LATEST_VERSION", "MIGRATIONS", "Migration", "migrate", "schema_version"]
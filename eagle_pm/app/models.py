@@ -9,6 +9,7 @@ from sqlalchemy import (
     Index,
     Integer,
     String,
+    Text,
     UniqueConstraint,
 )
 from sqlalchemy.orm import relationship
@@ -192,7 +193,8 @@ class Activity(Base):
         Index("idx_activity_subtype", "subtype_code"),
         Index("idx_activity_assigned", "assigned_member_id"),
         Index("idx_activity_project", "project_id"),
-        Index("idx_activity_target_release", "target_release_id"),
+        Index("idx_activity_release_created", "target_release_id", "created_at", "id"),
+        Index("idx_activity_created", "created_at", "id"),
     )
 
 
@@ -209,3 +211,54 @@ class ActivityLink(Base):
     activity = relationship("Activity", back_populates="links")
 
     __table_args__ = (Index("idx_activity_link_activity", "activity_id"),)
+
+
+class DashboardCount(Base):
+    """Materialised dashboard counters, maintained incrementally by the crud write functions."""
+
+    __tablename__ = "dashboard_count"
+
+    scope = Column(String(32), primary_key=True)
+    ref = Column(String(32), primary_key=True)
+    count = Column(Integer, nullable=False, default=0)
+
+
+class ChangeLog(Base):
+    """Append-only change history, written by audit.py from ORM flush events.
+
+    ``changes`` is a JSON object of the touched columns only: ``{"field": [old, new]}``
+    (old is null for inserts, new is null for deletes).
+    """
+
+    __tablename__ = "change_log"
+
+    id = Column(Integer, primary_key=True)
+    entity = Column(String(32), nullable=False)
+    entity_id = Column(Integer, nullable=False)
+    action = Column(String(8), nullable=False)
+    changes = Column(Text, nullable=False)
+    changed_at = Column(DateTime, default=utcnow, nullable=False)
+    changed_by = Column(String(64), nullable=True)
+
+    __table_args__ = (
+        Index("idx_change_log_entity", "entity", "entity_id", "id"),
+        Index("idx_change_log_changed_at", "changed_at", "id"),
+    )
+
+
+class DailySnapshot(Base):
+    """Per-day activity counts by status, one row per (day, scope, ref, status).
+
+    scope is "total" (ref ""), "member", "project" or "release" (ref = id, "" = none).
+    Written once per day by snapshots.take_daily_snapshot.
+    """
+
+    __tablename__ = "daily_snapshot"
+
+    day = Column(Date, primary_key=True)
+    scope = Column(String(16), primary_key=True)
+    ref = Column(String(32), primary_key=True)
+    status_code = Column(String(3), primary_key=True)
+    count = Column(Integer, nullable=False)
+
+    __table_args__ = (Index("idx_daily_snapshot_scope_ref", "scope", "ref", "day"),)
@@ -1,42 +1,26 @@
 from __future__ import annotations
 
 from datetime import date, datetime
+import hashlib
+import logging
 import os
-import subprocess
+import sqlite3
 import threading
-from pathlib import Path
-from fastapi import APIRouter, Depends, Form, HTTPException, Request, status
-from fastapi.responses import RedirectResponse, Response
-from fastapi.templating import Jinja2Templates
-from sqlalchemy import select
+from urllib.parse import urlencode
+from fastapi import APIRouter, Depends, File, Form, HTTPException, Request, UploadFile, status
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import FileResponse, RedirectResponse, Response, StreamingResponse
+from pydantic import BaseModel
 from sqlalchemy.orm import Session
 
-from . import crud, models, rules, export as export_utils
-from .db import get_session
+from . import audit, backup, crud, db, gitsync, importer, metrics, models, rules, search, snapshots, export as export_utils
+from .db import AsyncSession, get_async_session, get_session
+from .templating import templates
 
-TEMPLATES_DIR = Path(__file__).parent / "templates"
-templates = Jinja2Templates(directory=str(TEMPLATES_DIR))
+logger = logging.getLogger(__name__)
 router = APIRouter()
 
 
-def fmt_date(value):
-    """Format date/datetime as DD/MM/YYYY or '-' when empty."""
-    if value in (None, "", "null"):
-        return "-"
-    try:
-        if isinstance(value, datetime):
-            return value.strftime("%d/%m/%Y")
-        if isinstance(value, date):
-            return value.strftime("%d/%m/%Y")
-        # Attempt ISO parsing
-        return datetime.fromisoformat(str(value)).strftime("%d/%m/%Y")
-    except Exception:
-        return str(value)
-
-
-templates.env.filters["fmt_date"] = fmt_date
-
-
 def _parse_date(value: str | None, field_name: str) -> date | None:
     if value is None or value == "":
         return None
@@ -46,6 +30,101 @@ def _parse_date(value: str | None, field_name: str) -> date | None:
         raise ValueError(f"Data invalida em {field_name}") from exc
 
 
+def _is_partial(request: Request) -> bool:
+    return request.headers.get("HX-Request") == "true"
+
+
+def _etag(request: Request) -> str:
+    """Weak ETag of a read-only page: data version, day, URL and full/partial variant."""
+    key = "|".join(
+        (db.data_version(), date.today().isoformat(), request.url.path, request.url.query, request.headers.get("HX-Request", ""))
+    )
+    return f'W/"{hashlib.blake2b(key.encode(), digest_size=12).hexdigest()}"'
+
+
+async def _render(session: AsyncSession, build, request: Request, *args, headers: dict | None = None):
+    """Load the page data through ``session``, then render its template in the threadpool.
+
+    ``build`` runs the queries (on the event loop, via ``run_sync``) and returns the
+    template name and context; Jinja rendering is CPU-bound and would stall every
+    other request on the loop, so it runs in a worker thread.
+    """
+    name, context = await session.run_sync(build, request, *args)
+    return await run_in_threadpool(templates.TemplateResponse, name, context, headers=headers)
+
+
+async def _conditional_page(request: Request, session: AsyncSession, build, *args):
+    """Build the page through ``session`` unless the client's copy is current (304).
+
+    The version is read before the page is built, so a write that lands while
+    rendering makes the next refresh re-render rather than serve stale data.
+    """
+    etag = _etag(request)
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if etag in (tag.strip() for tag in request.headers.get("If-None-Match", "").split(",")):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    return await _render(session, build, request, *args, headers=headers)
+
+
+def _page_context(request: Request, cursor: str | None, next_cursor: str | None) -> dict:
+    """Template variables for keyset pagination ("Load more" row)."""
+    more_url = None
+    if next_cursor:
+        url = request.url.include_query_params(cursor=next_cursor)
+        more_url = f"{url.path}?{url.query}"
+    # Not "next_url": that name is the post-save redirect target of the activity forms.
+    return {"next_cursor": next_cursor, "more_url": more_url, "is_continuation": bool(cursor)}
+
+
+def _page_or_400(page_fn, *args, **kwargs):
+    try:
+        return page_fn(*args, **kwargs)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
+
+
+def _export_response(request: Request, prefix: str, headers: list[str], rows) -> StreamingResponse:
+    """Stream rows as CSV, or as XLSX when ``?format=xlsx`` is given."""
+    stamp = datetime.utcnow().strftime("%Y%m%d_%H%M%S")
+    if request.query_params.get("format") == "xlsx":
+        body = export_utils.iter_xlsx([(prefix, headers, rows)])
+        filename = f"{prefix}_{stamp}.xlsx"
+        media_type = export_utils.XLSX_MEDIA_TYPE
+    else:
+        body = export_utils.iter_csv(headers, rows)
+        filename = f"{prefix}_{stamp}.csv"
+        media_type = "text/csv"
+    return StreamingResponse(
+        body,
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
+
+
+@router.get("/export/workbook")
+def export_workbook():
+    """Single XLSX file with one sheet per entity (no filters)."""
+    sheets = [export_utils.export_sheet(kind) for kind in export_utils.EXPORT_KINDS]
+    filename = f"eagle_pm_{datetime.utcnow().strftime('%Y%m%d_%H%M%S')}.xlsx"
+    return StreamingResponse(
+        export_utils.iter_xlsx(sheets),
+        media_type=export_utils.XLSX_MEDIA_TYPE,
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
+
+
+@router.get("/export/daily-snapshot")
+def export_daily_snapshot(request: Request):
+    """Daily Snapshot time series (``?since=YYYY-MM-DD``, ``?scope=release``)."""
+    try:
+        since = _parse_date(request.query_params.get("since"), "since")
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
+    scope = request.query_params.get("scope") or None
+    rows = snapshots.iter_snapshot_rows(since, scope)
+    return _export_response(request, "daily_snapshot", snapshots.SNAPSHOT_HEADERS, rows)
+
+
 @router.get("/")
 def root():
     return RedirectResponse(url="/dashboards/daily-meeting", status_code=302)
@@ -56,67 +135,190 @@ def health():
     return {"status": "ok"}
 
 
-def _git_root_from_env_or_tree() -> Path | None:
-    env_root = os.getenv("EAGLE_GIT_ROOT")
-    if env_root:
-        p = Path(env_root)
-        if (p / ".git").exists():
-            return p
-    current = Path(__file__).resolve()
-    for parent in [current] + list(current.parents):
-        if (parent / ".git").exists():
-            return parent
-    return None
-
-
-def _run_git_commit_push() -> str:
-    """Run git add/commit/push with timestamp message; return status text."""
-    git_root = _git_root_from_env_or_tree()
-    if not git_root:
-        return "No git repository found; skipping commit/push."
-    now_str = datetime.utcnow().strftime("%Y-%m-%d %H:%M:%S UTC")
+@router.get("/metrics")
+def metrics_endpoint():
+    return Response(content=metrics.registry.render(), media_type=metrics.PROMETHEUS_MEDIA_TYPE)
+
+
+# Read-only pages (dashboards, lists, search) are ``async def`` on the aiosqlite engine,
+# so a burst of them does not queue on the threadpool for the database. Each page
+# loader ``_<name>(session, request)`` is a sync function run via ``AsyncSession.run_sync``
+# (same crud helpers and load profiles) returning ``(template, context)``; only the
+# render goes to the threadpool. The load profiles must cover what the templates
+# read: a lazy load during the render would run outside the session's greenlet.
+@router.get("/search")
+async def search_page(request: Request, session: AsyncSession = Depends(get_async_session)):
+    return await _render(session, _search_page, request)
+
+
+def _search_page(session: Session, request: Request):
+    q = (request.query_params.get("q") or "").strip()
+    results = search.search(session, q) if q else []
+    return (
+        "search.html",
+        {"request": request, "title": "Search", "q": q, "results": results},
+    )
+
+
+@router.get("/import")
+def import_page(request: Request):
+    return templates.TemplateResponse(
+        "import.html",
+        {"request": request, "title": "Import", "kinds": importer.KINDS, "kind": "", "reports": None},
+    )
+
+
+@router.post("/import")
+def import_upload(
+    request: Request,
+    session: Session = Depends(get_session),
+    kind: str = Form(""),
+    file: UploadFile = File(...),
+):
+    context = {"request": request, "title": "Import", "kinds": importer.KINDS, "kind": kind, "reports": None}
+    try:
+        reports = importer.import_file(session, file.file, file.filename or "", kind or None)
+    except ValueError as exc:
+        context["error"] = str(exc)
+        return templates.TemplateResponse("import.html", context, status_code=status.HTTP_400_BAD_REQUEST)
+    context["reports"] = reports
+    return templates.TemplateResponse("import.html", context)
+
+
+def _backups_page(request: Request, error: str | None = None, status_code: int = 200):
+    return templates.TemplateResponse(
+        "backups.html",
+        {
+            "request": request,
+            "title": "Backups",
+            "backups": backup.list_backups(),
+            "backup_dir": backup.BACKUP_DIR,
+            "keep": backup.BACKUP_KEEP,
+            "message": request.query_params.get("msg"),
+            "error": error or request.query_params.get("error"),
+        },
+        status_code=status_code,
+    )
+
+
+@router.get("/backups")
+def backups_page(request: Request):
+    return _backups_page(request)
+
+
+@router.post("/backups")
+def create_backup(request: Request, compress: bool = Form(False)):
+    try:
+        path = backup.create_backup(compress=compress)
+    except (OSError, sqlite3.Error, ValueError) as exc:
+        return _backups_page(request, error=str(exc), status_code=status.HTTP_400_BAD_REQUEST)
+    return RedirectResponse(url=f"/backups?msg=Backup+{path.name}", status_code=status.HTTP_303_SEE_OTHER)
+
+
+@router.get("/backups/{name}")
+def download_backup(name: str):
+    try:
+        path = backup.backup_path(name)
+    except ValueError as exc:
+        raise HTTPException(status_code=404, detail=str(exc)) from exc
+    return FileResponse(path, filename=path.name, media_type="application/octet-stream")
+
+
+@router.post("/backups/restore")
+def restore_backup(request: Request, name: str = Form(...)):
     try:
-        status_result = subprocess.run(
-            ["git", "-C", str(git_root), "status", "--porcelain"],
-            capture_output=True,
-            text=True,
-            check=False,
+        safety = backup.restore_backup(name)
+    except ValueError as exc:
+        return _backups_page(request, error=str(exc), status_code=status.HTTP_400_BAD_REQUEST)
+    except (OSError, sqlite3.Error) as exc:
+        # e.g. the database file locked by another process on Windows.
+        return RedirectResponse(
+            url=f"/backups?{urlencode({'error': f'Falha ao restaurar {name}: {exc}'})}", status_code=status.HTTP_303_SEE_OTHER
         )
-        if not status_result.stdout.strip():
-            return "No changes to commit."
-        subprocess.run(["git", "-C", str(git_root), "add", "."], check=True)
-        subprocess.run(["git", "-C", str(git_root), "commit", "-m", now_str], check=True)
-        subprocess.run(["git", "-C", str(git_root), "push"], check=True)
-        return f"Committed and pushed at {now_str}."
-    except subprocess.CalledProcessError as exc:
-        return f"Git operation failed: {exc}"
+    return RedirectResponse(
+        url=f"/backups?msg=Restored+{name}+(previous+saved+as+{safety.name})", status_code=status.HTTP_303_SEE_OTHER
+    )
 
 
 def _schedule_shutdown():
+    """Exit once the final git sync is done (or after SHUTDOWN_MAX_WAIT_SECONDS), off the request path."""
+
     def _exit():
+        gitsync.git_sync.wait(gitsync.SHUTDOWN_MAX_WAIT_SECONDS)
+        # Grace period so the shutdown page can fetch the final status.
+        threading.Event().wait(2.0)
         os._exit(0)
-    threading.Timer(1.0, _exit).start()
+
+    threading.Thread(target=_exit, name="eagle-pm-shutdown", daemon=True).start()
+
+
+@router.get("/api/changes")
+def api_changes(
+    since: datetime,
+    entity: str | None = None,
+    limit: int = 500,
+    session: Session = Depends(get_session),
+):
+    """Change-log entries at or after ``since`` (ISO timestamp, UTC), oldest first."""
+    return audit.changes_since(session, since, entity=entity, limit=min(limit, 5000))
+
+
+@router.get("/api/{entity}/{entity_id}/history")
+def api_history(entity: str, entity_id: int, limit: int = 100, session: Session = Depends(get_session)):
+    return audit.entity_history(session, entity, entity_id, limit=min(limit, 1000))
+
+
+@router.get("/git-sync/status")
+def git_sync_status():
+    return gitsync.git_sync.status()
+
+
+@router.post("/git-sync")
+def git_sync_start():
+    started = gitsync.git_sync.start(reason="manual")
+    return {"started": started, **gitsync.git_sync.status()}
+
+
+def _shutdown_backup() -> None:
+    try:
+        backup.create_backup(label="shutdown")
+    except (OSError, sqlite3.Error):
+        logger.exception("Shutdown backup failed")
 
 
 @router.post("/shutdown")
 def shutdown(request: Request):
-    git_status = _run_git_commit_push()
+    # Backup and final sync run on the sync thread, so the page is returned at once; the
+    # final sync is queued behind a periodic one that is already running.
+    gitsync.git_sync.start(reason="shutdown", queue=True, prepare=_shutdown_backup)
     _schedule_shutdown()
-    html = f"""
+    html = """
     <html>
       <head>
         <meta charset="utf-8" />
         <script>
-          setTimeout(function() {{
-            try {{
-              window.close();
-            }} catch(e) {{}}
-          }}, 300);
+          function poll() {
+            fetch("/git-sync/status")
+              .then(function (resp) { return resp.json(); })
+              .then(function (st) {
+                document.getElementById("git-status").textContent = st.message;
+                if (st.state === "running") {
+                  setTimeout(poll, 1000);
+                } else {
+                  document.getElementById("closing").textContent = "Done. You can close this tab.";
+                  try { window.close(); } catch (e) {}
+                }
+              })
+              .catch(function () {
+                document.getElementById("closing").textContent = "Server stopped. You can close this tab.";
+              });
+          }
+          window.addEventListener("load", poll);
         </script>
       </head>
       <body>
-        <p>Shutting down... {git_status}</p>
-        <p>If this tab does not close automatically, you can close it manually.</p>
+        <p>Shutting down... <span id="git-status">Syncing...</span></p>
+        <p id="closing">Waiting for git sync to finish.</p>
       </body>
     </html>
     """
@@ -124,23 +326,29 @@ def shutdown(request: Request):
 
 
 @router.get("/dashboards/daily-meeting")
-def daily_meeting(request: Request, session: Session = Depends(get_session)):
-    crud.update_release_statuses(session)
+async def daily_meeting(request: Request, session: AsyncSession = Depends(get_async_session)):
+    return await _conditional_page(request, session, _daily_meeting)
+
+
+def _daily_meeting(session: Session, request: Request):
     today = date.today()
-    active_members = session.execute(
-        select(models.Member).order_by(models.Member.name)
-    ).scalars().all()
-    open_activities = session.execute(
-        select(models.Activity).where(models.Activity.status_code != rules.STATUS_ACTIVITY_CLOSED)
-    ).scalars().all()
+    active_members = crud.list_members(session, load="member")
+    open_activities = crud.list_open_activities(session, load="activity_card")
     role_map = {m.id: m for m in active_members}
-    return templates.TemplateResponse(
+    activities_by_member = crud.group_activities_by_member(open_activities)
+    open_status_options = [
+        (code, name) for code, name in crud.get_index_options(session, models.IndexActivityStatus) if not rules.activity_is_closed(code)
+    ]
+    return (
         "daily_meeting.html",
         {
             "request": request,
             "title": "Daily Meeting",
             "members": active_members,
-            "activities": open_activities,
+            "activities_by_member": activities_by_member,
+            "open_by_member": crud.dashboard_counts(session, crud.COUNT_OPEN_BY_MEMBER, id_keys=True),
+            "status_counts": crud.dashboard_counts(session, crud.COUNT_ACTIVITY_STATUS),
+            "open_status_options": open_status_options,
             "role_map": role_map,
             "today": today,
         },
@@ -148,97 +356,126 @@ def daily_meeting(request: Request, session: Session = Depends(get_session)):
 
 
 @router.get("/dashboards/project-control")
-def project_control(request: Request, session: Session = Depends(get_session)):
-    crud.update_release_statuses(session)
-    projects = session.execute(
-        select(models.Project).where(models.Project.status_code != rules.STATUS_PROJECT_CLOSED)
-    ).scalars().all()
-    activities = session.execute(select(models.Activity).where(models.Activity.status_code != rules.STATUS_ACTIVITY_CLOSED)).scalars().all()
+async def project_control(request: Request, session: AsyncSession = Depends(get_async_session)):
+    return await _conditional_page(request, session, _project_control)
+
+
+def _project_control(session: Session, request: Request):
+    # lazy=1 sends project headers and counts only; each activity list is fetched when its panel opens.
+    lazy = request.query_params.get("lazy") == "1"
+    projects = crud.list_open_projects(session, load="project")
+    activities_by_project = {}
+    if not lazy:
+        activities_by_project = crud.group_activities_by_project(crud.list_open_activities(session, load="activity_card"))
     status_options = [(code, name) for code, name in crud.get_index_options(session, models.IndexProjectStatus) if code != rules.STATUS_PROJECT_CLOSED]
     projects_by_status: dict[str, list[models.Project]] = {code: [] for code, _ in status_options}
     for proj in projects:
         projects_by_status.setdefault(proj.status_code, []).append(proj)
     for proj_list in projects_by_status.values():
         proj_list.sort(key=lambda p: p.project_code)
-    return templates.TemplateResponse(
+    return (
         "project_control.html",
         {
             "request": request,
             "title": "Project Control",
             "status_options": status_options,
             "projects_by_status": projects_by_status,
-            "activities": activities,
+            "activities_by_project": activities_by_project,
+            "lazy": lazy,
+            "open_by_project": crud.dashboard_counts(session, crud.COUNT_OPEN_BY_PROJECT, id_keys=True),
+            "project_status_counts": crud.dashboard_counts(session, crud.COUNT_PROJECT_STATUS),
         },
     )
 
 
-@router.get("/dashboards/release-scope")
-def release_scope(request: Request, session: Session = Depends(get_session)):
-    crud.update_release_statuses(session)
-    current_release = session.execute(
-        select(models.Release)
-        .where(models.Release.status_code != rules.STATUS_RELEASE_INSTALLED)
-        .order_by(models.Release.start_date)
-    ).scalars().first()
-    activities = []
-    if current_release:
-        activities = session.execute(
-            select(models.Activity)
-            .where(models.Activity.target_release_id == current_release.id)
-            .where(models.Activity.status_code != rules.STATUS_ACTIVITY_CLOSED)
-            .order_by(models.Activity.created_at.desc())
-        ).scalars().all()
-    return templates.TemplateResponse(
-        "release_scope.html",
-        {
-            "request": request,
-            "title": "Release Scope",
-            "current_release": current_release,
-            "activities": activities,
-        },
+@router.get("/dashboards/project-control/projects/{project_id}/activities")
+async def project_control_activities(request: Request, project_id: int, session: AsyncSession = Depends(get_async_session)):
+    return await _conditional_page(request, session, _project_control_activities, project_id)
+
+
+def _project_control_activities(session: Session, request: Request, project_id: int):
+    activities = crud.list_open_activities(session, project_id=project_id, load="activity_card")
+    return (
+        "project_activities.html",
+        {"request": request, "project_activities": activities},
     )
 
 
 @router.get("/dashboards/release-scope")
-def release_scope(request: Request, session: Session = Depends(get_session)):
-    crud.update_release_statuses(session)
-    current_release = session.execute(
-        select(models.Release)
-        .where(models.Release.status_code != rules.STATUS_RELEASE_INSTALLED)
-        .order_by(models.Release.start_date)
-    ).scalars().first()
-    activities = []
-    if current_release:
-        activities = session.execute(
-            select(models.Activity)
-            .where(models.Activity.target_release_id == current_release.id)
-            .where(models.Activity.status_code != rules.STATUS_ACTIVITY_CLOSED)
-            .order_by(models.Activity.created_at.desc())
-        ).scalars().all()
-    return templates.TemplateResponse(
+async def release_scope(request: Request, session: AsyncSession = Depends(get_async_session)):
+    return await _conditional_page(request, session, _release_scope)
+
+
+def _release_scope(session: Session, request: Request):
+    # Every non-installed release gets a header with counts from one GROUP BY; only the
+    # focused release (?release_id=, default: the earliest) renders its activities and
+    # burn-down inline. The other panels fetch their activity pages when opened.
+    releases = crud.list_scope_releases(session, load="release")
+    focus = releases[0] if releases else None
+    focus_param = request.query_params.get("release_id")
+    if focus_param and focus_param.isdigit():
+        focus = next((rel for rel in releases if rel.id == int(focus_param)), focus)
+    activities, next_cursor, burndown = [], None, []
+    if focus:
+        activities, next_cursor = crud.page_release_scope_activities(session, focus.id, load="activity_scope")
+        burndown = snapshots.release_burndown(session, focus.id, since=focus.start_date)
+    more_url = f"/dashboards/release-scope/releases/{focus.id}/activities?cursor={next_cursor}" if next_cursor else None
+    return (
         "release_scope.html",
         {
             "request": request,
             "title": "Release Scope",
-            "current_release": current_release,
+            "releases": releases,
+            "scope_counts": crud.release_scope_counts(session),
+            "current_release": focus,
             "activities": activities,
+            "next_cursor": next_cursor,
+            "more_url": more_url,
+            "is_continuation": False,
+            "burndown": burndown,
+            "burndown_max": max((point["total"] for point in burndown), default=0),
         },
     )
 
 
+@router.get("/dashboards/release-scope/releases/{release_id}/activities")
+async def release_scope_activities(request: Request, release_id: int, session: AsyncSession = Depends(get_async_session)):
+    return await _conditional_page(request, session, _release_scope_activities, release_id)
+
+
+def _release_scope_activities(session: Session, request: Request, release_id: int):
+    cursor = request.query_params.get("cursor")
+    activities, next_cursor = _page_or_400(
+        crud.page_release_scope_activities, session, release_id, load="activity_scope", cursor=cursor
+    )
+    return (
+        "release_scope_activities.html",
+        {"request": request, "activities": activities, **_page_context(request, cursor, next_cursor)},
+    )
+
+
 @router.get("/members")
-def members(request: Request, session: Session = Depends(get_session)):
-    crud.update_release_statuses(session)
+async def members(request: Request, session: AsyncSession = Depends(get_async_session)):
+    return await _conditional_page(request, session, _members)
+
+
+def _members(session: Session, request: Request):
     q = request.query_params.get("q")
     role_filter = request.query_params.get("role")
     status_filter = request.query_params.get("status")
     message = request.query_params.get("msg")
+    cursor = request.query_params.get("cursor")
 
-    members_list = crud.list_members(session, name_like=q, role_code=role_filter, status_code=status_filter)
+    members_list, next_cursor = _page_or_400(
+        crud.page_members, session, name_like=q, role_code=role_filter, status_code=status_filter, load="member", cursor=cursor
+    )
+    page = _page_context(request, cursor, next_cursor)
+    if _is_partial(request):
+        return ("members_rows.html", {"request": request, "members": members_list, **page})
     role_options = crud.get_index_options(session, models.IndexRole)
     status_options = crud.get_index_options(session, models.IndexUserStatus)
 
-    return templates.TemplateResponse(
+    return (
         "members.html",
         {
             "request": request,
@@ -248,35 +485,19 @@ def members(request: Request, session: Session = Depends(get_session)):
             "status_options": status_options,
             "filters": {"q": q or "", "role": role_filter or "", "status": status_filter or ""},
             "message": message,
+            **page,
         },
     )
 
 
 @router.get("/members/export")
-def export_members(request: Request, session: Session = Depends(get_session)):
-    crud.update_release_statuses(session)
+def export_members(request: Request):
     q = request.query_params.get("q")
     role_filter = request.query_params.get("role")
     status_filter = request.query_params.get("status")
-    members_list = crud.list_members(session, name_like=q, role_code=role_filter, status_code=status_filter)
-    headers = ["name", "role", "status", "created_at", "updated_at"]
-    rows = [
-        [
-            m.name,
-            m.role.name if m.role else m.role_code,
-            m.status.name if m.status else m.status_code,
-            m.created_at,
-            m.updated_at,
-        ]
-        for m in members_list
-    ]
-    csv_data = export_utils.rows_to_csv(headers, rows)
-    filename = f"members_{datetime.utcnow().strftime('%Y%m%d_%H%M%S')}.csv"
-    return Response(
-        content=csv_data,
-        media_type="text/csv",
-        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
-    )
+    stmt = crud.list_members_stmt(name_like=q, role_code=role_filter, status_code=status_filter, load="member")
+    rows = export_utils.iter_query_rows(stmt, export_utils.member_row)
+    return _export_response(request, "members", export_utils.MEMBER_HEADERS, rows)
 
 
 @router.post("/members")
@@ -299,7 +520,7 @@ def create_member(
             vacation_end=_parse_date(vacation_end, "vacation_end"),
         )
     except ValueError as exc:
-        members_list = crud.list_members(session)
+        members_list, next_cursor = crud.page_members(session, load="member")
         role_options = crud.get_index_options(session, models.IndexRole)
         status_options = crud.get_index_options(session, models.IndexUserStatus)
         return templates.TemplateResponse(
@@ -308,6 +529,7 @@ def create_member(
                 "request": request,
                 "title": "Members",
                 "members": members_list,
+                **_page_context(request, None, next_cursor),
                 "role_options": role_options,
                 "status_options": status_options,
                 "filters": {"q": "", "role": "", "status": ""},
@@ -393,14 +615,23 @@ def delete_member(member_id: int, session: Session = Depends(get_session)):
 
 
 @router.get("/releases")
-def releases(request: Request, session: Session = Depends(get_session)):
-    crud.update_release_statuses(session)
+async def releases(request: Request, session: AsyncSession = Depends(get_async_session)):
+    return await _conditional_page(request, session, _releases)
+
+
+def _releases(session: Session, request: Request):
     code_filter = request.query_params.get("q")
     status_filter = request.query_params.get("status")
     msg = request.query_params.get("msg")
-    releases_list = crud.list_releases(session, code_like=code_filter, status_code=status_filter)
+    cursor = request.query_params.get("cursor")
+    releases_list, next_cursor = _page_or_400(
+        crud.page_releases, session, code_like=code_filter, status_code=status_filter, load="release", cursor=cursor
+    )
+    page = _page_context(request, cursor, next_cursor)
+    if _is_partial(request):
+        return ("releases_rows.html", {"request": request, "releases": releases_list, **page})
     status_options = crud.get_index_options(session, models.IndexReleaseStatus)
-    return templates.TemplateResponse(
+    return (
         "releases.html",
         {
             "request": request,
@@ -409,32 +640,18 @@ def releases(request: Request, session: Session = Depends(get_session)):
             "status_options": status_options,
             "filters": {"q": code_filter or "", "status": status_filter or ""},
             "message": msg,
+            **page,
         },
     )
 
 
 @router.get("/releases/export")
-def export_releases(request: Request, session: Session = Depends(get_session)):
-    crud.update_release_statuses(session)
+def export_releases(request: Request):
     code_filter = request.query_params.get("q")
     status_filter = request.query_params.get("status")
-    releases_list = crud.list_releases(session, code_like=code_filter, status_code=status_filter)
-    headers = ["release_code", "status", "delivery_date", "start_date", "installation_date", "created_at", "updated_at"]
-    rows = [
-        [
-            r.release_code,
-            r.status.name if r.status else r.status_code,
-            r.delivery_date,
-            r.start_date,
-            r.installation_date,
-            r.created_at,
-            r.updated_at,
-        ]
-        for r in releases_list
-    ]
-    csv_data = export_utils.rows_to_csv(headers, rows)
-    filename = f"releases_{datetime.utcnow().strftime('%Y%m%d_%H%M%S')}.csv"
-    return Response(content=csv_data, media_type="text/csv", headers={"Content-Disposition": f'attachment; filename=\"{filename}\"'})
+    stmt = crud.list_releases_stmt(code_like=code_filter, status_code=status_filter, load="release")
+    rows = export_utils.iter_query_rows(stmt, export_utils.release_row)
+    return _export_response(request, "releases", export_utils.RELEASE_HEADERS, rows)
 
 
 @router.post("/releases")
@@ -457,7 +674,7 @@ def create_release(
     except ValueError as exc:
         code_filter = ""
         status_filter = ""
-        releases_list = crud.list_releases(session)
+        releases_list, next_cursor = crud.page_releases(session, load="release")
         status_options = crud.get_index_options(session, models.IndexReleaseStatus)
         return templates.TemplateResponse(
             "releases.html",
@@ -465,6 +682,7 @@ def create_release(
                 "request": request,
                 "title": "Releases",
                 "releases": releases_list,
+                **_page_context(request, None, next_cursor),
                 "status_options": status_options,
                 "filters": {"q": code_filter, "status": status_filter},
                 "error": str(exc),
@@ -526,21 +744,31 @@ def update_release(
 
 
 @router.get("/projects")
-def projects(request: Request, session: Session = Depends(get_session)):
-    crud.update_release_statuses(session)
+async def projects(request: Request, session: AsyncSession = Depends(get_async_session)):
+    return await _conditional_page(request, session, _projects)
+
+
+def _projects(session: Session, request: Request):
     q = request.query_params.get("q")
     status_filter = request.query_params.get("status")
     target_release_filter = request.query_params.get("target_release_id")
     msg = request.query_params.get("msg")
-    projects_list = crud.list_projects(
+    cursor = request.query_params.get("cursor")
+    projects_list, next_cursor = _page_or_400(
+        crud.page_projects,
         session,
         code_or_title=q,
         status_code=status_filter,
         target_release_id=int(target_release_filter) if target_release_filter else None,
+        load="project",
+        cursor=cursor,
     )
+    page = _page_context(request, cursor, next_cursor)
+    if _is_partial(request):
+        return ("projects_rows.html", {"request": request, "projects": projects_list, **page})
     status_options = crud.get_index_options(session, models.IndexProjectStatus)
-    release_options = crud.release_dropdown_options(session)
-    return templates.TemplateResponse(
+    release_options = crud.form_options(session)["release_options"]
+    return (
         "projects.html",
         {
             "request": request,
@@ -550,40 +778,24 @@ def projects(request: Request, session: Session = Depends(get_session)):
             "release_options": release_options,
             "filters": {"q": q or "", "status": status_filter or "", "target_release_id": target_release_filter or ""},
             "message": msg,
+            **page,
         },
     )
 
 
 @router.get("/projects/export")
-def export_projects(request: Request, session: Session = Depends(get_session)):
-    crud.update_release_statuses(session)
+def export_projects(request: Request):
     q = request.query_params.get("q")
     status_filter = request.query_params.get("status")
     target_release_filter = request.query_params.get("target_release_id")
-    projects_list = crud.list_projects(
-        session,
+    stmt = crud.list_projects_stmt(
         code_or_title=q,
         status_code=status_filter,
         target_release_id=int(target_release_filter) if target_release_filter else None,
+        load="project",
     )
-    headers = ["project_code", "title", "pm_responsible", "eba_responsible", "status", "e2e_date", "target_release", "created_at", "updated_at"]
-    rows = [
-        [
-            p.project_code,
-            p.title,
-            p.pm_responsible,
-            p.eba_responsible,
-            p.status.name if p.status else p.status_code,
-            p.e2e_date if p.e2e_date else "",
-            p.target_release.release_code if p.target_release else "",
-            p.created_at,
-            p.updated_at,
-        ]
-        for p in projects_list
-    ]
-    csv_data = export_utils.rows_to_csv(headers, rows)
-    filename = f"projects_{datetime.utcnow().strftime('%Y%m%d_%H%M%S')}.csv"
-    return Response(content=csv_data, media_type="text/csv", headers={"Content-Disposition": f'attachment; filename=\"{filename}\"'})
+    rows = export_utils.iter_query_rows(stmt, export_utils.project_row)
+    return _export_response(request, "projects", export_utils.PROJECT_HEADERS, rows)
 
 
 @router.post("/projects")
@@ -611,14 +823,15 @@ def create_project(
         )
     except ValueError as exc:
         status_options = crud.get_index_options(session, models.IndexProjectStatus)
-        release_options = crud.release_dropdown_options(session)
-        projects_list = crud.list_projects(session)
+        release_options = crud.form_options(session)["release_options"]
+        projects_list, next_cursor = crud.page_projects(session, load="project")
         return templates.TemplateResponse(
             "projects.html",
             {
                 "request": request,
                 "title": "Projects",
                 "projects": projects_list,
+                **_page_context(request, None, next_cursor),
                 "status_options": status_options,
                 "release_options": release_options,
                 "filters": {"q": "", "status": "", "target_release_id": ""},
@@ -635,7 +848,7 @@ def edit_project(request: Request, project_id: int, session: Session = Depends(g
     if not proj:
         raise HTTPException(status_code=404, detail="Project not found")
     status_options = crud.get_index_options(session, models.IndexProjectStatus)
-    release_options = crud.release_dropdown_options(session)
+    release_options = crud.form_options(session)["release_options"]
     return templates.TemplateResponse(
         "project_edit.html",
         {
@@ -644,6 +857,7 @@ def edit_project(request: Request, project_id: int, session: Session = Depends(g
             "project": proj,
             "status_options": status_options,
             "release_options": release_options,
+            "history": audit.entity_history(session, "project", project_id),
         },
     )
 
@@ -674,7 +888,7 @@ def update_project(
     except ValueError as exc:
         proj = crud.get_project(session, project_id)
         status_options = crud.get_index_options(session, models.IndexProjectStatus)
-        release_options = crud.release_dropdown_options(session)
+        release_options = crud.form_options(session)["release_options"]
         return templates.TemplateResponse(
             "project_edit.html",
             {
@@ -683,6 +897,7 @@ def update_project(
                 "project": proj,
                 "status_options": status_options,
                 "release_options": release_options,
+                "history": audit.entity_history(session, "project", project_id),
                 "error": str(exc),
             },
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -691,39 +906,39 @@ def update_project(
 
 
 @router.get("/activities")
-def activities(request: Request, session: Session = Depends(get_session)):
-    crud.update_release_statuses(session)
+async def activities(request: Request, session: AsyncSession = Depends(get_async_session)):
+    return await _conditional_page(request, session, _activities)
+
+
+def _activities(session: Session, request: Request):
     msg = request.query_params.get("msg")
     next_url = request.query_params.get("next") or "/activities"
     q = request.query_params.get("q")
     status_filter = request.query_params.get("status")
     project_filter = request.query_params.get("project_id")
     member_filter = request.query_params.get("assigned_member_id")
-    activities_list = crud.list_activities(
+    cursor = request.query_params.get("cursor")
+    activities_list, next_cursor = _page_or_400(
+        crud.page_activities,
         session,
         status_code=status_filter,
         project_id=int(project_filter) if project_filter else None,
         assigned_member_id=int(member_filter) if member_filter else None,
         title_like=q,
+        load="activity_row",
+        cursor=cursor,
     )
-    type_options = crud.get_index_options(session, models.IndexActivityType)
-    subtype_options = crud.get_index_options(session, models.IndexActivitySubtype)
-    status_options = crud.get_index_options(session, models.IndexActivityStatus)
-    member_options = [(m.id, m.name) for m in crud.list_members(session)]
-    project_options = crud.project_dropdown_options(session)
-    release_options = crud.release_dropdown_options(session)
-    return templates.TemplateResponse(
+    page = _page_context(request, cursor, next_cursor)
+    if _is_partial(request):
+        return ("activities_rows.html", {"request": request, "activities": activities_list, **page})
+    form_options = crud.form_options(session)
+    return (
         "activities.html",
         {
             "request": request,
             "title": "Activities",
             "activities": activities_list,
-            "type_options": type_options,
-            "subtype_options": subtype_options,
-            "status_options": status_options,
-            "member_options": member_options,
-            "project_options": project_options,
-            "release_options": release_options,
+            **form_options,
             "message": msg,
             "next_url": next_url,
             "filters": {
@@ -732,46 +947,26 @@ def activities(request: Request, session: Session = Depends(get_session)):
                 "project_id": project_filter or "",
                 "assigned_member_id": member_filter or "",
             },
+            **page,
         },
     )
 
 
 @router.get("/activities/export")
-def export_activities(request: Request, session: Session = Depends(get_session)):
-    crud.update_release_statuses(session)
+def export_activities(request: Request):
     q = request.query_params.get("q")
     status_filter = request.query_params.get("status")
     project_filter = request.query_params.get("project_id")
     member_filter = request.query_params.get("assigned_member_id")
-    activities_list = crud.list_activities(
-        session,
+    stmt = crud.list_activities_stmt(
         status_code=status_filter,
         project_id=int(project_filter) if project_filter else None,
         assigned_member_id=int(member_filter) if member_filter else None,
         title_like=q,
+        load="activity_row",
     )
-    headers = ["title", "type", "subtype", "status", "project", "assigned_member", "target_release", "ticket_code", "start_date", "end_date", "created_at", "updated_at"]
-    rows = []
-    for a in activities_list:
-        rows.append(
-            [
-                a.title,
-                a.type.name if a.type else a.type_code,
-                a.subtype.name if a.subtype else a.subtype_code,
-                a.status.name if a.status else a.status_code,
-                a.project.project_code if a.project else "",
-                a.assigned_member.name if a.assigned_member else "",
-                a.target_release.release_code if a.target_release else "",
-                a.ticket_code or "",
-                a.start_date or "",
-                a.end_date or "",
-                a.created_at,
-                a.updated_at,
-            ]
-        )
-    csv_data = export_utils.rows_to_csv(headers, rows)
-    filename = f"activities_{datetime.utcnow().strftime('%Y%m%d_%H%M%S')}.csv"
-    return Response(content=csv_data, media_type="text/csv", headers={"Content-Disposition": f'attachment; filename=\"{filename}\"'})
+    rows = export_utils.iter_query_rows(stmt, export_utils.activity_row)
+    return _export_response(request, "activities", export_utils.ACTIVITY_HEADERS, rows)
 
 
 @router.post("/activities")
@@ -804,25 +999,16 @@ def create_activity(
             start_date=_parse_date(start_date, "start_date"),
         )
     except ValueError as exc:
-        type_options = crud.get_index_options(session, models.IndexActivityType)
-        subtype_options = crud.get_index_options(session, models.IndexActivitySubtype)
-        status_options = crud.get_index_options(session, models.IndexActivityStatus)
-        member_options = [(m.id, m.name) for m in crud.list_members(session)]
-        project_options = crud.project_dropdown_options(session)
-        release_options = crud.release_dropdown_options(session)
-        activities_list = crud.list_activities(session)
+        form_options = crud.form_options(session)
+        activities_list, next_cursor = crud.page_activities(session, load="activity_row")
         return templates.TemplateResponse(
             "activities.html",
             {
                 "request": request,
                 "title": "Activities",
                 "activities": activities_list,
-                "type_options": type_options,
-                "subtype_options": subtype_options,
-                "status_options": status_options,
-                "member_options": member_options,
-                "project_options": project_options,
-                "release_options": release_options,
+                **_page_context(request, None, next_cursor),
+                **form_options,
                 "error": str(exc),
                 "next_url": redirect_target,
             },
@@ -831,17 +1017,102 @@ def create_activity(
     return RedirectResponse(url=f"{redirect_target}?msg=created", status_code=status.HTTP_303_SEE_OTHER)
 
 
+def _bulk_choice(value: str | None):
+    """Form value of a bulk select: "" keeps the field, "none" clears it, otherwise an id."""
+    if not value:
+        return crud.UNSET
+    if value == "none":
+        return None
+    return int(value)
+
+
+@router.post("/activities/bulk")
+def bulk_update_activities(
+    request: Request,
+    session: Session = Depends(get_session),
+    activity_ids: list[int] = Form([]),
+    status_code: str = Form(None),
+    assigned_member_id: str = Form(None),
+    target_release_id: str = Form(None),
+):
+    try:
+        updated = crud.bulk_update_activities(
+            session,
+            activity_ids,
+            status_code=status_code or None,
+            assigned_member_id=_bulk_choice(assigned_member_id),
+            target_release_id=_bulk_choice(target_release_id),
+        )
+    except ValueError as exc:
+        activities_list, next_cursor = crud.page_activities(session, load="activity_row")
+        return templates.TemplateResponse(
+            "activities.html",
+            {
+                "request": request,
+                "title": "Activities",
+                "activities": activities_list,
+                **_page_context(request, None, next_cursor),
+                **crud.form_options(session),
+                "error": str(exc),
+                "next_url": "/activities",
+            },
+            status_code=status.HTTP_400_BAD_REQUEST,
+        )
+    return RedirectResponse(url=f"/activities?msg=updated+{updated}", status_code=status.HTTP_303_SEE_OTHER)
+
+
+class BulkActivityCreate(BaseModel):
+    type_code: str
+    subtype_code: str
+    title: str
+    status_code: str
+    ticket_code: str | None = None
+    assigned_member_id: int | None = None
+    project_id: int | None = None
+    target_release_id: int | None = None
+    start_date: date | None = None
+
+
+class BulkActivityUpdate(BaseModel):
+    """Omitted fields are left untouched; an explicit null clears member/release."""
+
+    ids: list[int]
+    status_code: str | None = None
+    assigned_member_id: int | None = None
+    target_release_id: int | None = None
+
+
+@router.post("/api/activities/bulk-create")
+def api_bulk_create_activities(payload: list[BulkActivityCreate], session: Session = Depends(get_session)):
+    try:
+        ids = crud.bulk_create_activities(session, [row.model_dump() for row in payload])
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
+    return {"created": len(ids), "ids": ids}
+
+
+@router.post("/api/activities/bulk-update")
+def api_bulk_update_activities(payload: BulkActivityUpdate, session: Session = Depends(get_session)):
+    fields = payload.model_fields_set
+    try:
+        updated = crud.bulk_update_activities(
+            session,
+            payload.ids,
+            status_code=payload.status_code,
+            assigned_member_id=payload.assigned_member_id if "assigned_member_id" in fields else crud.UNSET,
+            target_release_id=payload.target_release_id if "target_release_id" in fields else crud.UNSET,
+        )
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
+    return {"updated": updated}
+
+
 @router.get("/activities/{activity_id}/edit")
 def edit_activity(request: Request, activity_id: int, session: Session = Depends(get_session)):
     act = crud.get_activity(session, activity_id)
     if not act:
         raise HTTPException(status_code=404, detail="Activity not found")
-    type_options = crud.get_index_options(session, models.IndexActivityType)
-    subtype_options = crud.get_index_options(session, models.IndexActivitySubtype)
-    status_options = crud.get_index_options(session, models.IndexActivityStatus)
-    member_options = [(m.id, m.name) for m in crud.list_members(session)]
-    project_options = crud.project_dropdown_options(session)
-    release_options = crud.release_dropdown_options(session)
+    form_options = crud.form_options(session)
     next_url = request.query_params.get("next") or "/activities"
     return templates.TemplateResponse(
         "activity_edit.html",
@@ -849,13 +1120,9 @@ def edit_activity(request: Request, activity_id: int, session: Session = Depends
             "request": request,
             "title": "Edit Activity",
             "activity": act,
-            "type_options": type_options,
-            "subtype_options": subtype_options,
-            "status_options": status_options,
-            "member_options": member_options,
-            "project_options": project_options,
-            "release_options": release_options,
+            **form_options,
             "next_url": next_url,
+            "history": audit.entity_history(session, "activity", activity_id),
         },
     )
 
@@ -893,26 +1160,17 @@ def update_activity(
         )
     except ValueError as exc:
         act = crud.get_activity(session, activity_id)
-        type_options = crud.get_index_options(session, models.IndexActivityType)
-        subtype_options = crud.get_index_options(session, models.IndexActivitySubtype)
-        status_options = crud.get_index_options(session, models.IndexActivityStatus)
-        member_options = [(m.id, m.name) for m in crud.list_members(session)]
-        project_options = crud.project_dropdown_options(session)
-        release_options = crud.release_dropdown_options(session)
+        form_options = crud.form_options(session)
         return templates.TemplateResponse(
             "activity_edit.html",
             {
                 "request": request,
                 "title": "Edit Activity",
                 "activity": act,
-                "type_options": type_options,
-                "subtype_options": subtype_options,
-                "status_options": status_options,
-                "member_options": member_options,
-                "project_options": project_options,
-                "release_options": release_options,
+                **form_options,
                 "error": str(exc),
                 "next_url": redirect_target,
+                "history": audit.entity_history(session, "activity", activity_id),
             },
             status_code=status.HTTP_400_BAD_REQUEST,
         )
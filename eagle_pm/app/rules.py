@@ -44,6 +44,7 @@ STATUS_RELEASE_IN_PROGRESS = "002"
 
 STATUS_PROJECT_CLOSED = "007"
 
+STATUS_ACTIVITY_BLOCKED = "003"
 STATUS_ACTIVITY_CLOSED = "005"
 
 
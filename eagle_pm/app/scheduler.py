@@ -0,0 +1,83 @@
+from __future__ import annotations
+
+import logging
+import threading
+from datetime import date, datetime, time, timedelta
+from typing import Callable, List
+
+from . import backup, crud, snapshots
+from .db import SessionLocal
+
+logger = logging.getLogger(__name__)
+
+# Cap between wake-ups so a rollover missed during suspend or a clock change is caught quickly.
+MAX_SLEEP_SECONDS = 3600.0
+
+
+def refresh_release_statuses(today: date | None = None) -> int:
+    """Apply due release status transitions in their own transaction."""
+    with SessionLocal() as session:
+        changed = crud.update_release_statuses(session, today)
+        session.commit()
+    return changed
+
+
+def seconds_until_rollover(now: datetime) -> float:
+    tomorrow = datetime.combine(now.date() + timedelta(days=1), time.min)
+    return (tomorrow - now).total_seconds()
+
+
+class DailyScheduler:
+    """Background thread that runs registered jobs once per calendar day, at date rollover."""
+
+    def __init__(self) -> None:
+        self._jobs: List[Callable[[date], object]] = []
+        self._stop = threading.Event()
+        self._lock = threading.Lock()
+        self._thread: threading.Thread | None = None
+        self.last_run: date | None = None
+
+    def add_job(self, job: Callable[[date], object]) -> None:
+        self._jobs.append(job)
+
+    def run_due(self, today: date | None = None, force: bool = False) -> bool:
+        """Run every job if the date changed since the last run; return True when jobs ran."""
+        today = today or date.today()
+        with self._lock:
+            if not force and self.last_run == today:
+                return False
+            for job in self._jobs:
+                try:
+                    job(today)
+                except Exception:
+                    logger.exception("Scheduled job %s failed", getattr(job, "__name__", job))
+            self.last_run = today
+        return True
+
+    def start(self) -> None:
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._loop, name="eagle-pm-scheduler", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 5.0) -> None:
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def _loop(self) -> None:
+        while not self._stop.is_set():
+            self.run_due()
+            wait = min(seconds_until_rollover(datetime.now()) + 1.0, MAX_SLEEP_SECONDS)
+            self._stop.wait(wait)
+
+
+scheduler = DailyScheduler()
+scheduler.add_job(refresh_release_statuses)
+scheduler.add_job(snapshots.take_daily_snapshot)
+scheduler.add_job(backup.daily_backup)
+
+
+__all__ = ["DailyScheduler", "scheduler", "refresh_release_statuses", "seconds_until_rollover"]
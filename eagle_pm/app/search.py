@@ -0,0 +1,159 @@
+from __future__ import annotations
+
+import re
+from typing import List, Tuple
+
+from sqlalchemy import Column, Integer, MetaData, String, Table, literal_column, select
+from sqlalchemy.engine import Connection
+from sqlalchemy.exc import OperationalError
+
+# FTS5 index over activity title/ticket, project code/title/PM/EBA and member name.
+# Kept in sync by SQL triggers, so every write path (ORM, bulk, raw SQL) is covered.
+# rowid = ref_id * 4 + kind number, so trigger updates/deletes are rowid lookups.
+
+KIND_ACTIVITY = "activity"
+KIND_PROJECT = "project"
+KIND_MEMBER = "member"
+KIND_NUMBERS = {KIND_ACTIVITY: 1, KIND_PROJECT: 2, KIND_MEMBER: 3}
+
+# Kept out of Base.metadata: create_all cannot emit CREATE VIRTUAL TABLE.
+search_table = Table(
+    "search_index",
+    MetaData(),
+    Column("kind", String),
+    Column("ref_id", Integer),
+    Column("title", String),
+    Column("detail", String),
+)
+
+# bm25 weights per column (kind, ref_id, title, detail); lower score ranks first.
+RANK_EXPR = "bm25(search_index, 0.0, 0.0, 10.0, 3.0)"
+
+_SOURCES = {
+    KIND_ACTIVITY: ("activity", "new.title", "coalesce(new.ticket_code, '')", ("title", "ticket_code")),
+    KIND_PROJECT: (
+        "project",
+        "new.project_code || ' ' || new.title",
+        "new.pm_responsible || ' ' || new.eba_responsible",
+        ("project_code", "title", "pm_responsible", "eba_responsible"),
+    ),
+    KIND_MEMBER: ("member", "new.name", "''", ("name",)),
+}
+
+_TOKEN = re.compile(r"\w+", re.UNICODE)
+
+available = False
+
+
+def _ddl() -> List[str]:
+    statements = [
+        "CREATE VIRTUAL TABLE IF NOT EXISTS search_index USING fts5("
+        "kind UNINDEXED, ref_id UNINDEXED, title, detail, "
+        "tokenize = 'unicode61 remove_diacritics 2', prefix = '2 3')"
+    ]
+    for kind, (table, title_sql, detail_sql, columns) in _SOURCES.items():
+        number = KIND_NUMBERS[kind]
+        insert_sql = (
+            f"INSERT INTO search_index(rowid, kind, ref_id, title, detail) "
+            f"VALUES (new.id * 4 + {number}, '{kind}', new.id, {title_sql}, {detail_sql});"
+        )
+        statements += [
+            f"CREATE TRIGGER IF NOT EXISTS search_{table}_ai AFTER INSERT ON {table} BEGIN {insert_sql} END",
+            f"CREATE TRIGGER IF NOT EXISTS search_{table}_au AFTER UPDATE OF {', '.join(columns)} ON {table} BEGIN "
+            f"DELETE FROM search_index WHERE rowid = old.id * 4 + {number}; {insert_sql} END",
+            f"CREATE TRIGGER IF NOT EXISTS search_{table}_ad AFTER DELETE ON {table} BEGIN "
+            f"DELETE FROM search_index WHERE rowid = old.id * 4 + {number}; END",
+        ]
+    return statements
+
+
+def rebuild(conn: Connection) -> None:
+    """Repopulate the index from the source tables."""
+    conn.exec_driver_sql("DELETE FROM search_index")
+    # Source rows are aliased as "new" so the trigger column expressions can be reused.
+    for kind, (table, title_sql, detail_sql, _columns) in _SOURCES.items():
+        number = KIND_NUMBERS[kind]
+        conn.exec_driver_sql(
+            f"INSERT INTO search_index(rowid, kind, ref_id, title, detail) "
+            f"SELECT new.id * 4 + {number}, '{kind}', new.id, {title_sql}, {detail_sql} FROM {table} AS new"
+        )
+
+
+def ensure_search_index(conn: Connection) -> bool:
+    """Create the FTS table and triggers; rebuild when out of step with the source tables."""
+    global available
+    try:
+        for statement in _ddl():
+            conn.exec_driver_sql(statement)
+    except OperationalError:
+        # SQLite built without FTS5: callers fall back to LIKE filters.
+        available = False
+        return available
+    indexed = conn.exec_driver_sql("SELECT count(*) FROM search_index").scalar()
+    expected = sum(
+        conn.exec_driver_sql(f"SELECT count(*) FROM {table}").scalar() for table, *_ in _SOURCES.values()
+    )
+    if indexed != expected:
+        rebuild(conn)
+    available = True
+    return available
+
+
+def detect(conn: Connection) -> bool:
+    """Set ``available`` from an existing index without DDL or row counts (startup fast path)."""
+    global available
+    available = (
+        conn.exec_driver_sql("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'search_index'").first()
+        is not None
+    )
+    return available
+
+
+def match_expression(text: str | None) -> str | None:
+    """Turn free text into an FTS5 query: every word must match as a prefix."""
+    tokens = _TOKEN.findall(text or "")
+    if not tokens:
+        return None
+    return " ".join(f'"{token}"*' for token in tokens)
+
+
+def match_ids_stmt(kind: str, expression: str):
+    """Subquery of ``ref_id`` values of ``kind`` matching ``expression``."""
+    return select(search_table.c.ref_id).where(
+        literal_column("search_index").op("MATCH")(expression),
+        search_table.c.kind == kind,
+    )
+
+
+def search(conn, text: str | None, kinds: Tuple[str, ...] | None = None, limit: int = 50) -> List[dict]:
+    """Ranked prefix search across all indexed entities."""
+    expression = match_expression(text)
+    if not available or not expression:
+        return []
+    stmt = (
+        select(
+            search_table.c.kind,
+            search_table.c.ref_id,
+            search_table.c.title,
+            search_table.c.detail,
+            literal_column(RANK_EXPR).label("score"),
+        )
+        .where(literal_column("search_index").op("MATCH")(expression))
+        .order_by(literal_column("score"))
+        .limit(limit)
+    )
+    if kinds:
+        stmt = stmt.where(search_table.c.kind.in_(kinds))
+    return [dict(row._mapping) for row in conn.execute(stmt)]
+
+
+__all__ = [
+    "KIND_ACTIVITY",
+    "KIND_MEMBER",
+    "KIND_PROJECT",
+    "ensure_search_index",
+    "match_expression",
+    "match_ids_stmt",
+    "rebuild",
+    "search",
+]
@@ -0,0 +1,123 @@
+from __future__ import annotations
+
+from datetime import date
+from typing import Iterator, List
+
+from sqlalchemy import String, case, cast, delete, func, insert, literal, select
+from sqlalchemy.orm import Session
+
+from . import models, rules
+from .db import SessionLocal
+
+# Daily Snapshot: per-day activity counts by status (models.DailySnapshot). A day's
+# rows are rebuilt with one INSERT ... SELECT ... GROUP BY per scope, so burn-down
+# and throughput charts read a few hundred rows instead of the activity history.
+
+SCOPE_TOTAL = "total"
+SCOPE_MEMBER = "member"
+SCOPE_PROJECT = "project"
+SCOPE_RELEASE = "release"
+
+_SCOPE_COLUMNS = {
+    SCOPE_TOTAL: None,
+    SCOPE_MEMBER: models.Activity.assigned_member_id,
+    SCOPE_PROJECT: models.Activity.project_id,
+    SCOPE_RELEASE: models.Activity.target_release_id,
+}
+
+SNAPSHOT_HEADERS = ["day", "scope", "ref", "status_code", "count"]
+
+
+def record_daily_snapshot(session: Session, day: date) -> int:
+    """Replace the snapshot rows of ``day`` with the current counts; returns rows written."""
+    snap = models.DailySnapshot
+    session.execute(delete(snap).where(snap.day == day))
+    written = 0
+    for scope, column in _SCOPE_COLUMNS.items():
+        ref = literal("") if column is None else func.coalesce(cast(column, String), "")
+        source = select(
+            literal(day).label("day"),
+            literal(scope).label("scope"),
+            ref.label("ref"),
+            models.Activity.status_code,
+            func.count().label("count"),
+        ).group_by(models.Activity.status_code)
+        if column is not None:
+            source = source.group_by(column)
+        result = session.execute(
+            insert(snap).from_select(["day", "scope", "ref", "status_code", "count"], source)
+        )
+        written += result.rowcount or 0
+    return written
+
+
+def take_daily_snapshot(today: date) -> int:
+    """Scheduler job: snapshot the counts as of the first pass of ``today``."""
+    with SessionLocal() as session:
+        written = record_daily_snapshot(session, today)
+        session.commit()
+    return written
+
+
+def release_burndown(session: Session, release_id: int, since: date | None = None) -> List[dict]:
+    """Per-day open/closed totals for one release, oldest first.
+
+    ``closed_delta`` is the day-over-day change in closed activities (throughput).
+    """
+    snap = models.DailySnapshot
+    closed = case((snap.status_code == rules.STATUS_ACTIVITY_CLOSED, snap.count), else_=0)
+    stmt = (
+        select(snap.day, func.sum(snap.count).label("total"), func.sum(closed).label("closed"))
+        .where(snap.scope == SCOPE_RELEASE, snap.ref == str(release_id))
+        .group_by(snap.day)
+        .order_by(snap.day)
+    )
+    if since:
+        stmt = stmt.where(snap.day >= since)
+    series = []
+    previous_closed = None
+    for day, total, closed_count in session.execute(stmt):
+        series.append(
+            {
+                "day": day,
+                "total": total,
+                "closed": closed_count,
+                "open": total - closed_count,
+                "closed_delta": None if previous_closed is None else closed_count - previous_closed,
+            }
+        )
+        previous_closed = closed_count
+    return series
+
+
+def snapshot_rows_stmt(since: date | None = None, scope: str | None = None):
+    snap = models.DailySnapshot
+    stmt = select(snap).order_by(snap.day, snap.scope, snap.ref, snap.status_code)
+    if since:
+        stmt = stmt.where(snap.day >= since)
+    if scope:
+        stmt = stmt.where(snap.scope == scope)
+    return stmt
+
+
+def snapshot_row(row: models.DailySnapshot) -> list:
+    return [row.day, row.scope, row.ref, row.status_code, row.count]
+
+
+def iter_snapshot_rows(since: date | None = None, scope: str | None = None) -> Iterator[list]:
+    from .export import iter_query_rows
+
+    return iter_query_rows(snapshot_rows_stmt(since, scope), snapshot_row)
+
+
+__all__ = [
+    "SCOPE_MEMBER",
+    "SCOPE_PROJECT",
+    "SCOPE_RELEASE",
+    "SCOPE_TOTAL",
+    "SNAPSHOT_HEADERS",
+    "iter_snapshot_rows",
+    "record_daily_snapshot",
+    "release_burndown",
+    "take_daily_snapshot",
+]
@@ -1,2 +1,44 @@
 // JS placeholder para HTMX/helpers futuros
 console.log("Eagle PM static loaded");
+
+// "Load more" for paginated lists: fetch the next page as a rows fragment and
+// swap it in place of the clicked row. Without JS the link opens the next page.
+document.addEventListener("click", function (event) {
+  var link = event.target.closest("[data-load-more]");
+  if (!link) return;
+  event.preventDefault();
+  var row = link.closest("[data-load-more-row]");
+  link.setAttribute("aria-busy", "true");
+  fetch(link.href, { headers: { "HX-Request": "true" } })
+    .then(function (resp) {
+      if (!resp.ok) throw new Error("HTTP " + resp.status);
+      return resp.text();
+    })
+    .then(function (html) {
+      row.insertAdjacentHTML("beforebegin", html);
+      row.remove();
+    })
+    .catch(function () {
+      window.location.href = link.href;
+    });
+});
+
+// Lazy panels: <details data-lazy-src> loads its content into [data-lazy-target]
+// the first time it is opened. "toggle" does not bubble, so listen in capture phase.
+document.addEventListener("toggle", function (event) {
+  var panel = event.target;
+  if (!panel.open || !panel.dataset || !panel.dataset.lazySrc || panel.dataset.lazyLoaded) return;
+  var target = panel.querySelector("[data-lazy-target]") || panel;
+  panel.dataset.lazyLoaded = "1";
+  fetch(panel.dataset.lazySrc, { headers: { "HX-Request": "true" } })
+    .then(function (resp) {
+      if (!resp.ok) throw new Error("HTTP " + resp.status);
+      return resp.text();
+    })
+    .then(function (html) {
+      target.innerHTML = html;
+    })
+    .catch(function () {
+      delete panel.dataset.lazyLoaded;
+    });
+}, true);
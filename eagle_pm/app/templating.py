@@ -0,0 +1,104 @@
+from __future__ import annotations
+
+import os
+from datetime import date, datetime
+from functools import lru_cache
+from pathlib import Path
+
+from fastapi.templating import Jinja2Templates
+from jinja2 import FileSystemBytecodeCache
+from jinja2.bccache import Bucket
+
+from . import db, metrics
+
+# Jinja environment shared by all routes. Compiled templates are kept in a bytecode
+# cache next to the database (EAGLE_PM_TEMPLATE_CACHE_DIR; "off" disables it), so a
+# restart loads them instead of parsing and compiling every template again.
+# ``eagle-pm compile-templates`` fills the cache ahead of time, e.g. for a packaged build.
+
+TEMPLATES_DIR = Path(__file__).parent / "templates"
+TEMPLATE_CACHE_DIR = os.getenv("EAGLE_PM_TEMPLATE_CACHE_DIR", str(db.DATABASE_PATH.resolve().parent / ".template_cache"))
+
+DATE_FORMAT = "%d/%m/%Y"
+
+
+class TemplateBytecodeCache(FileSystemBytecodeCache):
+    """Bytecode cache keyed on the template name only.
+
+    Jinja keys on name and file path; PyInstaller one-file builds unpack to a new
+    directory per run, which would miss every time. Stale entries are still
+    rejected by the source checksum stored in each bucket.
+    """
+
+    def __init__(self, directory: str) -> None:
+        Path(directory).mkdir(parents=True, exist_ok=True)
+        super().__init__(directory, "%s.jinja-cache")
+
+    def get_bucket(self, environment, name, filename, source) -> Bucket:
+        return super().get_bucket(environment, name, None, source)
+
+    def dump_bytecode(self, bucket: Bucket) -> None:
+        # A read-only cache (shipped with a build) only costs a compile on the next start.
+        try:
+            super().dump_bytecode(bucket)
+        except OSError:
+            pass
+
+
+def _bytecode_cache() -> TemplateBytecodeCache | None:
+    if TEMPLATE_CACHE_DIR.lower() in ("", "0", "off", "false", "no"):
+        return None
+    try:
+        return TemplateBytecodeCache(TEMPLATE_CACHE_DIR)
+    except OSError:
+        return None
+
+
+@lru_cache(maxsize=4096)
+def _fmt_day(value: date) -> str:
+    return value.strftime(DATE_FORMAT)
+
+
+@lru_cache(maxsize=1024)
+def _fmt_text(value: str) -> str:
+    try:
+        return datetime.fromisoformat(value).strftime(DATE_FORMAT)
+    except ValueError:
+        return value
+
+
+def fmt_date(value):
+    """Format date/datetime as DD/MM/YYYY or '-' when empty."""
+    # Rows carry few distinct days, so the output is memoised per day; exact type
+    # checks keep the common case (a ``date`` column) to one branch.
+    kind = type(value)
+    if kind is date:
+        return _fmt_day(value)
+    if kind is datetime:
+        return _fmt_day(value.date())
+    if value is None or value == "" or value == "null":
+        return "-"
+    if isinstance(value, datetime):
+        return value.strftime(DATE_FORMAT)
+    if isinstance(value, date):
+        return value.strftime(DATE_FORMAT)
+    return _fmt_text(str(value))
+
+
+templates = Jinja2Templates(directory=str(TEMPLATES_DIR))
+templates.env.bytecode_cache = _bytecode_cache()
+templates.env.filters["fmt_date"] = fmt_date
+templates.env.template_class = metrics.TimedTemplate
+
+
+def precompile() -> int:
+    """Load every template so its bytecode lands in the cache; returns the count."""
+    if templates.env.bytecode_cache is None:
+        raise RuntimeError("Cache de templates desativado (EAGLE_PM_TEMPLATE_CACHE_DIR).")
+    names = templates.env.list_templates(extensions=["html"])
+    for name in names:
+        templates.env.get_template(name)
+    return len(names)
+
+
+__all__ = ["TEMPLATES_DIR", "TEMPLATE_CACHE_DIR", "TemplateBytecodeCache", "fmt_date", "precompile", "templates"]
@@ -0,0 +1,1035 @@
+"""Micro-benchmarks for Eagle PM hot paths.
+
+Run with ``python -m eagle_pm.bench <name>`` (or ``all``). Each benchmark prints
+a small table; they run against a scratch database in the temp dir, never the
+real ``eagle_pm.db``.
+"""
+from __future__ import annotations
+
+import io
+import os
+import sys
+import tempfile
+import time
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Callable, Dict
+
+BENCH_DB_PATH = Path(tempfile.gettempdir()) / "eagle_pm_bench.db"
+
+
+def _timed(fn: Callable[[], object], repeat: int = 3) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def _fake_member(member_id: int) -> SimpleNamespace:
+    return SimpleNamespace(
+        id=member_id,
+        name=f"Member {member_id:05d}",
+        role=SimpleNamespace(name="DEV"),
+        role_code="003",
+        status_code="001",
+        vacation_start=None,
+        vacation_end=None,
+    )
+
+
+def _fake_activity(activity_id: int, member_id: int | None) -> SimpleNamespace:
+    return SimpleNamespace(
+        id=activity_id,
+        title=f"Activity {activity_id}",
+        assigned_member_id=member_id,
+        project_id=None,
+        type=SimpleNamespace(name="JIRA"),
+        type_code="001",
+        subtype=SimpleNamespace(name="STORY"),
+        subtype_code="001",
+        status=SimpleNamespace(name="OPEN"),
+        status_code="002",
+        start_date=date(2024, 1, 1),
+    )
+
+
+def bench_daily_meeting() -> None:
+    """Group + render daily_meeting.html; time per activity should stay flat."""
+    from .app.routes import templates
+
+    template = templates.env.get_template("daily_meeting.html")
+    print(f"{'members':>8} {'activities':>10} {'total ms':>10} {'us/activity':>12}")
+    for members_count in (50, 100, 200, 400):
+        activities_count = members_count * 10
+        members = [_fake_member(i) for i in range(1, members_count + 1)]
+        activities = [
+            _fake_activity(i, (i % (members_count + 1)) or None) for i in range(activities_count)
+        ]
+
+        def run():
+            template.render(request=None, **_daily_meeting_context(members, activities))
+
+        elapsed = _timed(run)
+        print(f"{members_count:>8} {activities_count:>10} {elapsed * 1000:>10.1f} {elapsed / activities_count * 1e6:>12.2f}")
+
+
+def _daily_meeting_context(members, activities) -> dict:
+    from .app import crud
+
+    grouped = crud.group_activities_by_member(activities)
+    return {
+        "title": "Daily Meeting",
+        "members": members,
+        "activities_by_member": grouped,
+        "open_by_member": {member_id: len(items) for member_id, items in grouped.items()},
+        "status_counts": {"002": len(activities)},
+        "open_status_options": [("002", "OPEN")],
+        "today": date.today(),
+    }
+
+
+def _reset_db() -> None:
+    from .app import db
+
+    # A new file rather than drop_all: the schema version (PRAGMA user_version) must start over too.
+    db.dispose_engines()
+    for suffix in ("", "-wal", "-shm"):
+        Path(f"{db.DATABASE_PATH}{suffix}").unlink(missing_ok=True)
+    db.init_db()
+
+
+def _seed(session, members: int, projects: int, releases: int, activities: int) -> None:
+    """Insert a synthetic data set sized by the given row counts."""
+    from .app import crud, models, rules
+
+    today = date.today()
+    session.add_all(
+        models.Member(name=f"Member {i:05d}", role_code="003", status_code="001") for i in range(members)
+    )
+    session.add_all(
+        models.Release(
+            release_code=f"R{i:04d}",
+            status_code=rules.STATUS_RELEASE_IN_PROGRESS,
+            delivery_date=today,
+            start_date=today - timedelta(days=i),
+            installation_date=today + timedelta(days=30 + i),
+        )
+        for i in range(releases)
+    )
+    session.add_all(
+        models.Project(
+            project_code=f"PR{i}",
+            title=f"Project {i}",
+            pm_responsible="PM",
+            eba_responsible="EBA",
+            status_code="005",
+            target_release_id=(i % releases) + 1 if releases else None,
+        )
+        for i in range(projects)
+    )
+    statuses = [code for code, _ in rules.INDEX_VALUES["index_activity_status"]]
+    session.add_all(
+        models.Activity(
+            type_code="001",
+            subtype_code="001",
+            title=f"Activity {i}",
+            ticket_code=f"T-{i}",
+            status_code=statuses[i % len(statuses)],
+            assigned_member_id=(i % (members + 1)) or None,
+            project_id=(i % projects) + 1 if projects else None,
+            target_release_id=(i % releases) + 1 if releases else None,
+        )
+        for i in range(activities)
+    )
+    session.flush()
+    crud.rebuild_dashboard_counts(session)
+    session.commit()
+
+
+def _fake_request(path: str):
+    from starlette.requests import Request
+
+    return Request({"type": "http", "method": "GET", "path": path, "query_string": b"", "headers": []})
+
+
+# Upper bound on SQL statements for a full page render, independent of row counts.
+PAGE_STATEMENT_LIMIT = 12
+
+
+def bench_query_counts() -> None:
+    """Count SQL statements per page at two data sizes; fail if they grow with rows."""
+    from sqlalchemy import event
+
+    from .app import db, routes
+
+    pages = {
+        "daily_meeting": lambda s: routes._daily_meeting(s, _fake_request("/dashboards/daily-meeting")),
+        "project_control": lambda s: routes._project_control(s, _fake_request("/dashboards/project-control")),
+        "release_scope": lambda s: routes._release_scope(s, _fake_request("/dashboards/release-scope")),
+        "members": lambda s: routes._members(s, _fake_request("/members")),
+        "releases": lambda s: routes._releases(s, _fake_request("/releases")),
+        "projects": lambda s: routes._projects(s, _fake_request("/projects")),
+        "activities": lambda s: routes._activities(s, _fake_request("/activities")),
+    }
+    counts: dict[str, list[int]] = {name: [] for name in pages}
+    statements = [0]
+
+    def _count(*_args):
+        statements[0] += 1
+
+    sizes = (20, 200)
+    for size in sizes:
+        _reset_db()
+        with db.SessionLocal() as session:
+            _seed(session, members=size, projects=size, releases=3, activities=size * 10)
+        event.listen(db.engine, "before_cursor_execute", _count)
+        try:
+            for name, render in pages.items():
+                with db.SessionLocal() as session:
+                    statements[0] = 0
+                    render(session)
+                    counts[name].append(statements[0])
+        finally:
+            event.remove(db.engine, "before_cursor_execute", _count)
+
+    print(f"{'page':<16} " + " ".join(f"{f'{s * 10} acts':>10}" for s in sizes))
+    failures = []
+    for name, values in counts.items():
+        print(f"{name:<16} " + " ".join(f"{v:>10}" for v in values))
+        if max(values) > PAGE_STATEMENT_LIMIT or len(set(values)) > 1:
+            failures.append(name)
+    if failures:
+        raise SystemExit(f"Statement count above {PAGE_STATEMENT_LIMIT} or growing with rows: {', '.join(failures)}")
+
+
+def bench_export_csv() -> None:
+    """Peak Python memory of the streaming CSV export versus building the whole file."""
+    import tracemalloc
+
+    from .app import crud, db, export
+
+    _reset_db()
+    with db.SessionLocal() as session:
+        _seed(session, members=200, projects=200, releases=5, activities=50_000)
+    stmt = crud.list_activities_stmt(load="activity_row")
+
+    def streamed():
+        for _chunk in export.iter_csv(export.ACTIVITY_HEADERS, export.iter_query_rows(stmt, export.activity_row)):
+            pass
+
+    def materialised():
+        with db.SessionLocal() as session:
+            rows = [export.activity_row(a) for a in session.execute(stmt).scalars().all()]
+            export.rows_to_csv(export.ACTIVITY_HEADERS, rows)
+
+    print(f"{'mode':<14} {'seconds':>8} {'peak MiB':>9}")
+    for label, fn in (("streamed", streamed), ("materialised", materialised)):
+        tracemalloc.start()
+        start = time.perf_counter()
+        fn()
+        elapsed = time.perf_counter() - start
+        _current, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        print(f"{label:<14} {elapsed:>8.2f} {peak / 2**20:>9.1f}")
+
+
+def bench_export_xlsx(rows_count: int = 100_000) -> None:
+    """Writer cost of CSV versus write-only XLSX for the activity export shape."""
+    import tracemalloc
+
+    from .app import export
+
+    now = datetime(2024, 1, 1, 12, 0)
+
+    def rows():
+        for i in range(rows_count):
+            yield [f"Activity {i}", "JIRA", "STORY", "OPEN", f"PR{i % 500}", f"Member {i % 300}", "R0001",
+                   f"T-{i}", date(2024, 1, 1), "", now, now]
+
+    def csv_path():
+        for _chunk in export.iter_csv(export.ACTIVITY_HEADERS, rows()):
+            pass
+
+    def xlsx_path():
+        for _chunk in export.iter_xlsx([("activities", export.ACTIVITY_HEADERS, rows())]):
+            pass
+
+    # Timing and memory are separate passes: tracemalloc slows openpyxl down several-fold.
+    print(f"{'format':<6} {'rows':>8} {'seconds':>8} {'peak MiB':>9}")
+    for label, fn in (("csv", csv_path), ("xlsx", xlsx_path)):
+        start = time.perf_counter()
+        fn()
+        elapsed = time.perf_counter() - start
+        tracemalloc.start()
+        fn()
+        _current, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        print(f"{label:<6} {rows_count:>8} {elapsed:>8.2f} {peak / 2**20:>9.1f}")
+
+
+def bench_sqlite_profile(seconds: float = 3.0, readers: int = 4, writers: int = 2) -> None:
+    """Mixed read/write throughput with stock SQLite settings versus the db.py performance profile."""
+    import threading
+
+    from sqlalchemy import create_engine, event, func, insert, select
+    from sqlalchemy.exc import OperationalError
+
+    from .app import db, models
+
+    def run(label: str, pragmas: dict | None) -> None:
+        path = BENCH_DB_PATH.with_name(f"eagle_pm_bench_{label}.db")
+        for suffix in ("", "-wal", "-shm"):
+            Path(f"{path}{suffix}").unlink(missing_ok=True)
+        engine = create_engine(f"sqlite:///{path}", connect_args={"check_same_thread": False})
+        if pragmas is not None:
+            event.listen(engine, "connect", lambda conn, _rec: db.apply_sqlite_pragmas(conn, pragmas))
+        db.Base.metadata.create_all(bind=engine)
+        with engine.begin() as conn:
+            for table, code, name in (
+                ("index_activity_type", "001", "JIRA"),
+                ("index_activity_subtype", "001", "STORY"),
+                ("index_activity_status", "002", "OPEN"),
+            ):
+                conn.execute(insert(db.Base.metadata.tables[table]).values(code=code, name=name))
+        stop = threading.Event()
+        counters = {"reads": 0, "writes": 0, "locked": 0}
+        lock = threading.Lock()
+
+        def bump(key: str) -> None:
+            with lock:
+                counters[key] += 1
+
+        def reader() -> None:
+            while not stop.is_set():
+                try:
+                    with engine.connect() as conn:
+                        conn.execute(select(func.count()).select_from(models.Activity.__table__)).scalar()
+                        conn.execute(select(models.Activity.__table__).order_by(models.Activity.id.desc()).limit(50)).all()
+                    bump("reads")
+                except OperationalError:
+                    bump("locked")
+
+        def writer() -> None:
+            i = 0
+            while not stop.is_set():
+                i += 1
+                try:
+                    with engine.begin() as conn:
+                        conn.execute(insert(models.Activity.__table__).values(
+                            type_code="001", subtype_code="001", status_code="002", title=f"w{i}",
+                            created_at=datetime.utcnow(), updated_at=datetime.utcnow(),
+                        ))
+                    bump("writes")
+                except OperationalError:
+                    bump("locked")
+
+        threads = [threading.Thread(target=reader) for _ in range(readers)] + [threading.Thread(target=writer) for _ in range(writers)]
+        for t in threads:
+            t.start()
+        time.sleep(seconds)
+        stop.set()
+        for t in threads:
+            t.join()
+        engine.dispose()
+        print(f"{label:<12} {counters['reads'] / seconds:>10.0f} {counters['writes'] / seconds:>10.0f} {counters['locked']:>8}")
+
+    print(f"{'profile':<12} {'reads/s':>10} {'writes/s':>10} {'locked':>8}")
+    run("default", None)
+    run("performance", db.SQLITE_PRAGMAS)
+
+
+def bench_search(activities: int = 50_000) -> None:
+    """Activity title filter through the FTS index versus a leading-wildcard LIKE."""
+    from sqlalchemy import func, select
+
+    from .app import crud, db, models, search
+
+    _reset_db()
+    with db.SessionLocal() as session:
+        _seed(session, members=200, projects=200, releases=5, activities=activities)
+    if not search.available:
+        print("SQLite built without FTS5; nothing to compare.")
+        return
+    print(f"{'query':<16} {'fts ms':>8} {'like ms':>8} {'rows':>6}")
+    with db.SessionLocal() as session:
+        for text in ("Activity 4", "Activity 12345", "T-999"):
+            fts_stmt = select(func.count()).select_from(crud.list_activities_stmt(title_like=text).subquery())
+            like = f"%{text}%"
+            like_stmt = select(func.count()).where(
+                models.Activity.title.ilike(like) | models.Activity.ticket_code.ilike(like)
+            )
+            fts_time = _timed(lambda: session.execute(fts_stmt).scalar())
+            like_time = _timed(lambda: session.execute(like_stmt).scalar())
+            rows = session.execute(fts_stmt).scalar()
+            print(f"{text:<16} {fts_time * 1000:>8.2f} {like_time * 1000:>8.2f} {rows:>6}")
+
+
+def bench_bulk_activities(count: int = 1000) -> None:
+    """Status change on ``count`` activities: one bulk call versus a per-row update loop."""
+    from sqlalchemy import select
+
+    from .app import crud, db, models
+
+    def fresh_ids() -> list[int]:
+        _reset_db()
+        with db.SessionLocal() as session:
+            _seed(session, members=50, projects=50, releases=3, activities=count)
+            return list(session.scalars(select(models.Activity.id).order_by(models.Activity.id)))
+
+    def per_row(ids: list[int]) -> None:
+        with db.SessionLocal() as session:
+            for activity in session.scalars(select(models.Activity).where(models.Activity.id.in_(ids))).all():
+                crud.update_activity(
+                    session,
+                    activity.id,
+                    activity.type_code,
+                    activity.subtype_code,
+                    activity.title,
+                    "005",
+                    activity.ticket_code,
+                    activity.assigned_member_id,
+                    activity.project_id,
+                    activity.target_release_id,
+                    activity.start_date,
+                )
+
+    def bulk(ids: list[int]) -> None:
+        with db.SessionLocal() as session:
+            crud.bulk_update_activities(session, ids, status_code="005")
+
+    def bulk_create() -> None:
+        rows = [
+            {"type_code": "001", "subtype_code": "001", "title": f"Bulk {i}", "status_code": "002", "project_id": 1}
+            for i in range(count)
+        ]
+        with db.SessionLocal() as session:
+            crud.bulk_create_activities(session, rows)
+
+    print(f"{'operation':<22} {'rows':>6} {'total ms':>10} {'rows/s':>10}")
+    for name, run in (("update per row", per_row), ("bulk update", bulk)):
+        ids = fresh_ids()
+        elapsed = _timed(lambda: run(ids), repeat=1)
+        print(f"{name:<22} {count:>6} {elapsed * 1000:>10.1f} {count / elapsed:>10.0f}")
+    fresh_ids()
+    elapsed = _timed(bulk_create, repeat=1)
+    print(f"{'bulk create':<22} {count:>6} {elapsed * 1000:>10.1f} {count / elapsed:>10.0f}")
+    with db.SessionLocal() as session:
+        drift = crud.check_dashboard_counts(session)
+    if drift:
+        raise SystemExit(f"Dashboard counters drifted after bulk operations: {drift}")
+
+
+def bench_import(count: int = 5000) -> None:
+    """CSV activity import through the chunked importer versus one create_activity call per row."""
+    from .app import crud, db, export, importer
+
+    def rows():
+        return [
+            [f"Imported {i}", "JIRA", "STORY", "OPEN", f"PR{i % 50}", f"Member {i % 50:05d}", "R0000", f"T-{i}", "", "", "", ""]
+            for i in range(count)
+        ]
+
+    def via_importer() -> None:
+        payload = export.rows_to_csv(export.ACTIVITY_HEADERS, rows()).encode()
+        with db.SessionLocal() as session:
+            report = importer.import_file(session, io.BytesIO(payload), "activities.csv")[0]
+        if report.error_count:
+            raise SystemExit(importer.format_report(report))
+
+    def per_row() -> None:
+        with db.SessionLocal() as session:
+            for i in range(count):
+                crud.create_activity(session, "001", "001", f"Imported {i}", "002", f"T-{i}", (i % 50) + 1, (i % 50) + 1, 1)
+
+    print(f"{'path':<22} {'rows':>6} {'total ms':>10} {'rows/s':>10}")
+    for name, run in (("create_activity loop", per_row), ("importer", via_importer)):
+        _reset_db()
+        with db.SessionLocal() as session:
+            _seed(session, members=50, projects=50, releases=3, activities=0)
+        elapsed = _timed(run, repeat=1)
+        print(f"{name:<22} {count:>6} {elapsed * 1000:>10.1f} {count / elapsed:>10.0f}")
+
+
+def bench_backup(activities: int = 100_000) -> None:
+    """Online backup duration and the worst write latency seen by a concurrent writer."""
+    import threading
+
+    from .app import backup, db, models
+
+    _reset_db()
+    with db.SessionLocal() as session:
+        _seed(session, members=200, projects=200, releases=5, activities=activities)
+    backup.BACKUP_DIR = BENCH_DB_PATH.parent / "eagle_pm_bench_backups"
+
+    def writer(stop: threading.Event, latencies: list[float]) -> None:
+        with db.SessionLocal() as session:
+            while not stop.is_set():
+                start = time.perf_counter()
+                session.add(models.Activity(type_code="001", subtype_code="001", title="w", status_code="002"))
+                session.commit()
+                latencies.append(time.perf_counter() - start)
+
+    def measure(action: Callable[[], object] | None) -> tuple[float, list[float]]:
+        stop, latencies = threading.Event(), []
+        thread = threading.Thread(target=writer, args=(stop, latencies))
+        thread.start()
+        start = time.perf_counter()
+        if action is None:
+            time.sleep(1.0)
+        else:
+            action()
+        elapsed = time.perf_counter() - start
+        stop.set()
+        thread.join()
+        return elapsed, latencies
+
+    size_mb = BENCH_DB_PATH.stat().st_size / 1e6
+    print(f"{'scenario':<18} {'ms':>8} {'writes':>7} {'max write ms':>13}  (db {size_mb:.1f} MB)")
+    for name, action in (
+        ("writer only", None),
+        ("backup", lambda: backup.create_backup(compress=False, keep=1)),
+        ("backup + gzip", lambda: backup.create_backup(compress=True, keep=1)),
+    ):
+        elapsed, latencies = measure(action)
+        print(f"{name:<18} {elapsed * 1000:>8.0f} {len(latencies):>7} {max(latencies) * 1000:>13.1f}")
+    for item in backup.list_backups():
+        print(f"  {item['name']}: {item['size'] / 1e6:.1f} MB")
+
+
+def bench_audit(count: int = 1000) -> None:
+    """Write-path cost of change-log capture: per-row updates and one bulk status change."""
+    from sqlalchemy import func, select
+
+    from .app import audit, crud, db, models
+
+    def per_row(ids: list[int], status_code: str) -> None:
+        with db.SessionLocal() as session:
+            for activity_id in ids[:200]:
+                act = crud.get_activity(session, activity_id)
+                crud.update_activity(
+                    session, act.id, act.type_code, act.subtype_code, act.title + "!", status_code,
+                    act.ticket_code, act.assigned_member_id, act.project_id, act.target_release_id, act.start_date,
+                )
+
+    def bulk(ids: list[int], status_code: str) -> None:
+        with db.SessionLocal() as session:
+            crud.bulk_update_activities(session, ids, status_code=status_code)
+
+    print(f"{'operation':<22} {'audit off ms':>12} {'audit on ms':>12} {'log rows':>9}")
+    for name, run, rows in (("200 x update_activity", per_row, 200), (f"bulk update x{count}", bulk, count)):
+        timings = []
+        for enabled in (False, True):
+            audit.AUDIT_ENABLED = enabled
+            _reset_db()
+            with db.SessionLocal() as session:
+                _seed(session, members=50, projects=50, releases=3, activities=count)
+                ids = list(session.scalars(select(models.Activity.id).order_by(models.Activity.id)))
+            timings.append(_timed(lambda: run(ids, "004"), repeat=1))
+            with db.SessionLocal() as session:
+                logged = session.scalar(select(func.count()).select_from(models.ChangeLog))
+        audit.AUDIT_ENABLED = True
+        print(f"{name:<22} {timings[0] * 1000:>12.1f} {timings[1] * 1000:>12.1f} {logged:>9}")
+
+
+def bench_snapshot(activities: int = 50_000, days: int = 180) -> None:
+    """Daily snapshot job cost, and a release burn-down read from ``days`` of snapshots."""
+    from sqlalchemy import func, select
+
+    from .app import db, models, snapshots
+
+    _reset_db()
+    with db.SessionLocal() as session:
+        _seed(session, members=200, projects=200, releases=5, activities=activities)
+    today = date.today()
+    with db.SessionLocal() as session:
+        job = _timed(lambda: snapshots.record_daily_snapshot(session, today), repeat=1)
+        for offset in range(1, days):
+            snapshots.record_daily_snapshot(session, today - timedelta(days=offset))
+        session.commit()
+        rows = session.scalar(select(func.count()).select_from(models.DailySnapshot))
+        per_day = rows // days
+        burndown = _timed(lambda: snapshots.release_burndown(session, 1))
+        live = _timed(
+            lambda: session.execute(
+                select(models.Activity.status_code, func.count())
+                .where(models.Activity.target_release_id == 1)
+                .group_by(models.Activity.status_code)
+            ).all()
+        )
+    print(f"snapshot job ({activities} activities): {job * 1000:.1f} ms, {per_day} rows/day")
+    print(f"burn-down over {days} days: {burndown * 1000:.2f} ms ({rows} snapshot rows)")
+    print(f"one live count of the same release from activity: {live * 1000:.2f} ms")
+
+
+
+def bench_release_scope(releases: int = 50, activities: int = 20_000) -> None:
+    """Release scope page with many concurrent releases versus listing every release's activities."""
+    from .app import crud, db, routes
+
+    _reset_db()
+    with db.SessionLocal() as session:
+        _seed(session, members=100, projects=200, releases=releases, activities=activities)
+    with db.SessionLocal() as session:
+        page = _timed(lambda: routes._release_scope(session, _fake_request("/dashboards/release-scope")))
+        counts = _timed(lambda: crud.release_scope_counts(session))
+        eager = _timed(
+            lambda: [
+                crud.list_open_activities(session, target_release_id=rel.id, load="activity_scope")
+                for rel in crud.list_scope_releases(session)
+            ],
+            repeat=1,
+        )
+    print(f"{releases} releases, {activities} activities")
+    print(f"release scope page (counts + first page):   {page * 1000:8.1f} ms")
+    print(f"  of which the GROUP BY counts:             {counts * 1000:8.1f} ms")
+    print(f"every release's open activities, eagerly:  {eager * 1000:8.1f} ms")
+
+
+
+def bench_metrics(requests: int = 100) -> None:
+    """Per-request cost of the metrics middleware (timings, SQL events, Server-Timing)."""
+    import warnings
+
+    from fastapi.testclient import TestClient
+
+    from .app import db, metrics
+
+    warnings.filterwarnings("ignore", category=DeprecationWarning)
+    _reset_db()
+    with db.SessionLocal() as session:
+        _seed(session, members=50, projects=50, releases=3, activities=500)
+    from .app.main import app
+
+    with TestClient(app) as client:
+        # Alternate on/off rounds so drift (GC, CPU frequency) hits both sides alike.
+        results = {False: float("inf"), True: float("inf")}
+        for _round in range(5):
+            for enabled in (False, True):
+                metrics.METRICS_ENABLED = enabled
+                elapsed = _timed(lambda: [client.get("/dashboards/daily-meeting") for _ in range(requests)], repeat=1)
+                results[enabled] = min(results[enabled], elapsed)
+        metrics.METRICS_ENABLED = True
+        header = client.get("/dashboards/daily-meeting").headers.get("server-timing")
+    off, on = (results[False] / requests * 1000, results[True] / requests * 1000)
+    print(f"daily_meeting, {requests} requests: off {off:.2f} ms/req, on {on:.2f} ms/req ({on - off:+.2f} ms)")
+    print(f"Server-Timing: {header}")
+
+
+
+
+def bench_conditional_get(requests: int = 50) -> None:
+    """Dashboard refresh cost: full render versus a 304 revalidation (If-None-Match)."""
+    import warnings
+
+    from fastapi.testclient import TestClient
+
+    from .app import db
+
+    warnings.filterwarnings("ignore", category=DeprecationWarning)
+    _reset_db()
+    with db.SessionLocal() as session:
+        _seed(session, members=100, projects=200, releases=5, activities=5000)
+    from .app.main import app
+
+    print(f"{'page':<32} {'200 ms':>8} {'304 ms':>8}")
+    with TestClient(app) as client:
+        for path in ("/dashboards/daily-meeting", "/dashboards/project-control", "/activities"):
+            etag = client.get(path).headers["etag"]
+            full = _timed(lambda: [client.get(path) for _ in range(requests)], repeat=1)
+            revalidate = _timed(
+                lambda: [client.get(path, headers={"If-None-Match": etag}) for _ in range(requests)], repeat=1
+            )
+            assert client.get(path, headers={"If-None-Match": etag}).status_code == 304
+            print(f"{path:<32} {full / requests * 1000:>8.2f} {revalidate / requests * 1000:>8.2f}")
+
+
+
+def bench_form_options(rows: int = 5000) -> None:
+    """Activity form dropdowns: full ORM objects (before), column projections, cached bundle."""
+    from sqlalchemy import select
+
+    from .app import crud, db, models, rules
+
+    _reset_db()
+    with db.SessionLocal() as session:
+        _seed(session, members=rows, projects=rows, releases=50, activities=rows)
+
+    def orm_objects(session) -> None:
+        [(m.id, m.name) for m in crud.list_members(session)]
+        for model_cls, column, closed in (
+            (models.Project, models.Project.project_code, models.Project.status_code != rules.STATUS_PROJECT_CLOSED),
+            (models.Release, models.Release.release_code, models.Release.status_code != rules.STATUS_RELEASE_INSTALLED),
+        ):
+            [(row.id, getattr(row, column.key)) for row in session.execute(select(model_cls).where(closed)).scalars()]
+
+    with db.SessionLocal() as session:
+        before = _timed(lambda: orm_objects(session))
+        projected = _timed(lambda: crud.build_form_options(session))
+        crud.form_options(session)
+        cached = _timed(lambda: crud.form_options(session))
+    print(f"{rows} members / {rows} projects / 50 releases")
+    print(f"ORM objects:        {before * 1000:8.2f} ms")
+    print(f"column projections: {projected * 1000:8.2f} ms")
+    print(f"cached bundle:      {cached * 1000:8.3f} ms")
+
+
+# Pages driven by the load test (the lists and lazy panels HTMX fetches in bursts); each
+# has a sync loader ``routes._<name>(session, request)`` returning ``(template, context)``.
+LOAD_PAGES = (
+    ("/activities", "activities"),
+    ("/members", "members"),
+    ("/dashboards/release-scope", "release_scope"),
+)
+
+
+def load_test_app(mode: str = "async"):
+    """ASGI app serving LOAD_PAGES either as the shipped async routes or as sync threadpool routes.
+
+    Started by ``bench_load`` as ``uvicorn --factory``; no middleware or startup jobs, so the
+    two modes differ only in how a request reaches the database.
+    """
+    from fastapi import Depends, FastAPI, Request
+
+    from .app import db, routes
+    from .app.templating import templates
+
+    def sync_endpoint(build):
+        def endpoint(request, session=Depends(db.get_session)):
+            name, context = build(session, request)
+            return templates.TemplateResponse(name, context)
+
+        # Real class, not the postponed "Request" string: FastAPI resolves those in module globals.
+        endpoint.__annotations__ = {"request": Request}
+        return endpoint
+
+    app = FastAPI()
+    for path, name in LOAD_PAGES:
+        endpoint = getattr(routes, name) if mode == "async" else sync_endpoint(getattr(routes, f"_{name}"))
+        app.get(path)(endpoint)
+    app.get("/health")(routes.health)
+    return app
+
+
+async def _drive(base_url: str, clients: int, requests: int) -> tuple[list[float], float, list[float]]:
+    """Latencies of ``requests`` page loads over ``clients`` clients, elapsed seconds, and the
+    latencies of a /health probe sent every 50 ms meanwhile (a cheap route must not wait
+    behind page renders)."""
+    import asyncio
+
+    import httpx
+
+    latencies: list[float] = []
+    probes: list[float] = []
+    remaining = [requests]
+
+    async def client_loop(client) -> None:
+        turn = 0
+        while remaining[0] > 0:
+            remaining[0] -= 1
+            path = LOAD_PAGES[turn % len(LOAD_PAGES)][0]
+            turn += 1
+            start = time.perf_counter()
+            resp = await client.get(path)
+            latencies.append(time.perf_counter() - start)
+            resp.raise_for_status()
+
+    async def probe_loop(client) -> None:
+        while remaining[0] > 0:
+            start = time.perf_counter()
+            resp = await client.get("/health")
+            probes.append(time.perf_counter() - start)
+            resp.raise_for_status()
+            await asyncio.sleep(0.05)
+
+    limits = httpx.Limits(max_connections=clients, max_keepalive_connections=clients)
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=60) as client, httpx.AsyncClient(
+        base_url=base_url, timeout=60
+    ) as probe_client:
+        started = time.perf_counter()
+        await asyncio.gather(probe_loop(probe_client), *(client_loop(client) for _ in range(clients)))
+        elapsed = time.perf_counter() - started
+    return latencies, elapsed, probes
+
+
+def bench_load(clients: int = 50, requests: int = 1000) -> None:
+    """p50/p99 latency of the dashboard/list pages at ``clients`` concurrent clients, sync vs async routes."""
+    import asyncio
+    import socket
+    import subprocess
+    import urllib.request
+
+    from .app import db
+
+    _reset_db()
+    with db.SessionLocal() as session:
+        _seed(session, members=50, projects=100, releases=5, activities=2000)
+    print(f"{clients} clients, {requests} requests over {', '.join(path for path, _ in LOAD_PAGES)}")
+    print(f"{'routes':<8} {'p50 ms':>8} {'p99 ms':>8} {'max ms':>8} {'req/s':>8} {'/health p50':>12} {'/health max':>12}")
+    for mode in ("sync", "async"):
+        with socket.socket() as sock:
+            sock.bind(("127.0.0.1", 0))
+            port = sock.getsockname()[1]
+        server = subprocess.Popen(
+            [
+                sys.executable, "-m", "uvicorn", "--factory", f"eagle_pm.bench:load_test_{mode}_app",
+                "--port", str(port), "--log-level", "warning", "--no-access-log",
+            ],
+            env=dict(os.environ),
+        )
+        base_url = f"http://127.0.0.1:{port}"
+        try:
+            for _ in range(100):
+                try:
+                    urllib.request.urlopen(base_url + LOAD_PAGES[0][0], timeout=5).read()
+                    break
+                except OSError:
+                    time.sleep(0.1)
+            asyncio.run(_drive(base_url, clients, clients * 2))  # warm-up: pools, template cache
+            latencies, elapsed, probes = asyncio.run(_drive(base_url, clients, requests))
+        finally:
+            server.terminate()
+            try:
+                server.wait(10)
+            except subprocess.TimeoutExpired:
+                server.kill()
+        latencies.sort()
+        p50 = latencies[len(latencies) // 2] * 1000
+        p99 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))] * 1000
+        probes.sort()
+        print(
+            f"{mode:<8} {p50:>8.1f} {p99:>8.1f} {latencies[-1] * 1000:>8.1f} {len(latencies) / elapsed:>8.0f}"
+            f" {probes[len(probes) // 2] * 1000:>12.1f} {probes[-1] * 1000:>12.1f}"
+        )
+
+
+def load_test_sync_app():
+    return load_test_app("sync")
+
+
+def load_test_async_app():
+    return load_test_app("async")
+
+
+def _legacy_fmt_date(value):
+    # fmt_date as it was before the memoised version, kept for comparison.
+    if value in (None, "", "null"):
+        return "-"
+    try:
+        if isinstance(value, datetime):
+            return value.strftime("%d/%m/%Y")
+        if isinstance(value, date):
+            return value.strftime("%d/%m/%Y")
+        return datetime.fromisoformat(str(value)).strftime("%d/%m/%Y")
+    except Exception:
+        return str(value)
+
+
+def bench_templates(rows: int = 10_000) -> None:
+    """Template load (compile vs bytecode cache) and daily_meeting/activities render at ``rows`` rows."""
+    from jinja2 import Environment, FileSystemLoader
+
+    from .app import templating
+
+    def load_all(bytecode_cache) -> float:
+        env = Environment(loader=FileSystemLoader(str(templating.TEMPLATES_DIR)), bytecode_cache=bytecode_cache)
+        env.filters["fmt_date"] = templating.fmt_date
+        start = time.perf_counter()
+        for name in env.list_templates(extensions=["html"]):
+            env.get_template(name)
+        return time.perf_counter() - start
+
+    with tempfile.TemporaryDirectory() as cache_dir:
+        compile_time = min(load_all(None) for _ in range(3))
+        load_all(templating.TemplateBytecodeCache(cache_dir))  # fill
+        cached_time = min(load_all(templating.TemplateBytecodeCache(cache_dir)) for _ in range(3))
+    print(f"{'load all templates':<28} {'ms':>8}")
+    print(f"{'compile (no cache)':<28} {compile_time * 1000:>8.1f}")
+    print(f"{'bytecode cache':<28} {cached_time * 1000:>8.1f}")
+
+    members = [_fake_member(i) for i in range(1, 201)]
+    activities = []
+    for i in range(rows):
+        activity = _fake_activity(i, (i % 201) or None)
+        activity.start_date = date(2024, 1, 1) + timedelta(days=i % 365)
+        activity.project = None
+        activity.assigned_member = members[activity.assigned_member_id - 1] if activity.assigned_member_id else None
+        activities.append(activity)
+    options = [(f"{i:03d}", f"Option {i}") for i in range(1, 20)]
+    pages = {
+        "daily_meeting.html": _daily_meeting_context(members, activities),
+        "activities.html": {
+            "title": "Activities",
+            "activities": activities,
+            "type_options": options,
+            "subtype_options": options,
+            "status_options": options,
+            "member_options": [(m.id, m.name) for m in members],
+            "project_options": [],
+            "release_options": [],
+            "filters": {},
+        },
+    }
+    env = templating.templates.env
+    print(f"{'render':<32} {'legacy ms':>10} {'fmt_date ms':>12}")
+    for name, context in pages.items():
+        template = env.get_template(name)
+        template.render(request=None, **context)  # warm-up
+        timings = []
+        for fmt in (_legacy_fmt_date, templating.fmt_date):
+            env.filters["fmt_date"] = fmt
+            timings.append(_timed(lambda: template.render(request=None, **context), repeat=5))
+        env.filters["fmt_date"] = templating.fmt_date
+        print(f"{f'{name} ({rows} rows)':<32} {timings[0] * 1000:>10.1f} {timings[1] * 1000:>12.1f}")
+    days = [activity.start_date for activity in activities]
+    filter_timings = [_timed(lambda: [fmt(day) for day in days], repeat=5) for fmt in (_legacy_fmt_date, templating.fmt_date)]
+    print(f"{f'fmt_date x {rows}':<32} {filter_timings[0] * 1000:>10.1f} {filter_timings[1] * 1000:>12.1f}")
+
+
+def _time_to_first_health(env: dict) -> float:
+    """Seconds from spawning uvicorn to the first 200 from /health."""
+    import socket
+    import subprocess
+    import urllib.request
+
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+    start = time.perf_counter()
+    server = subprocess.Popen(
+        [
+            sys.executable, "-m", "uvicorn", "eagle_pm.app.main:app",
+            "--port", str(port), "--log-level", "warning", "--no-access-log",
+        ],
+        env=env,
+    )
+    try:
+        while True:
+            try:
+                urllib.request.urlopen(f"http://127.0.0.1:{port}/health", timeout=5).read()
+                return time.perf_counter() - start
+            except OSError:
+                if server.poll() is not None:
+                    raise SystemExit("uvicorn exited before serving /health")
+                time.sleep(0.01)
+    finally:
+        server.terminate()
+        try:
+            server.wait(10)
+        except subprocess.TimeoutExpired:
+            server.kill()
+
+
+def bench_startup(activities: int = 100_000) -> None:
+    """Process start to first /health 200: new file, upgrade of a pre-migrations file, restart."""
+    from .app import db, migrations
+
+    env = dict(os.environ)
+    with tempfile.TemporaryDirectory() as backup_dir:
+        env["EAGLE_PM_BACKUP_DIR"] = backup_dir
+        db.dispose_engines()
+        for suffix in ("", "-wal", "-shm"):
+            Path(f"{db.DATABASE_PATH}{suffix}").unlink(missing_ok=True)
+        new_file = _time_to_first_health(env)
+
+        _reset_db()
+        with db.SessionLocal() as session:
+            _seed(session, members=200, projects=500, releases=20, activities=activities)
+        # Make it look like a file from before migrations: version 0, later indexes missing.
+        with db.engine.begin() as conn:
+            conn.exec_driver_sql("DROP INDEX IF EXISTS idx_activity_created")
+            conn.exec_driver_sql("DROP INDEX IF EXISTS idx_activity_release_created")
+            conn.exec_driver_sql("CREATE INDEX idx_activity_target_release ON activity (target_release_id)")
+            conn.exec_driver_sql("PRAGMA user_version = 0")
+        db.dispose_engines()
+        upgrade = _time_to_first_health(env)
+        restart = _time_to_first_health(env)
+        with db.engine.connect() as conn:
+            version = migrations.schema_version(conn)
+    print(f"{'start':<32} {'ms to /health':>14}")
+    print(f"{'new file':<32} {new_file * 1000:>14.0f}")
+    print(f"{f'upgrade v0 ({activities} acts)':<32} {upgrade * 1000:>14.0f}")
+    print(f"{f'restart v{version} ({activities} acts)':<32} {restart * 1000:>14.0f}")
+
+
+CLI_HEAVY_MODULES = ("fastapi", "starlette", "jinja2", "uvicorn")
+
+
+def bench_cli_startup() -> None:
+    """Cold start of ``eagle-pm`` commands; fail if a data command imports the web stack."""
+    import json
+    import subprocess
+
+    probe = (
+        "import json, sys, time\n"
+        "start = time.perf_counter()\n"
+        "from eagle_pm import cli\n"
+        "try:\n"
+        "    cli.app(sys.argv[1:], prog_name='eagle-pm', standalone_mode=False)\n"
+        "except SystemExit:\n"
+        "    pass\n"
+        "elapsed = time.perf_counter() - start\n"
+        f"heavy = [m for m in {CLI_HEAVY_MODULES!r} if m in sys.modules]\n"
+        "print(json.dumps({'ms': elapsed * 1000, 'heavy': heavy}), file=sys.stderr)\n"
+    )
+    _reset_db()
+    print(f"{'command':<20} {'wall ms':>8} {'in-proc ms':>10}  heavy modules")
+    failures = []
+    for argv in (["--help"], ["analyze"], ["refresh-releases"], ["export", "members", "-o", os.devnull]):
+        start = time.perf_counter()
+        result = subprocess.run(
+            [sys.executable, "-c", probe, *argv], capture_output=True, text=True, env=dict(os.environ), check=False
+        )
+        wall = (time.perf_counter() - start) * 1000
+        report = json.loads(result.stderr.strip().splitlines()[-1])
+        print(f"{' '.join(argv[:2]):<20} {wall:>8.0f} {report['ms']:>10.0f}  {', '.join(report['heavy']) or '-'}")
+        if report["heavy"]:
+            failures.append(argv[0])
+    if failures:
+        raise SystemExit(f"Web stack imported by: {', '.join(failures)}")
+
+
+BENCHMARKS: Dict[str, Callable[[], None]] = {
+    "daily_meeting": bench_daily_meeting,
+    "query_counts": bench_query_counts,
+    "export_csv": bench_export_csv,
+    "export_xlsx": bench_export_xlsx,
+    "sqlite_profile": bench_sqlite_profile,
+    "search": bench_search,
+    "bulk_activities": bench_bulk_activities,
+    "import": bench_import,
+    "cli_startup": bench_cli_startup,
+    "backup": bench_backup,
+    "audit": bench_audit,
+    "snapshot": bench_snapshot,
+    "release_scope": bench_release_scope,
+    "metrics": bench_metrics,
+    "load": bench_load,
+    "conditional_get": bench_conditional_get,
+    "form_options": bench_form_options,
+    "startup": bench_startup,
+    "templates": bench_templates,
+}
+
+
+def main(argv: list[str] | None = None) -> int:
+    argv = sys.argv[1:] if argv is None else argv
+    # Never benchmark against the real database.
+    os.environ["EAGLE_PM_DB_PATH"] = str(BENCH_DB_PATH)
+    names = argv or ["all"]
+    if names == ["all"]:
+        names = list(BENCHMARKS)
+    for name in names:
+        fn = BENCHMARKS.get(name)
+        if fn is None:
+            print(f"Unknown benchmark: {name} (choices: {', '.join(BENCHMARKS)})")
+            return 2
+        print(f"== {name}")
+        fn()
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
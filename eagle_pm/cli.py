@@ -0,0 +1,243 @@
+"""``eagle-pm`` command line.
+
+Imports are deferred into each command: ``--help`` and the data commands never
+load FastAPI/Jinja, and only ``serve`` pulls in the web stack. Keep it that way
+(``eagle-pm bench cli_startup`` checks it).
+"""
+from __future__ import annotations
+
+import os
+import sys
+from datetime import date, datetime
+from pathlib import Path
+from typing import List, Optional
+
+import typer
+
+app = typer.Typer(
+    name="eagle-pm",
+    help="Eagle PM operational commands.",
+    add_completion=False,
+    no_args_is_help=True,
+    pretty_exceptions_enable=False,
+    rich_markup_mode=None,
+)
+
+
+@app.callback()
+def main(
+    db_path: Optional[Path] = typer.Option(
+        None, "--db", envvar="EAGLE_PM_DB_PATH", help="SQLite database file (default: ./eagle_pm.db)."
+    ),
+) -> None:
+    # Must be set before eagle_pm.app.db is first imported: the engine is built at import time.
+    if db_path is not None:
+        os.environ["EAGLE_PM_DB_PATH"] = str(db_path)
+
+
+def _init_db() -> None:
+    from .app.db import init_db
+
+    init_db()
+
+
+@app.command()
+def serve(
+    host: str = typer.Option("127.0.0.1", help="Bind address."),
+    port: int = typer.Option(8000, help="Bind port."),
+    reload: bool = typer.Option(False, help="Restart on code changes (development)."),
+) -> None:
+    """Run the web app."""
+    import uvicorn
+
+    uvicorn.run("eagle_pm.app.main:app", host=host, port=port, reload=reload)
+
+
+@app.command("export")
+def export_cmd(
+    kind: str = typer.Argument(..., help="members, releases, projects, activities or workbook."),
+    output: Optional[Path] = typer.Option(None, "--output", "-o", help="Target file (default: ./eagle_pm_<kind>_<timestamp>.<ext>)."),
+    fmt: str = typer.Option("csv", "--format", "-f", help="csv or xlsx (workbook is always xlsx)."),
+) -> None:
+    """Export one entity (or the whole workbook) to CSV/XLSX."""
+    from .app import export
+
+    if kind != "workbook" and kind not in export.EXPORT_KINDS:
+        raise typer.BadParameter(f"choose one of: {', '.join(export.EXPORT_KINDS)}, workbook", param_hint="KIND")
+    if kind == "workbook":
+        fmt = "xlsx"
+    if fmt not in ("csv", "xlsx"):
+        raise typer.BadParameter("choose csv or xlsx", param_hint="--format")
+    _init_db()
+    output = output or Path(f"eagle_pm_{kind}_{datetime.utcnow().strftime('%Y%m%d_%H%M%S')}.{fmt}")
+    kinds = export.EXPORT_KINDS if kind == "workbook" else (kind,)
+    if fmt == "xlsx":
+        export.write_xlsx(output, [export.export_sheet(k) for k in kinds])
+    else:
+        _title, headers, rows = export.export_sheet(kind)
+        with output.open("w", encoding="utf-8", newline="") as handle:
+            for chunk in export.iter_csv(headers, rows):
+                handle.write(chunk)
+    typer.echo(f"Wrote {output}")
+
+
+@app.command("import")
+def import_cmd(
+    kind: str = typer.Argument(..., help="members, releases, projects, activities or workbook."),
+    files: List[Path] = typer.Argument(..., exists=True, dir_okay=False, help="CSV/XLSX files."),
+) -> None:
+    """Import CSV/XLSX files; exits with 1 when any row was rejected."""
+    from .app import importer
+
+    if kind != "workbook" and kind not in importer.KINDS:
+        raise typer.BadParameter(f"choose one of: {', '.join(importer.KINDS)}, workbook", param_hint="KIND")
+    code = importer.main([kind, *map(str, files)])
+    raise typer.Exit(code)
+
+
+@app.command("refresh-releases")
+def refresh_releases(
+    on: Optional[datetime] = typer.Option(None, "--date", formats=["%Y-%m-%d"], help="Evaluate as of this date (default: today)."),
+) -> None:
+    """Apply due release status transitions (what the daily scheduler runs)."""
+    from .app import scheduler
+
+    _init_db()
+    changed = scheduler.refresh_release_statuses(on.date() if on else date.today())
+    typer.echo(f"{changed} release(s) updated.")
+
+
+@app.command()
+def snapshot(
+    on: Optional[datetime] = typer.Option(None, "--date", formats=["%Y-%m-%d"], help="Record under this day (default: today)."),
+) -> None:
+    """Record (or re-record) the Daily Snapshot counts."""
+    from .app import snapshots
+
+    _init_db()
+    written = snapshots.take_daily_snapshot(on.date() if on else date.today())
+    typer.echo(f"{written} snapshot row(s) written.")
+
+
+@app.command()
+def counts(
+    rebuild: bool = typer.Option(False, "--rebuild", help="Recompute every counter from the activity/project tables."),
+) -> None:
+    """Check the dashboard counters against the data; exits with 1 on drift (use --rebuild to repair)."""
+    from .app import crud
+    from .app.db import SessionLocal
+
+    _init_db()
+    with SessionLocal() as session:
+        if rebuild:
+            crud.rebuild_dashboard_counts(session)
+            session.commit()
+            typer.echo("Dashboard counters rebuilt.")
+            return
+        drift = crud.check_dashboard_counts(session)
+    for (scope, ref), (stored, actual) in sorted(drift.items()):
+        typer.echo(f"{scope} {ref or '-'}: stored {stored}, actual {actual}")
+    if drift:
+        typer.echo(f"{len(drift)} counter(s) drifted; run: eagle-pm counts --rebuild", err=True)
+        raise typer.Exit(1)
+    typer.echo("Dashboard counters OK.")
+
+
+@app.command()
+def migrate(
+    status: bool = typer.Option(False, "--status", help="Show the schema version without migrating."),
+) -> None:
+    """Apply pending schema migrations (the web app also does this on startup)."""
+    from .app import db, migrations
+
+    with db.engine.connect() as conn:
+        version = migrations.schema_version(conn)
+    typer.echo(f"Schema version {version} (latest: {migrations.LATEST_VERSION}).")
+    if status:
+        return
+    applied = migrations.migrate(db.engine)
+    for name in applied:
+        typer.echo(f"Applied: {name}")
+    if not applied:
+        typer.echo("Nothing to apply.")
+
+
+@app.command("compile-templates")
+def compile_templates() -> None:
+    """Compile every Jinja template into the bytecode cache (EAGLE_PM_TEMPLATE_CACHE_DIR)."""
+    from .app import templating
+
+    try:
+        count = templating.precompile()
+    except RuntimeError as exc:
+        typer.echo(str(exc), err=True)
+        raise typer.Exit(1)
+    typer.echo(f"{count} template(s) compiled into {templating.TEMPLATE_CACHE_DIR}.")
+
+
+@app.command()
+def analyze() -> None:
+    """Refresh SQLite planner statistics (ANALYZE + PRAGMA optimize)."""
+    from .app import db
+
+    db.optimize()
+    typer.echo("ANALYZE done.")
+
+
+@app.command()
+def vacuum() -> None:
+    """Rebuild the database file to reclaim free pages, then ANALYZE."""
+    from .app import db
+
+    before = db.DATABASE_PATH.stat().st_size if db.DATABASE_PATH.exists() else 0
+    db.optimize(vacuum=True)
+    after = db.DATABASE_PATH.stat().st_size
+    typer.echo(f"VACUUM done: {before} -> {after} bytes.")
+
+
+@app.command()
+def backup(
+    compress: Optional[bool] = typer.Option(None, "--compress/--no-compress", help="gzip the snapshot (default: EAGLE_PM_BACKUP_COMPRESS)."),
+    keep: Optional[int] = typer.Option(None, help="Snapshots to keep after rotation (default: EAGLE_PM_BACKUP_KEEP)."),
+    list_only: bool = typer.Option(False, "--list", help="List snapshots instead of creating one."),
+) -> None:
+    """Online snapshot of the live database into the backup dir (safe while the web app is running)."""
+    from .app import backup as backup_module
+
+    if list_only:
+        for item in backup_module.list_backups():
+            typer.echo(f"{item['name']}  {item['size']:>12}")
+        return
+    path = backup_module.create_backup(compress=compress, keep=keep)
+    typer.echo(f"Wrote {path}")
+
+
+@app.command()
+def restore(name: str = typer.Argument(..., help="Snapshot file name (see: eagle-pm backup --list).")) -> None:
+    """Replace the database with a snapshot; the current file is saved as a pre-restore snapshot first."""
+    import sqlite3
+
+    from .app import backup as backup_module
+
+    try:
+        safety = backup_module.restore_backup(name)
+    except (OSError, sqlite3.Error, ValueError) as exc:
+        typer.echo(str(exc), err=True)
+        raise typer.Exit(1)
+    typer.echo(f"Restored {name} (previous database saved as {safety.name}).")
+
+
+@app.command()
+def bench(names: List[str] = typer.Argument(None, help="Benchmark names (default: all).")) -> None:
+    """Run micro-benchmarks against a scratch database."""
+    from . import bench as bench_module
+
+    raise typer.Exit(bench_module.main(names or []))
+
+
+def run() -> None:
+    app(prog_name="eagle-pm")
+
+
+if __name__ == "__main__":
+    sys.exit(run())
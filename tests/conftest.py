@@ -0,0 +1,44 @@
+from __future__ import annotations
+
+import os
+import tempfile
+from pathlib import Path
+
+import pytest
+
+# The engine is built when eagle_pm.app.db is imported: point it (and the backup and
+# template caches) at a scratch directory before any test module imports the app.
+_SCRATCH = Path(tempfile.mkdtemp(prefix="eagle_pm_tests_"))
+os.environ["EAGLE_PM_DB_PATH"] = str(_SCRATCH / "test.db")
+os.environ["EAGLE_PM_BACKUP_DIR"] = str(_SCRATCH / "backups")
+os.environ["EAGLE_PM_TEMPLATE_CACHE_DIR"] = "off"
+os.environ["EAGLE_PM_GIT_SYNC_INTERVAL"] = "0"
+
+
+@pytest.fixture
+def fresh_db():
+    """A new, migrated database file for each test."""
+    from eagle_pm.app import db
+
+    db.dispose_engines()
+    for suffix in ("", "-wal", "-shm"):
+        Path(f"{db.DATABASE_PATH}{suffix}").unlink(missing_ok=True)
+    db.init_db()
+    yield db
+    db.dispose_engines()
+
+
+@pytest.fixture
+def session(fresh_db):
+    with fresh_db.SessionLocal() as session:
+        yield session
+
+
+@pytest.fixture
+def client(fresh_db):
+    from fastapi.testclient import TestClient
+
+    from eagle_pm.app.main import app
+
+    with TestClient(app) as test_client:
+        yield test_client
@@ -0,0 +1,42 @@
+from __future__ import annotations
+
+from eagle_pm.app import crud
+
+ACTIVITY_FORM = {"type_code": "001", "subtype_code": "001", "title": "Nova", "status_code": "002"}
+
+
+def _seed_activities(count: int) -> None:
+    from eagle_pm.app.db import SessionLocal
+
+    with SessionLocal() as session:
+        for i in range(count):
+            crud.create_activity(session, type_code="001", subtype_code="001", title=f"Act {i}", status_code="002")
+
+
+def _create_from_list_page(client) -> str:
+    page = client.get("/activities")
+    assert page.status_code == 200
+    assert 'name="next_url" value="/activities"' in page.text
+    response = client.post("/activities", data={**ACTIVITY_FORM, "next_url": "/activities"}, follow_redirects=False)
+    assert response.status_code == 303
+    return response.headers["location"]
+
+
+def test_create_redirect_with_single_page(client):
+    _seed_activities(3)
+    assert _create_from_list_page(client) == "/activities?msg=created"
+
+
+def test_create_redirect_with_load_more(client):
+    # The "Load more" URL must not take over the form's redirect target.
+    _seed_activities(crud.PAGE_SIZE + 5)
+    assert "data-load-more" in client.get("/activities").text
+    assert _create_from_list_page(client) == "/activities?msg=created"
+
+
+def test_create_error_keeps_redirect_and_load_more(client):
+    _seed_activities(crud.PAGE_SIZE + 5)
+    response = client.post("/activities", data={**ACTIVITY_FORM, "status_code": "999", "next_url": "/dashboards/daily-meeting"})
+    assert response.status_code == 400
+    assert 'name="next_url" value="/dashboards/daily-meeting"' in response.text
+    assert 'href="/activities?cursor=' in response.text
@@ -0,0 +1,33 @@
+from __future__ import annotations
+
+import threading
+import time
+
+from eagle_pm.app import routes
+
+
+def test_cheap_route_responsive_while_page_renders(client, monkeypatch):
+    rendering = threading.Event()
+    release = threading.Event()
+    template_response = routes.templates.TemplateResponse
+
+    def slow_render(*args, **kwargs):
+        rendering.set()
+        release.wait(10)
+        return template_response(*args, **kwargs)
+
+    monkeypatch.setattr(routes.templates, "TemplateResponse", slow_render)
+    pages = {}
+    heavy = threading.Thread(target=lambda: pages.update(daily=client.get("/dashboards/daily-meeting")))
+    heavy.start()
+    try:
+        assert rendering.wait(10)
+        start = time.perf_counter()
+        assert client.get("/health").status_code == 200
+        assert time.perf_counter() - start < 2
+        assert not release.is_set()
+    finally:
+        release.set()
+        heavy.join(10)
+    assert pages["daily"].status_code == 200
+    assert pages["daily"].headers["ETag"]
@@ -0,0 +1,43 @@
+from __future__ import annotations
+
+import os
+
+from eagle_pm.app import backup
+
+
+def test_backups_in_the_same_second_do_not_overwrite(fresh_db):
+    first = backup.create_backup(compress=False, keep=10)
+    second = backup.create_backup(compress=False, keep=10)
+    assert first != second
+    assert first.exists() and second.exists()
+    names = [item["name"] for item in backup.list_backups()]
+    assert names.index(second.name) < names.index(first.name)
+
+
+def test_older_snapshot_names_are_still_listed(fresh_db):
+    backup.BACKUP_DIR.mkdir(parents=True, exist_ok=True)
+    legacy = backup.BACKUP_DIR / "eagle_pm_20240101_120000_shutdown.db"
+    legacy.write_bytes(b"")
+    try:
+        assert backup.backup_path(legacy.name) == legacy
+    finally:
+        legacy.unlink()
+
+
+def test_restore_os_error_redirects_with_message(client, monkeypatch):
+    from eagle_pm.app import db
+
+    name = backup.create_backup(compress=False).name
+    real_replace = os.replace
+
+    def locked_replace(src, dst):
+        # The live database is held open elsewhere (Windows sharing violation).
+        if str(dst) == str(db.DATABASE_PATH):
+            raise PermissionError(32, "file is in use")
+        return real_replace(src, dst)
+
+    monkeypatch.setattr(os, "replace", locked_replace)
+    response = client.post("/backups/restore", data={"name": name}, follow_redirects=False)
+    assert response.status_code == 303
+    assert response.headers["location"].startswith("/backups?error=")
+    assert "file is in use" in client.get(response.headers["location"]).text
@@ -0,0 +1,69 @@
+from __future__ import annotations
+
+import threading
+from contextlib import contextmanager
+
+from sqlalchemy import event, func, select
+
+from eagle_pm.app import audit, crud, db, models, rules
+
+# Validation lookups, one INSERT ... RETURNING, one change-log and one counter
+# executemany: independent of the batch size.
+BULK_CREATE_STATEMENT_LIMIT = 8
+
+
+@contextmanager
+def _count_statements():
+    statements: list[str] = []
+
+    def before(_conn, _cursor, statement, _parameters, _context, _executemany):
+        # The scheduler's first pass (snapshot, backup) may overlap the request.
+        if threading.current_thread().name != "eagle-pm-scheduler":
+            statements.append(statement)
+
+    event.listen(db.engine, "before_cursor_execute", before)
+    try:
+        yield statements
+    finally:
+        event.remove(db.engine, "before_cursor_execute", before)
+
+
+def _payload(count: int) -> list[dict]:
+    return [
+        {
+            "type_code": "001",
+            "subtype_code": "001",
+            "title": f"Bulk {i}",
+            "status_code": rules.STATUS_ACTIVITY_CLOSED if i % 10 == 0 else "002",
+        }
+        for i in range(count)
+    ]
+
+
+def test_bulk_create_route_statement_count(client):
+    with _count_statements() as statements:
+        response = client.post("/api/activities/bulk-create", json=_payload(1000))
+    assert response.status_code == 200
+    body = response.json()
+    assert body["created"] == 1000
+    assert len(statements) <= BULK_CREATE_STATEMENT_LIMIT, statements
+
+    with db.SessionLocal() as session:
+        titles = dict(session.execute(select(models.Activity.id, models.Activity.title)).all())
+        assert [titles[activity_id] for activity_id in body["ids"]] == [f"Bulk {i}" for i in range(1000)]
+        closed = session.get(models.Activity, body["ids"][0])
+        assert closed.end_date is not None
+        assert crud.check_dashboard_counts(session) == {}
+        (entry,) = audit.entity_history(session, "activity", body["ids"][-1])
+        assert entry["action"] == audit.ACTION_INSERT
+        assert entry["changes"]["title"] == [None, "Bulk 999"]
+
+
+def test_bulk_create_rejects_whole_batch(client):
+    payload = _payload(3)
+    payload[1]["status_code"] = "999"
+    response = client.post("/api/activities/bulk-create", json=payload)
+    assert response.status_code == 400
+    assert response.json()["detail"].startswith("Linha 2:")
+    with db.SessionLocal() as session:
+        assert session.scalar(select(func.count()).select_from(models.Activity)) == 0
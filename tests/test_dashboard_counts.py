@@ -0,0 +1,52 @@
+from __future__ import annotations
+
+from eagle_pm.app import crud, rules
+
+
+def _member(session, name: str):
+    return crud.create_member(session, name=name, role_code="003", status_code="001")
+
+
+def test_delete_member_moves_open_counts_to_unassigned(session):
+    keep = _member(session, "Ana")
+    gone = _member(session, "Bob")
+    for i in range(6):
+        crud.create_activity(
+            session,
+            type_code="001",
+            subtype_code="001",
+            title=f"Act {i}",
+            status_code=rules.STATUS_ACTIVITY_CLOSED if i == 5 else "002",
+            assigned_member_id=gone.id if i % 2 else keep.id,
+        )
+    crud.delete_member(session, gone.id)
+
+    assert crud.check_dashboard_counts(session) == {}
+    by_member = crud.dashboard_counts(session, crud.COUNT_OPEN_BY_MEMBER, id_keys=True)
+    assert by_member == {keep.id: 3, None: 2}
+
+
+def test_rebuild_repairs_drift(session):
+    crud.create_activity(session, type_code="001", subtype_code="001", title="Act", status_code="002")
+    crud.bump_dashboard_counts(session, added=[(crud.COUNT_OPEN_BY_MEMBER, "")])
+    session.commit()
+    assert crud.check_dashboard_counts(session) == {(crud.COUNT_OPEN_BY_MEMBER, ""): (2, 1)}
+
+    crud.rebuild_dashboard_counts(session)
+    session.commit()
+    assert crud.check_dashboard_counts(session) == {}
+
+
+def test_counts_command_reports_and_rebuilds(session):
+    from typer.testing import CliRunner
+
+    from eagle_pm import cli
+
+    crud.bump_dashboard_counts(session, added=[(crud.COUNT_OPEN_BY_MEMBER, "")])
+    session.commit()
+    runner = CliRunner()
+    result = runner.invoke(cli.app, ["counts"])
+    assert result.exit_code == 1
+    assert "open_by_member" in result.output
+    assert runner.invoke(cli.app, ["counts", "--rebuild"]).exit_code == 0
+    assert runner.invoke(cli.app, ["counts"]).exit_code == 0
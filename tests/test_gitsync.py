@@ -0,0 +1,66 @@
+from __future__ import annotations
+
+import sqlite3
+import threading
+
+from eagle_pm.app import gitsync
+
+
+class _RecordingSync(gitsync.GitSync):
+    """GitSync whose sync() records the reason and blocks until released."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.release = threading.Event()
+        self.reasons: list[str] = []
+
+    def sync(self) -> tuple[str, str]:
+        self.reasons.append(self.status()["reason"])
+        self.release.wait(5)
+        return gitsync.STATE_OK, "done"
+
+
+def test_start_without_queue_drops_while_running():
+    sync = _RecordingSync()
+    assert sync.start(reason="periodic")
+    assert not sync.start(reason="manual")
+    sync.release.set()
+    assert sync.wait(5)
+    assert sync.reasons == ["periodic"]
+
+
+def test_queued_sync_runs_after_the_running_one():
+    sync = _RecordingSync()
+    prepared = []
+    assert sync.start(reason="periodic")
+    assert sync.start(reason="shutdown", queue=True, prepare=lambda: prepared.append(sync.reasons[:]))
+    assert not sync.wait(0.05)
+    assert sync.status()["state"] == gitsync.STATE_RUNNING
+    sync.release.set()
+    assert sync.wait(5)
+    assert sync.reasons == ["periodic", "shutdown"]
+    # The queued job's preparation runs after the in-flight sync, before its own.
+    assert prepared == [["periodic"]]
+    assert sync.status()["state"] == gitsync.STATE_OK
+
+
+def test_prepare_errors_do_not_stop_the_sync():
+    sync = _RecordingSync()
+    sync.release.set()
+
+    def broken() -> None:
+        raise sqlite3.OperationalError("disk I/O error")
+
+    assert sync.start(reason="shutdown", prepare=broken)
+    assert sync.wait(5)
+    assert sync.reasons == ["shutdown"]
+
+
+def test_shutdown_backup_swallows_sqlite_errors(monkeypatch):
+    from eagle_pm.app import backup, routes
+
+    def failing_backup(**_kwargs):
+        raise sqlite3.OperationalError("database is locked")
+
+    monkeypatch.setattr(backup, "create_backup", failing_backup)
+    routes._shutdown_backup()
@@ -0,0 +1,42 @@
+from __future__ import annotations
+
+import io
+
+from eagle_pm.app import audit, importer, models
+
+
+MEMBERS_CSV = "name,role,status\nAna,001,001\nBob,003,001\n"
+ACTIVITIES_CSV = "title,type,subtype,status,assigned_member\nPrimeira,001,001,002,Ana\nSegunda,001,001,002,\n"
+
+
+def _import(session, csv_text: str, kind: str):
+    (report,) = importer.import_file(session, io.BytesIO(csv_text.encode()), f"{kind}.csv", kind)
+    assert report.as_dict()["errors"] == []
+    return report
+
+
+def test_imported_rows_have_insert_history(session):
+    _import(session, MEMBERS_CSV, importer.KIND_MEMBERS)
+    _import(session, ACTIVITIES_CSV, importer.KIND_ACTIVITIES)
+
+    ana = session.query(models.Member).filter_by(name="Ana").one()
+    activity = session.query(models.Activity).filter_by(title="Primeira").one()
+
+    (entry,) = audit.entity_history(session, "member", ana.id)
+    assert entry["action"] == audit.ACTION_INSERT
+    assert entry["changes"]["name"] == [None, "Ana"]
+
+    (entry,) = audit.entity_history(session, "activity", activity.id)
+    assert entry["changes"]["title"] == [None, "Primeira"]
+    assert entry["changes"]["assigned_member_id"] == [None, ana.id]
+    assert "created_at" not in entry["changes"]
+
+
+def test_history_endpoint_for_imported_row(client):
+    from eagle_pm.app.db import SessionLocal
+
+    with SessionLocal() as session:
+        _import(session, MEMBERS_CSV, importer.KIND_MEMBERS)
+        bob_id = session.query(models.Member.id).filter_by(name="Bob").scalar()
+    history = client.get(f"/api/member/{bob_id}/history").json()
+    assert [entry["action"] for entry in history] == ["insert"]
@@ -0,0 +1,38 @@
+from __future__ import annotations
+
+import re
+
+from eagle_pm.app import crud, lookups, models
+
+
+def _metric(text: str, name: str, labels: str = "") -> float:
+    match = re.search(rf"^{re.escape(name + labels)} (\S+)$", text, re.MULTILINE)
+    assert match, f"{name}{labels} not in /metrics"
+    return float(match.group(1))
+
+
+def test_index_lookup_moves_registry_counters(client, session):
+    before = client.get("/metrics").text
+    hits = _metric(before, "eagle_pm_index_lookups_total", '{outcome="hit"}')
+    assert lookups.registry.has_code(session, models.IndexRole, "001")
+    assert _metric(client.get("/metrics").text, "eagle_pm_index_lookups_total", '{outcome="hit"}') == hits + 1
+
+    fallbacks = _metric(before, "eagle_pm_index_lookups_total", '{outcome="db_fallback"}')
+    lookups.registry.invalidate(models.IndexRole.__tablename__)
+    lookups.registry.options(session, models.IndexRole)
+    after = client.get("/metrics").text
+    assert _metric(after, "eagle_pm_index_lookups_total", '{outcome="db_fallback"}') == fallbacks + 1
+    assert _metric(after, "eagle_pm_index_tables_cached") == len(lookups.INDEX_MODELS)
+
+
+def test_form_options_cache_counters(client, session):
+    labels = '{cache="form_options",outcome="%s"}'
+    crud.form_options_cache.invalidate()
+    before = client.get("/metrics").text
+    builds = _metric(before, "eagle_pm_cache_requests_total", labels % "build")
+    hits = _metric(before, "eagle_pm_cache_requests_total", labels % "hit")
+    crud.form_options(session)
+    crud.form_options(session)
+    after = client.get("/metrics").text
+    assert _metric(after, "eagle_pm_cache_requests_total", labels % "build") == builds + 1
+    assert _metric(after, "eagle_pm_cache_requests_total", labels % "hit") == hits + 1